@@ -0,0 +1,285 @@
+#PURPOSE
+#   Benchmarks snapshot.py against synthetic geodatabases, so changes to snapshot.py's performance can
+#   be measured w/o ArcGIS or an enterprise geodatabase. Results are recorded run over run so that
+#   regressions in enumeration, filtering, size accounting, and copying show up.
+
+#HOW TO USE
+#   From the repository's folder:
+#      python benchmarks/benchmark.py
+#
+#   Arguments (all optional):
+#      --scenarios <names>   Comma-separated scenario names (see SCENARIOS below). Default is all.
+#      --arcpy <fake|real>   Use the stand-in arcpy in benchmarks/fake_arcpy (default) or the arcpy
+#                            that's installed (synthetic geodatabases are still made by this script,
+#                            so "real" is only useful w/ scenarios that don't need them).
+#      --latency-ms <ms>     Milliseconds added to each stand-in arcpy call (FAKE_ARCPY_LATENCY_MS).
+#      --mbps <MB/s>         Stand-in copy throughput (FAKE_ARCPY_MBPS). Default is unlimited.
+#      --workers <integer>   Passed to snapshot.py's workers option. Default is 1.
+#      --results <path>      JSON-lines file that results are added to. Default is
+#                            benchmarks/results.jsonl.
+#      --threshold <percent> A phase that's this much slower than in the previous result of the same
+#                            scenario and settings (and at least 0.05 seconds slower) is flagged as a
+#                            regression.
+#                            Default is 25.
+#      --keep                Keep the working folder (synthetic geodatabases and snapshots).
+#
+#   Exits w/ code 1 if any regression is flagged.
+
+#SCENARIOS
+#   objects_10, objects_1000, objects_10000
+#      A source geodatabase w/ this many data objects (feature datasets, feature classes, tables, and
+#      raster datasets) and an exclude list of wildcard, regular-expression, and plain-name rules.
+#      One snapshot is taken into an empty snapshot folder. Phases are snapshot.py's own (see its run
+#      report): discovery, enumeration, copy, snapshot_size, and size_accounting, plus filtering
+#      (should_include() called for every data-object name, timed separately).
+#
+#   history_1000_cold, history_1000_warm, history_1000_catalog
+#      A snapshot folder w/ 1,000 pre-existing snapshots and a snapshot tempo that isn't met, so only
+#      discovery and size accounting run. "cold" measures every snapshot geodatabase; "warm" reuses
+#      cached sizes (snapshot_sizes.json); "catalog" reads snapshots from the snapshot catalog.
+
+#IMPORT MODULES
+import sys, os, os.path, json, time, datetime, shutil, tempfile, argparse, platform, subprocess, contextlib
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+REPOSITORY_FOLDER = os.path.dirname(BENCHMARK_FOLDER)
+
+#THIS FUNCTION WRITES ONE STAND-IN DATA OBJECT (SEE benchmarks/fake_arcpy)
+#   SET FIRST ARGUMENT TO FOLDER (GEODATABASE OR FEATURE DATASET). SET SECOND ARGUMENT TO THE OBJECT'S NAME.
+#   SET THIRD ARGUMENT TO "FeatureClass", "Table", OR "RasterDataset". SET FOURTH AND FIFTH ARGUMENTS TO ITS
+#   NUMBER OF ROWS AND BYTES.
+def write_object(the_folder, the_name, the_kind, the_rows, the_bytes):
+   the_suffix = {"FeatureClass": ".fc.json", "Table": ".tbl.json", "RasterDataset": ".ras.json"}[the_kind]
+   the_fields = [{"name": "OBJECTID", "type": "OID"}]
+   if the_kind == "FeatureClass":
+      the_fields.append({"name": "Shape", "type": "Geometry"})
+   the_fields.append({"name": "NAME", "type": "String", "length": 50})
+   the_fields.append({"name": "last_edited_date", "type": "Date"})
+   the_data = {"kind": the_kind, "fields": the_fields, "row_count": the_rows, "bytes": the_bytes, "extent": [0, 0, 100, 100], "editor_tracking": {"edited_at": "last_edited_date"}}
+   if the_kind == "RasterDataset":
+      the_data = {"kind": the_kind, "fields": [], "row_count": 0, "bytes": the_bytes, "extent": [0, 0, 1000, 1000], "raster": {"width": 1000, "height": 1000, "bands": 1}}
+   with open(os.path.join(the_folder, the_name + the_suffix), "w") as the_file:
+      json.dump(the_data, the_file)
+   with open(os.path.join(the_folder, the_name + ".bin"), "wb") as the_file:
+      the_file.write(b"\0" * the_bytes)
+
+#THIS FUNCTION MAKES A SYNTHETIC SOURCE GEODATABASE W/ A GIVEN NUMBER OF DATA OBJECTS AND RETURNS THEIR NAMES,
+#   AS A LIST OF (<kind>, <name>) TUPLES (kind IS "fds", "feature-class", "table", OR "raster"; FEATURE DATASETS ARE
+#   LISTED BUT AREN'T COUNTED AS DATA OBJECTS)
+#   20% OF DATA OBJECTS ARE FEATURE CLASSES IN FEATURE DATASETS (10 PER FEATURE DATASET), 40% ARE STAND-ALONE
+#   FEATURE CLASSES, 30% ARE TABLES, AND 10% ARE RASTER DATASETS. SOME NAMES END W/ _OLD OR BEGIN W/ TMP_,
+#   AND ONE FEATURE DATASET PER 1,000 DATA OBJECTS IS NAMED Archive<n> (SEE get_exclude_list()).
+#   SET FIRST ARGUMENT TO PATH OF THE GEODATABASE (.gdb). SET SECOND ARGUMENT TO NUMBER OF DATA OBJECTS.
+def make_source_gdb(the_path, the_count):
+   os.makedirs(the_path)
+   the_names = []
+   the_fds = None
+   for i in range(the_count):
+      #(DATA OBJECTS ARE LAID OUT IN BLOCKS OF 100)
+      the_slot = i % 100
+      if the_slot < 20:
+         if the_slot % 10 == 0:
+            the_fds = "Theme" + str(i)
+            if i % 1000 == 10:
+               the_fds = "Archive" + str(i)
+            os.makedirs(os.path.join(the_path, "GIS.DBO." + the_fds + ".fds"))
+            the_names.append(("fds", the_fds))
+         write_object(os.path.join(the_path, "GIS.DBO." + the_fds + ".fds"), "GIS.DBO.Layer" + str(i), "FeatureClass", 100, 1000)
+         the_names.append(("feature-class", "Layer" + str(i)))
+      elif the_slot < 60:
+         the_name = "Layer" + str(i)
+         if i % 7 == 0:
+            the_name += "_OLD"
+         write_object(the_path, "GIS.DBO." + the_name, "FeatureClass", 100, 1000)
+         the_names.append(("feature-class", the_name))
+      elif the_slot < 90:
+         the_name = "Table" + str(i)
+         if i % 11 == 0:
+            the_name = "TMP_" + the_name
+         write_object(the_path, "GIS.DBO." + the_name, "Table", 100, 500)
+         the_names.append(("table", the_name))
+      else:
+         write_object(the_path, "GIS.DBO.Raster" + str(i), "RasterDataset", 0, 4000)
+         the_names.append(("raster", "Raster" + str(i)))
+   return the_names
+
+#THIS FUNCTION RETURNS AN EXCLUDE LIST (COMMA-SEPARATED STRING) W/ WILDCARD, REGULAR-EXPRESSION, AND PLAIN-NAME
+#   RULES, INCLUDING 200 PLAIN NAMES THAT DON'T MATCH ANY DATA OBJECT (TYPICAL OF LONG HAND-MAINTAINED LISTS)
+def get_exclude_list():
+   the_rules = ["fds:Archive*", "*_OLD", "re:^TMP_"]
+   for i in range(200):
+      the_rules.append("Retired" + str(i))
+   return ",".join(the_rules)
+
+#THIS FUNCTION MAKES A SNAPSHOT FOLDER W/ A GIVEN NUMBER OF PRE-EXISTING SNAPSHOTS, ONE PER DAY ENDING YESTERDAY
+#   EACH SNAPSHOT GEODATABASE HAS A FEW FILES (LIKE A SMALL FILE GEODATABASE)
+#   SET FIRST ARGUMENT TO THE SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO
+#   NUMBER OF SNAPSHOTS.
+def make_history(the_folder, the_nickname, the_count):
+   os.makedirs(the_folder)
+   the_day = datetime.date.today()
+   for i in range(the_count):
+      the_day = the_day - datetime.timedelta(days = 1)
+      the_gdb = os.path.join(the_folder, "SNAPSHOT_" + the_nickname + "_" + the_day.strftime("%Y%m%d") + ".gdb")
+      os.makedirs(the_gdb)
+      for j in range(5):
+         with open(os.path.join(the_gdb, "a0000000" + str(j) + ".gdbtable"), "wb") as the_file:
+            the_file.write(b"\0" * (1000 * (j + 1)))
+
+#THIS FUNCTION RUNS snapshot.py (IN THIS PROCESS) W/ GIVEN ARGUMENTS AND RETURNS ITS RUN METRICS (SEE
+#   snapshot.py's write_run_report()) W/ TOTAL SECONDS
+#   snapshot.py's CONSOLE OUTPUT IS DISCARDED (IT'S STILL IN THE LOG FILE IN THE WORKING FOLDER)
+#   SET FIRST ARGUMENT TO THE snapshot MODULE. SET SECOND ARGUMENT TO LIST OF ARGUMENT STRINGS (SEE read_arguments()).
+def run_snapshot(the_module, the_arguments):
+   the_module.email_content = ""
+   with open(os.devnull, "w") as the_null:
+      with contextlib.redirect_stdout(the_null):
+         the_module.read_arguments(the_arguments)
+         the_start = time.time()
+         the_status = the_module.take_snapshot(False)
+         the_seconds = time.time() - the_start
+   if the_status != "REPORT":
+      raise RuntimeError("snapshot.py ended in an error condition:\n" + the_module.email_content)
+   the_metrics = the_module.run_metrics
+   the_metrics["total_seconds"] = the_seconds
+   return the_metrics
+
+#THIS FUNCTION RUNS ONE SCENARIO AND RETURNS A DICTIONARY OF PHASE NAMES AND SECONDS
+#   SET FIRST ARGUMENT TO THE snapshot MODULE. SET SECOND ARGUMENT TO SCENARIO NAME. SET THIRD ARGUMENT TO
+#   WORKING FOLDER. SET FOURTH ARGUMENT TO PARSED COMMAND-LINE ARGUMENTS.
+def run_scenario(the_module, the_scenario, the_folder, the_settings):
+   the_options = "log_folder=" + the_folder + ",workers=" + str(the_settings.workers)
+   the_phases = {}
+   if the_scenario.startswith("objects_"):
+      the_count = int(the_scenario[8:len(the_scenario)])
+      the_source = os.path.join(the_folder, "source.gdb")
+      the_snapshots = os.path.join(the_folder, "snapshots")
+      the_start = time.time()
+      the_names = make_source_gdb(the_source, the_count)
+      print("   made source geodatabase w/ " + str(the_count) + " data objects in " + format(time.time() - the_start, ".1f") + " s")
+      os.makedirs(the_snapshots)
+      the_arguments = [the_source, the_snapshots, "", get_exclude_list(), "True", "7", "BENCH", "localhost", "25", "bench@localhost", "bench@localhost", the_options]
+      the_metrics = run_snapshot(the_module, the_arguments)
+      for i in the_metrics["phases"]:
+         the_phases[i["phase"]] = i["seconds"]
+      the_phases["total"] = the_metrics["total_seconds"]
+      #FILTERING (should_include() FOR EVERY NAME, W/ THE SAME INCLUDE/EXCLUDE LISTS)
+      the_start = time.time()
+      the_module.object_filter = the_module.compile_filter(the_module.include_list, the_module.exclude_list)
+      the_included = 0
+      for i in the_names:
+         if the_module.should_include(i[0], i[1])[0] == True:
+            the_included += 1
+      the_phases["filtering"] = time.time() - the_start
+      print("   " + str(len(the_metrics["objects"])) + " data objects copied; filter includes " + str(the_included) + " of " + str(len(the_names)) + " names")
+   elif the_scenario.startswith("history_"):
+      the_parts = the_scenario.split("_")
+      the_snapshots = os.path.join(the_folder, "snapshots")
+      make_history(the_snapshots, "BENCH", int(the_parts[1]))
+      the_source = os.path.join(the_folder, "source.gdb")
+      make_source_gdb(the_source, 10)
+      #(TEMPO ISN'T MET, SO NO SNAPSHOT IS MADE)
+      the_arguments = [the_source, the_snapshots, "", "", "True", "7", "BENCH", "localhost", "25", "bench@localhost", "bench@localhost", the_options]
+      if the_parts[2] == "warm":
+         run_snapshot(the_module, the_arguments)
+      elif the_parts[2] == "catalog":
+         the_arguments[11] += ",catalog=True"
+         run_snapshot(the_module, the_arguments)
+      else:
+         the_arguments[11] += ",size_cache=False"
+      the_metrics = run_snapshot(the_module, the_arguments)
+      for i in the_metrics["phases"]:
+         the_phases[i["phase"]] = i["seconds"]
+      the_phases["total"] = the_metrics["total_seconds"]
+   else:
+      raise ValueError("Unknown scenario " + the_scenario + ".")
+   return the_phases
+
+#THIS FUNCTION RETURNS THE MOST RECENT RESULT IN A GIVEN RESULTS FILE W/ THE SAME SCENARIO AND SETTINGS AS A
+#   GIVEN RESULT (OR None)
+def read_previous(the_path, the_current):
+   the_output = None
+   if os.path.isfile(the_path) == False:
+      return None
+   with open(the_path, "r") as the_file:
+      for i in the_file:
+         try:
+            the_result = json.loads(i)
+         except ValueError:
+            continue
+         the_match = True
+         for j in ("scenario", "arcpy", "latency_ms", "mbps", "workers"):
+            if the_result.get(j) != the_current[j]:
+               the_match = False
+         if the_match == True:
+            the_output = the_result
+   return the_output
+
+#THIS FUNCTION RETURNS THE REPOSITORY'S CURRENT GIT COMMIT (SHORT HASH), OR None IF IT CAN'T BE FOUND
+def get_commit():
+   try:
+      return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd = REPOSITORY_FOLDER, stderr = subprocess.DEVNULL).decode().strip()
+   except Exception:
+      return None
+
+#THIS FUNCTION RUNS THE BENCHMARKS
+def main():
+   the_parser = argparse.ArgumentParser(description = "Benchmarks snapshot.py against synthetic geodatabases.")
+   the_parser.add_argument("--scenarios", default = "objects_10,objects_1000,objects_10000,history_1000_cold,history_1000_warm,history_1000_catalog")
+   the_parser.add_argument("--arcpy", default = "fake", choices = ["fake", "real"])
+   the_parser.add_argument("--latency-ms", type = float, default = 0)
+   the_parser.add_argument("--mbps", type = float, default = 0)
+   the_parser.add_argument("--workers", type = int, default = 1)
+   the_parser.add_argument("--results", default = os.path.join(BENCHMARK_FOLDER, "results.jsonl"))
+   the_parser.add_argument("--threshold", type = float, default = 25)
+   the_parser.add_argument("--keep", action = "store_true")
+   the_settings = the_parser.parse_args()
+
+   #MAKE STAND-IN arcpy (OR REAL arcpy) AND snapshot.py IMPORTABLE
+   #(ENVIRONMENT VARIABLES AND PYTHON PATH ARE INHERITED BY snapshot.py's WORKER PROCESSES)
+   if the_settings.arcpy == "fake":
+      sys.path.insert(0, os.path.join(BENCHMARK_FOLDER, "fake_arcpy"))
+      os.environ["PYTHONPATH"] = os.path.join(BENCHMARK_FOLDER, "fake_arcpy") + os.pathsep + os.environ.get("PYTHONPATH", "")
+   os.environ["FAKE_ARCPY_LATENCY_MS"] = str(the_settings.latency_ms)
+   os.environ["FAKE_ARCPY_MBPS"] = str(the_settings.mbps)
+   sys.path.insert(0, REPOSITORY_FOLDER)
+   import snapshot
+
+   the_regressions = 0
+   for the_scenario in the_settings.scenarios.split(","):
+      the_scenario = the_scenario.strip()
+      print("SCENARIO " + the_scenario + "...")
+      the_folder = tempfile.mkdtemp(prefix = "snapshot_benchmark_")
+      try:
+         the_phases = run_scenario(snapshot, the_scenario, the_folder, the_settings)
+      finally:
+         snapshot.stop_log()
+         if the_settings.keep == False:
+            shutil.rmtree(the_folder, ignore_errors = True)
+         else:
+            print("   working folder kept: " + the_folder)
+      the_result = {"time": datetime.datetime.now().isoformat(timespec = "seconds"), "commit": get_commit(), "scenario": the_scenario, "arcpy": the_settings.arcpy, "latency_ms": the_settings.latency_ms, "mbps": the_settings.mbps, "workers": the_settings.workers, "python": platform.python_version(), "phases": the_phases}
+      the_previous = read_previous(the_settings.results, the_result)
+      #REPORT EACH PHASE, COMPARED W/ PREVIOUS RESULT OF SCENARIO
+      for i in sorted(the_phases):
+         the_line = "   " + i.ljust(16) + format(the_phases[i], "10.3f") + " s"
+         if the_previous != None and i in the_previous["phases"]:
+            the_before = the_previous["phases"][i]
+            the_line += "   (previous " + format(the_before, ".3f") + " s"
+            if the_before > 0:
+               the_change = 100 * (the_phases[i] - the_before) / the_before
+               the_line += ", " + format(the_change, "+.0f") + "%"
+               if the_change > the_settings.threshold and the_phases[i] - the_before > 0.05:
+                  the_line += ", REGRESSION"
+                  the_regressions += 1
+            the_line += ")"
+         print(the_line)
+      with open(the_settings.results, "a") as the_file:
+         the_file.write(json.dumps(the_result) + "\n")
+   print("Results added to " + the_settings.results + ".")
+   if the_regressions > 0:
+      print(str(the_regressions) + " regressions flagged.")
+      sys.exit(1)
+
+if __name__ == "__main__":
+   main()
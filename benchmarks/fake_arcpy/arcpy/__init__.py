@@ -0,0 +1,608 @@
+#PURPOSE
+#   Stand-in for the arcpy module, for benchmarking (and trying out) snapshot.py w/o ArcGIS or an
+#   enterprise geodatabase. See benchmarks/benchmark.py.
+#
+#   Put this file's parent folder (benchmarks/fake_arcpy) first on the Python path (PYTHONPATH) so
+#   that "import arcpy" finds it instead of ArcGIS's arcpy.
+
+#NOTES
+#   Geodatabases are plain folders named <name>.gdb. In them:
+#      -a feature dataset is a folder named <name>.fds
+#      -a feature class, table, or raster dataset is a JSON file named <name>.fc.json, <name>.tbl.json,
+#       or <name>.ras.json, respectively, plus (if it has a "bytes" setting) a <name>.bin file of that size
+#
+#   A data object's JSON has "kind" (FeatureClass, Table, or RasterDataset), "fields" (list of
+#   {"name", "type"} dictionaries), and either "rows" (list of row lists) or "row_count" (rows are
+#   generated when read). Optional settings are "bytes", "extent", "wkid", "shape_type",
+#   "editor_tracking" ({"edited_at": <field name>}), "archived", and "raster" ({"width", "height",
+#   "bands", "pixel_type", "cell", "compression", "nodata"}). A raster dataset's "pixels" setting (any string)
+#   stands in for its pixel values: RasterToNumPyArray() returns bytes made from it, so changing it
+#   changes the raster dataset's pixels. Clip() writes a raster dataset w/ its share of "bytes".
+#
+#   Backslashes in paths are treated as path separators, so snapshot.py's Windows-style paths work on
+#   any platform.
+#
+#   Environment variables:
+#      FAKE_ARCPY_LATENCY_MS    Milliseconds added to each call that reads or writes a data object
+#                               (simulates a network round trip to an enterprise geodatabase).
+#      FAKE_ARCPY_MBPS          Copy throughput, in MB per second (based on a data object's "bytes").
+#                               Default is unlimited.
+#      FAKE_ARCPY_FAIL_COPY     Copy of a data object whose path contains this string fails partway
+#                               (leaves a partial copy behind and raises ExecuteError).
+#      FAKE_ARCPY_TRUNCATE_COPY Copy of a data object whose path contains this string silently leaves
+#                               out its last row (to try out verification).
+#      FAKE_ARCPY_LOAD_MS       Milliseconds added to each call for each Copy running at the same time
+#                               (in any process; simulates a source geodatabase slowing down under load,
+#                               to try out throttling).
+
+import os, sys, json, time, shutil, re, datetime, hashlib, tempfile
+
+_messages = []
+
+class _Env(object):
+   def __init__(self):
+      self.workspace = None
+      self.overwriteOutput = False
+      self.compression = None
+      self.pyramid = None
+      self.rasterStatistics = None
+      self.preserveGlobalIds = False
+
+env = _Env()
+
+SUFFIXES = {"FeatureClass": ".fc.json", "Table": ".tbl.json", "RasterDataset": ".ras.json"}
+
+_LOAD_FOLDER = os.path.join(tempfile.gettempdir(), "fake_arcpy_load")
+
+def _latency(nbytes = 0):
+   ms = float(os.environ.get("FAKE_ARCPY_LATENCY_MS", "0"))
+   load_ms = float(os.environ.get("FAKE_ARCPY_LOAD_MS", "0"))
+   if load_ms > 0 and os.path.isdir(_LOAD_FOLDER):
+      ms += load_ms * len(os.listdir(_LOAD_FOLDER))
+   mbps = float(os.environ.get("FAKE_ARCPY_MBPS", "0"))
+   s = ms / 1000.0
+   if mbps > 0:
+      s += nbytes / (mbps * 1000000.0)
+   if s > 0:
+      time.sleep(s)
+
+def GetParameterAsText(i):
+   try:
+      return sys.argv[i + 1]
+   except IndexError:
+      return ""
+
+def GetMessages(severity = 0):
+   return "\n".join(_messages)
+
+def _norm(path):
+   path = path.replace("\\", "/")
+   if not os.path.isabs(path) and env.workspace:
+      path = os.path.join(env.workspace.replace("\\", "/"), path)
+   return path
+
+def _object_file(path):
+   path = _source(path)
+   for suffix in SUFFIXES.values():
+      if os.path.isfile(path + suffix):
+         return path + suffix
+   return None
+
+def _load(path):
+   f = _object_file(path)
+   if f is None:
+      raise ExecuteError("ERROR 000732: Dataset " + path + " does not exist or is not supported")
+   with open(f) as fh:
+      return json.load(fh)
+
+def _save(path, data, kind):
+   path = _norm(path)
+   with open(path + SUFFIXES[kind], "w") as fh:
+      json.dump(data, fh)
+   if data.get("bytes"):
+      with open(path + ".bin", "wb") as fh:
+         fh.write(b"\0" * int(data["bytes"]))
+
+class ExecuteError(Exception):
+   pass
+
+def Exists(path):
+   if path is None or path == "":
+      return False
+   p = _norm(path)
+   _latency()
+   return os.path.isdir(p) or os.path.isfile(p) or os.path.isdir(p + ".fds") or _object_file(path) is not None
+
+def _strip(name):
+   for suffix in SUFFIXES.values():
+      if name.endswith(suffix):
+         return name[:-len(suffix)]
+   return name
+
+def _list(folder, kind):
+   folder = _norm(folder)
+   out = []
+   if not os.path.isdir(folder):
+      return out
+   for n in sorted(os.listdir(folder)):
+      if n.endswith(SUFFIXES[kind]):
+         out.append(_strip(n))
+   return out
+
+def ListWorkspaces(wild_card = "*", workspace_type = "All"):
+   folder = _norm(env.workspace)
+   out = []
+   for n in sorted(os.listdir(folder)):
+      if n.lower().endswith(".gdb") and os.path.isdir(os.path.join(folder, n)):
+         out.append(os.path.join(env.workspace, n))
+   return out
+
+def ListDatasets(wild_card = "*", feature_type = "All"):
+   folder = _norm(env.workspace)
+   return sorted(n[:-4] for n in os.listdir(folder) if n.endswith(".fds") and os.path.isdir(os.path.join(folder, n)))
+
+def _fds_dir(name):
+   p = _norm(name)
+   if os.path.isdir(p + ".fds"):
+      return p + ".fds"
+   return p
+
+def ListFeatureClasses(wild_card = "*", feature_type = "All", feature_dataset = None):
+   if feature_dataset:
+      return _list(_fds_dir(feature_dataset), "FeatureClass")
+   return _list(env.workspace, "FeatureClass")
+
+def ListTables(wild_card = "*", table_type = "All"):
+   return _list(env.workspace, "Table")
+
+def ListRasters(wild_card = "*", raster_type = "All"):
+   return _list(env.workspace, "RasterDataset")
+
+def _target(path):
+   #RESOLVE gdb\fds\name TARGET PATHS
+   p = _norm(path)
+   parent, name = os.path.split(p)
+   if not os.path.isdir(parent) and os.path.isdir(parent + ".fds"):
+      parent = parent + ".fds"
+   return os.path.join(parent, name)
+
+def _source(path):
+   p = _norm(path)
+   parent, name = os.path.split(p)
+   if not os.path.isdir(parent) and os.path.isdir(parent + ".fds"):
+      return os.path.join(parent + ".fds", name)
+   return p
+
+class Result(object):
+   def __init__(self, *values):
+      self.values = values
+   def getOutput(self, i):
+      return self.values[i]
+   def __getitem__(self, i):
+      return self.values[i]
+
+class Field(object):
+   def __init__(self, d):
+      self.name = d["name"]
+      self.type = d.get("type", "String")
+      self.length = d.get("length", 0)
+      self.aliasName = d.get("alias", self.name)
+      self.editable = self.type not in ("OID", "GlobalID") and not d.get("readonly", False)
+      self.required = self.type in ("OID", "Geometry", "GlobalID") or d.get("required", False)
+      self.isNullable = not self.required
+
+class Extent(object):
+   def __init__(self, e):
+      e = e or [0, 0, 0, 0]
+      self.XMin, self.YMin, self.XMax, self.YMax = e
+   def __str__(self):
+      return "%s %s %s %s" % (self.XMin, self.YMin, self.XMax, self.YMax)
+
+class SpatialReference(object):
+   def __init__(self, code = 0):
+      self.factoryCode = code
+      self.name = "SR" + str(code)
+
+class Point(object):
+   def __init__(self, X = None, Y = None, *args, **kwargs):
+      self.X = X
+      self.Y = Y
+
+class _Describe(object):
+   pass
+
+def Describe(path):
+   d = _Describe()
+   p = _norm(path)
+   d.catalogPath = p
+   d.name = os.path.basename(p)
+   d.baseName = d.name
+   if p.lower().endswith(".gdb") and os.path.isdir(p):
+      d.dataType = "Workspace"
+      d.workspaceType = "LocalDatabase"
+      return d
+   if os.path.isdir(p + ".fds"):
+      d.dataType = "FeatureDataset"
+      d.spatialReference = SpatialReference(0)
+      return d
+   data = _load(path)
+   d.dataType = data["kind"]
+   d.fields = [Field(f) for f in data.get("fields", [])]
+   d.OIDFieldName = "OBJECTID"
+   d.hasOID = True
+   d.extent = Extent(data.get("extent"))
+   if d.dataType == "FeatureClass":
+      d.shapeType = data.get("shape_type", "Polygon")
+      d.shapeFieldName = "Shape"
+      d.hasM = False
+      d.hasZ = False
+   d.spatialReference = SpatialReference(data.get("wkid", 0))
+   et = data.get("editor_tracking") or {}
+   d.editorTrackingEnabled = bool(et)
+   d.editedAtFieldName = et.get("edited_at", "")
+   d.createdAtFieldName = et.get("created_at", "")
+   d.hasGlobalID = any(f.type == "GlobalID" for f in d.fields)
+   d.globalIDFieldName = "GlobalID" if d.hasGlobalID else ""
+   d.isArchived = bool(data.get("archived"))
+   d.isVersioned = False
+   r = data.get("raster") or {}
+   d.width = r.get("width", 0)
+   d.height = r.get("height", 0)
+   d.bandCount = r.get("bands", 1)
+   d.pixelType = r.get("pixel_type", "U8")
+   d.meanCellWidth = r.get("cell", 1.0)
+   d.meanCellHeight = r.get("cell", 1.0)
+   d.compressionType = r.get("compression", "None")
+   d.noDataValue = r.get("nodata")
+   return d
+
+class _Array(object):
+   def __init__(self, data):
+      self.data = data
+   def tobytes(self):
+      return self.data
+
+def RasterToNumPyArray(in_raster, lower_left_corner = None, ncols = None, nrows = None, nodata_to_value = None):
+   data = _load(_source(in_raster))
+   _latency()
+   corner = ""
+   if lower_left_corner is not None:
+      corner = repr((lower_left_corner.X, lower_left_corner.Y))
+   return _Array(hashlib.sha256((str(data.get("pixels", "")) + corner + repr((ncols, nrows))).encode("utf-8")).digest())
+
+def ListFields(path, wild_card = None, field_type = None):
+   return Describe(path).fields
+
+class _Management(object):
+   def CreateFileGDB(self, out_folder_path, out_name, out_version = "CURRENT"):
+      p = os.path.join(_norm(out_folder_path), out_name)
+      if not p.lower().endswith(".gdb"):
+         p += ".gdb"
+      os.makedirs(p)
+      with open(os.path.join(p, "gdb"), "wb") as fh:
+         fh.write(b"\0" * 4096)
+      _latency()
+      return Result(p)
+   def CreateFeatureDataset(self, out_dataset_path, out_name, spatial_reference = None):
+      os.makedirs(os.path.join(_norm(out_dataset_path), out_name + ".fds"))
+      _latency()
+      return Result(out_name)
+   def Copy(self, in_data, out_data, data_type = None):
+      src = _object_file(_source(in_data))
+      if src is None:
+         raise ExecuteError("ERROR 000732: " + in_data)
+      with open(src) as fh:
+         data = json.load(fh)
+      marker = None
+      if float(os.environ.get("FAKE_ARCPY_LOAD_MS", "0")) > 0:
+         os.makedirs(_LOAD_FOLDER, exist_ok = True)
+         marker = os.path.join(_LOAD_FOLDER, str(os.getpid()) + "-" + str(time.time()))
+         open(marker, "w").close()
+      try:
+         _latency(int(data.get("bytes", 0)))
+      finally:
+         if marker:
+            os.remove(marker)
+      fail = os.environ.get("FAKE_ARCPY_FAIL_COPY")
+      if fail and fail.lower() in in_data.lower():
+         _save(_target(out_data), dict(data, rows = data.get("rows", [])[:1]), data["kind"])
+         raise ExecuteError("ERROR 999999: simulated failure copying " + in_data)
+      truncate = os.environ.get("FAKE_ARCPY_TRUNCATE_COPY")
+      if truncate and truncate.lower() in in_data.lower():
+         data = dict(data, rows = _rows(data)[:-1])
+         data.pop("row_count", None)
+      _save(_target(out_data), data, data["kind"])
+      _messages.append("Copied " + in_data)
+      return Result(out_data)
+   def Delete(self, in_data, data_type = None):
+      p = _norm(in_data)
+      if os.path.isdir(p):
+         shutil.rmtree(p)
+         return Result(in_data)
+      f = _object_file(_source(in_data))
+      if f:
+         os.remove(f)
+         base = f[:f.rfind(".", 0, f.rfind("."))]
+         if os.path.isfile(base + ".bin"):
+            os.remove(base + ".bin")
+      return Result(in_data)
+   def GetCount(self, in_rows):
+      data = _load(_source(in_rows))
+      _latency()
+      if "rows" in data:
+         return Result(str(len(data["rows"])))
+      return Result(str(data.get("row_count", 0)))
+   def CreateTable(self, out_path, out_name, template = None, config_keyword = None, out_alias = None):
+      data = {"kind": "Table", "fields": [], "rows": []}
+      if template:
+         data["fields"] = _load(_source(template)).get("fields", [])
+      _save(_target(os.path.join(out_path, out_name)), data, "Table")
+      return Result(os.path.join(out_path, out_name))
+   def CreateFeatureclass(self, out_path, out_name, geometry_type = "POLYGON", template = None, has_m = "DISABLED", has_z = "DISABLED", spatial_reference = None, *args, **kwargs):
+      data = {"kind": "FeatureClass", "fields": [], "rows": [], "shape_type": geometry_type.title()}
+      if template:
+         t = _load(_source(template))
+         data["fields"] = t.get("fields", [])
+         data["extent"] = t.get("extent")
+      _save(_target(os.path.join(out_path, out_name)), data, "FeatureClass")
+      return Result(os.path.join(out_path, out_name))
+   def DeleteField(self, in_table, drop_field):
+      p = _source(in_table)
+      data = _load(p)
+      if isinstance(drop_field, str):
+         drop_field = drop_field.split(";")
+      drop = [f.upper() for f in drop_field]
+      keep = [i for i, f in enumerate(data["fields"]) if f["name"].upper() not in drop]
+      data["fields"] = [data["fields"][i] for i in keep]
+      if "rows" in data:
+         data["rows"] = [[r[i] for i in keep] for r in data["rows"]]
+      _save(p, data, data["kind"])
+      return Result(in_table)
+   def AddField(self, in_table, field_name, field_type, field_precision = None, field_scale = None, field_length = None, *args, **kwargs):
+      p = _source(in_table)
+      data = _load(p)
+      data["rows"] = _rows(data)
+      data.pop("row_count", None)
+      data["fields"].append({"name": field_name, "type": {"TEXT": "String", "LONG": "Integer", "SHORT": "SmallInteger", "DOUBLE": "Double", "DATE": "Date"}.get(field_type.upper(), field_type), "length": field_length or 0})
+      for r in data["rows"]:
+         r.append(None)
+      _save(p, data, data["kind"])
+      return Result(in_table)
+   def CopyRaster(self, in_raster, out_rasterdataset, *args, **kwargs):
+      data = _load(_source(in_raster))
+      _latency(int(data.get("bytes", 0)))
+      data["raster"] = dict(data.get("raster") or {})
+      if env.compression:
+         data["raster"]["compression"] = env.compression
+      data["pyramids"] = env.pyramid != "NONE"
+      _save(_target(out_rasterdataset), data, "RasterDataset")
+      return Result(out_rasterdataset)
+   def Clip(self, in_raster, rectangle, out_raster, *args, **kwargs):
+      data = _load(_source(in_raster))
+      e = data.get("extent") or [0, 0, 0, 0]
+      t = [float(v) for v in rectangle.split()]
+      share = 0.0
+      if (e[2] - e[0]) * (e[3] - e[1]) > 0:
+         share = (t[2] - t[0]) * (t[3] - t[1]) / float((e[2] - e[0]) * (e[3] - e[1]))
+      new = dict(data, extent = t, bytes = int(int(data.get("bytes", 0)) * share))
+      _latency(new["bytes"])
+      _save(out_raster, new, "RasterDataset")
+      return Result(out_raster)
+   def CreateRasterDataset(self, out_path, out_name, cellsize = None, pixel_type = None, raster_spatial_reference = None, number_of_bands = 1, config_keyword = None, pyramids = None, tile_size = None, compression = None, *args, **kwargs):
+      data = {"kind": "RasterDataset", "fields": [], "row_count": 0, "raster": {"bands": number_of_bands, "cell": cellsize, "compression": compression or "None"}, "pyramids": pyramids != "NONE"}
+      _save(_target(os.path.join(out_path, out_name)), data, "RasterDataset")
+      _latency()
+      return Result(os.path.join(out_path, out_name))
+   def Mosaic(self, inputs, target, mosaic_type = "LAST", colormap = "FIRST", background_value = None, nodata_value = None, *args, **kwargs):
+      #snapshot.py SETS NO BACKGROUND VALUE; NoData GOES IN nodata_value (A BACKGROUND VALUE WOULD FILL PIXELS W/ IT)
+      if background_value is not None:
+         raise ExecuteError("ERROR 999999: unexpected background_value " + str(background_value) + " (NoData belongs in nodata_value)")
+      p = _source(target)
+      data = _load(p)
+      for i in inputs.split(";"):
+         tile = _load(i)
+         data["bytes"] = int(data.get("bytes", 0)) + int(tile.get("bytes", 0))
+         data.setdefault("pixels", tile.get("pixels"))
+         e = data.get("extent") or tile["extent"]
+         data["extent"] = [min(e[0], tile["extent"][0]), min(e[1], tile["extent"][1]), max(e[2], tile["extent"][2]), max(e[3], tile["extent"][3])]
+      cell = data["raster"].get("cell") or 1.0
+      data["raster"]["width"] = int(round((data["extent"][2] - data["extent"][0]) / cell))
+      data["raster"]["height"] = int(round((data["extent"][3] - data["extent"][1]) / cell))
+      if nodata_value is not None:
+         data["raster"]["nodata"] = nodata_value
+      _save(p, data, "RasterDataset")
+      return Result(target)
+   def BuildPyramids(self, in_raster_dataset, *args, **kwargs):
+      return Result(in_raster_dataset)
+   def CalculateStatistics(self, in_raster_dataset, *args, **kwargs):
+      return Result(in_raster_dataset)
+
+management = _Management()
+
+def _rows(data):
+   if "rows" in data:
+      return data["rows"]
+   out = []
+   for i in range(int(data.get("row_count", 0))):
+      row = []
+      for f in data.get("fields", []):
+         if f["type"] == "OID":
+            row.append(i + 1)
+         elif f["type"] == "Geometry":
+            row.append("POINT (%d %d)" % (i, i))
+         elif f["type"] == "Date":
+            row.append("2024-01-01 00:00:00")
+         elif f["type"] in ("Integer", "SmallInteger"):
+            row.append(i)
+         else:
+            row.append(f["name"] + str(i))
+      out.append(row)
+   return out
+
+def _field_index(data, name):
+   names = [f["name"].upper() for f in data.get("fields", [])]
+   u = name.upper()
+   if u in ("OID@",):
+      u = "OBJECTID"
+   if u.startswith("SHAPE@"):
+      u = "SHAPE"
+   return names.index(u)
+
+_COND = re.compile(r"^\s*([\w@]+)\s*(>=|<=|<>|=|>|<)\s*(?:(?:timestamp|date)\s*)?'?([^']*?)'?\s*$", re.I)
+
+def _match(row, data, where):
+   if not where:
+      return True
+   for part in re.split(r"\s+AND\s+", where, flags = re.I):
+      m = _COND.match(part)
+      if not m:
+         continue
+      v = row[_field_index(data, m.group(1))]
+      want = m.group(3)
+      if isinstance(v, (int, float)):
+         want = float(want)
+      op = m.group(2)
+      ok = {"=": v == want, ">": v > want, "<": v < want, ">=": v >= want, "<=": v <= want, "<>": v != want}[op]
+      if not ok:
+         return False
+   return True
+
+class SearchCursor(object):
+   def __init__(self, in_table, field_names, where_clause = None, spatial_reference = None, explode_to_points = False, sql_clause = (None, None)):
+      self.data = _load(_source(in_table))
+      if isinstance(field_names, str):
+         field_names = [field_names]
+      if field_names == ["*"]:
+         field_names = [f["name"] for f in self.data.get("fields", [])]
+      self.fields = field_names
+      idx = [_field_index(self.data, f) for f in field_names]
+      rows = [r for r in _rows(self.data) if _match(r, self.data, where_clause)]
+      post = (sql_clause or (None, None))[1]
+      if post:
+         m = re.search(r"ORDER BY\s+([\w@]+)(\s+DESC)?", post, re.I)
+         if m:
+            k = _field_index(self.data, m.group(1))
+            rows.sort(key = lambda r: (r[k] is None, r[k]), reverse = bool(m.group(2)))
+      self._it = iter([tuple(r[i] for i in idx) for r in rows])
+      _latency()
+   def __iter__(self):
+      return self
+   def __next__(self):
+      return next(self._it)
+   def next(self):
+      return next(self._it)
+   def __enter__(self):
+      return self
+   def __exit__(self, *a):
+      return False
+   def reset(self):
+      pass
+
+class InsertCursor(object):
+   def __init__(self, in_table, field_names):
+      self.path = _source(in_table)
+      self.data = _load(self.path)
+      self.data.setdefault("rows", [])
+      self.idx = [_field_index(self.data, f) for f in field_names]
+      self.oid = len(self.data["rows"])
+   def insertRow(self, row):
+      new = [None] * len(self.data["fields"])
+      for k, i in enumerate(self.idx):
+         new[i] = row[k]
+      for i, f in enumerate(self.data["fields"]):
+         if f["type"] == "OID":
+            self.oid += 1
+            new[i] = self.oid
+      self.data["rows"].append(new)
+      return self.oid
+   def __enter__(self):
+      return self
+   def __exit__(self, *a):
+      self.close()
+      return False
+   def close(self):
+      _save(self.path, self.data, self.data["kind"])
+   def __del__(self):
+      pass
+
+class UpdateCursor(object):
+   def __init__(self, in_table, field_names, where_clause = None, *args, **kwargs):
+      self.path = _source(in_table)
+      self.data = _load(self.path)
+      self.data["rows"] = _rows(self.data)
+      self.data.pop("row_count", None)
+      if isinstance(field_names, str):
+         field_names = [field_names]
+      self.idx = [_field_index(self.data, f) for f in field_names]
+      self.todo = [r for r in self.data["rows"] if _match(r, self.data, where_clause)]
+      self.current = None
+      self.deleted = []
+      _latency()
+   def __iter__(self):
+      return self
+   def __next__(self):
+      if not self.todo:
+         raise StopIteration
+      self.current = self.todo.pop(0)
+      return [self.current[i] for i in self.idx]
+   def updateRow(self, row):
+      for k, i in enumerate(self.idx):
+         if self.data["fields"][i]["type"] not in ("OID", "GlobalID"):
+            self.current[i] = row[k]
+   def deleteRow(self):
+      self.deleted.append(id(self.current))
+   def __enter__(self):
+      return self
+   def __exit__(self, *a):
+      self.close()
+      return False
+   def close(self):
+      self.data["rows"] = [r for r in self.data["rows"] if id(r) not in self.deleted]
+      _save(self.path, self.data, self.data["kind"])
+
+class _Da(object):
+   SearchCursor = SearchCursor
+   InsertCursor = InsertCursor
+   UpdateCursor = UpdateCursor
+   def Walk(self, top, topdown = True, onerror = None, followlinks = False, datatype = None, type = None):
+      if isinstance(datatype, str):
+         datatype = [datatype]
+      kinds = datatype or ["FeatureClass", "Table", "RasterDataset"]
+      top_p = _norm(top)
+      fds = sorted(n[:-4] for n in os.listdir(top_p) if n.endswith(".fds"))
+      files = []
+      for k in kinds:
+         if k in SUFFIXES:
+            files.extend(_list(top_p, k))
+      yield (top, fds, files)
+      for f in fds:
+         sub = []
+         if "FeatureClass" in kinds:
+            sub = _list(os.path.join(top_p, f + ".fds"), "FeatureClass")
+         yield (os.path.join(top, f), [], sub)
+   def Describe(self, path):
+      d = Describe(path)
+      return dict(d.__dict__)
+
+da = _Da()
+
+class _Conversion(object):
+   def ExportTable(self, in_table, out_table, where_clause = None, *args, **kwargs):
+      data = _load(_source(in_table))
+      rows = [r for r in _rows(data) if _match(r, data, where_clause)]
+      new = dict(data)
+      new["rows"] = rows
+      new.pop("row_count", None)
+      new["kind"] = "Table"
+      _save(_target(out_table), new, "Table")
+      return Result(out_table)
+   def ExportFeatures(self, in_features, out_features, where_clause = None, *args, **kwargs):
+      data = _load(_source(in_features))
+      rows = [r for r in _rows(data) if _match(r, data, where_clause)]
+      new = dict(data)
+      new["rows"] = rows
+      new.pop("row_count", None)
+      _save(_target(out_features), new, "FeatureClass")
+      return Result(out_features)
+
+conversion = _Conversion()
@@ -0,0 +1,120 @@
+#PURPOSE
+#   A stand-in email (SMTP) server for trying out snapshot.py's email delivery (see "Email reports are
+#   sent in the background" in snapshot.py's README NOTES) w/o a real email server. Emails it receives
+#   are saved as files; it can also be made slow or failing.
+
+#HOW TO USE
+#   python benchmarks/smtp_standin.py [arguments]
+#
+#   Arguments (all optional):
+#      --port <integer>      Port to listen on (localhost only). Default is 1025.
+#      --folder <path>       Folder in which each received email is saved (as <n>.eml). Default is the
+#                            smtp_standin folder in the system's temporary folder.
+#      --delay <seconds>     Seconds to wait before each reply (to try out mail_timeout).
+#      --fail <integer>      Number of emails to refuse w/ a temporary error (451) before accepting
+#                            any (to try out retries and the mail spool).
+#      --reject              Refuse all recipients w/ a permanent error (550).
+#
+#   Then run snapshot.py w/ email_server localhost and email_port 1025. Connections and emails are printed,
+#   so reused connections can be seen.
+
+#IMPORT MODULES
+import sys, os, os.path, time, tempfile, argparse, socketserver, threading
+
+#SETTINGS (FROM ARGUMENTS) AND COUNTERS, SHARED BY CONNECTIONS
+settings = None
+counter_lock = threading.Lock()
+counters = {"connections": 0, "emails": 0, "failed": 0}
+
+#THIS CLASS HANDLES ONE SMTP CONNECTION (ONLY WHAT smtplib NEEDS TO SEND AN EMAIL)
+class SMTPHandler(socketserver.StreamRequestHandler):
+   def reply(self, the_line):
+      if settings.delay > 0:
+         time.sleep(settings.delay)
+      self.wfile.write((the_line + "\r\n").encode("utf-8"))
+      self.wfile.flush()
+
+   def handle(self):
+      with counter_lock:
+         counters["connections"] += 1
+         the_connection = counters["connections"]
+      print("connection " + str(the_connection) + " opened")
+      self.reply("220 localhost snapshot SMTP stand-in")
+      the_sender = None
+      the_recipients = []
+      while True:
+         the_line = self.rfile.readline()
+         if not the_line:
+            break
+         the_command = the_line.decode("utf-8", "replace").strip()
+         the_verb = the_command[0:4].upper()
+         if the_verb in ("HELO", "EHLO"):
+            self.reply("250 localhost")
+         elif the_verb == "MAIL":
+            the_sender = the_command[10:len(the_command)]
+            the_recipients = []
+            self.reply("250 OK")
+         elif the_verb == "RCPT":
+            if settings.reject == True:
+               self.reply("550 Recipient rejected by stand-in")
+            else:
+               the_recipients.append(the_command[8:len(the_command)])
+               self.reply("250 OK")
+         elif the_verb == "DATA":
+            self.reply("354 End data w/ <CR><LF>.<CR><LF>")
+            the_data = []
+            while True:
+               the_line = self.rfile.readline()
+               if not the_line or the_line.rstrip(b"\r\n") == b".":
+                  break
+               the_data.append(the_line)
+            with counter_lock:
+               the_refuse = counters["failed"] < settings.fail
+               if the_refuse:
+                  counters["failed"] += 1
+               else:
+                  counters["emails"] += 1
+                  the_number = counters["emails"]
+            if the_refuse:
+               print("connection " + str(the_connection) + ": email refused (451)")
+               self.reply("451 Temporary failure by stand-in")
+               continue
+            the_path = os.path.join(settings.folder, str(the_number) + ".eml")
+            with open(the_path, "wb") as the_file:
+               the_file.write(b"".join(the_data))
+            print("connection " + str(the_connection) + ": email " + str(the_number) + " from " + str(the_sender) + " to " + ", ".join(the_recipients) + " saved as " + the_path)
+            self.reply("250 OK")
+         elif the_verb in ("NOOP", "RSET"):
+            self.reply("250 OK")
+         elif the_verb == "QUIT":
+            self.reply("221 Bye")
+            break
+         else:
+            self.reply("502 Command not implemented")
+      print("connection " + str(the_connection) + " closed")
+
+#THIS CLASS IS THE SERVER (ONE THREAD PER CONNECTION)
+class SMTPServer(socketserver.ThreadingTCPServer):
+   allow_reuse_address = True
+   daemon_threads = True
+
+#THIS FUNCTION RUNS THE STAND-IN SERVER UNTIL IT'S INTERRUPTED (CTRL+C)
+def main():
+   global settings
+   the_parser = argparse.ArgumentParser(description = "Stand-in SMTP server for snapshot.py.")
+   the_parser.add_argument("--port", type = int, default = 1025)
+   the_parser.add_argument("--folder", default = os.path.join(tempfile.gettempdir(), "smtp_standin"))
+   the_parser.add_argument("--delay", type = float, default = 0)
+   the_parser.add_argument("--fail", type = int, default = 0)
+   the_parser.add_argument("--reject", action = "store_true")
+   settings = the_parser.parse_args()
+   os.makedirs(settings.folder, exist_ok = True)
+   with SMTPServer(("127.0.0.1", settings.port), SMTPHandler) as the_server:
+      print("SMTP stand-in listening on localhost:" + str(settings.port) + "; emails are saved in " + settings.folder)
+      try:
+         the_server.serve_forever()
+      except KeyboardInterrupt:
+         pass
+
+if __name__ == "__main__":
+   main()
@@ -5,13 +5,211 @@
 
 #README NOTES
 #   This script logs its activity to a log file (snapshot.log) which is written into the
-#   script's directory at execution time. Periodically truncate or delete the log file to
-#   preserve disk space.
+#   script's directory (or the folder set by the "log_folder" option; see options argument) at
+#   execution time. Log lines are buffered and written to the log file in batches. By default, the
+#   log file is rotated when it reaches 10 MB; rotated log files are compressed w/ gzip
+#   (snapshot.log.1.gz is the newest) and the 5 newest are kept. With the "log_json" option, log
+#   lines are also written to snapshot.jsonl, one JSON object per line (time, snapshot name, and
+#   message, plus object name, duration, rows, and bytes where they apply). Console output and
+#   email reports are the same either way.
 #
 #   Feature datasets aren't copied at the feature-dataset level. Instead, a feature dataset
 #   with the same name is created in the snapshot geodatabase and then feature classes are
 #   copied individually into that feature dataset. Other feature-dataset objects, such as
 #   topologies and geometric networks, aren't copied.
+#
+#   The full set of data objects to be copied is planned before any copying starts. By default,
+#   planned data objects are copied one after another. The "workers" option (see options argument)
+#   copies them in a pool of worker processes instead; each worker process runs its own arcpy
+#   session. Feature datasets are always created before any copying starts. Log lines and the
+#   email report list copied data objects in planned order, regardless of the order in which
+#   workers finish.
+#
+#   With the "incremental" option (see options argument), each feature class and table is
+#   fingerprinted (schema, row count, extent, and--where editor tracking is enabled--latest edit
+#   date; optionally a checksum of all attributes and geometries). Fingerprints are saved next to
+#   each snapshot geodatabase in SNAPSHOT_<geodatabase nickname>_YYYYMMDD.fingerprints.json. If a
+#   data object's fingerprint matches its fingerprint in the previous snapshot, it is copied from
+#   the previous snapshot geodatabase instead of from the source geodatabase. A raster dataset's
+#   fingerprint combines its properties (size, bands, pixel type, cell size, extent, spatial reference,
+#   compression, NoData value) w/ the pixels of a grid of sample windows ("raster_samples" option),
+#   so an edit that touches none of the sample windows (and no property) goes unnoticed.
+#
+#   Raster datasets are copied w/ the Copy tool, unless raster options (see options argument) are
+#   set. With "raster_tile_size", a raster dataset that's wider or taller than the tile size is
+#   copied in tiles: each tile is clipped from the source geodatabase to a TIFF file in a tile folder
+#   (SNAPSHOT_<geodatabase nickname>_YYYYMMDD.tiles, next to the snapshot geodatabase), in a pool of
+#   "raster_workers" worker processes, and then tiles are mosaicked into an empty raster dataset that
+#   has the source's properties. Tile files are deleted once mosaicked. With "raster_compression",
+#   copies are compressed as given. With "raster_pyramids", building pyramids and statistics is left
+#   until all data objects are copied (defer) or skipped (none).
+#
+#   With the "throttle" option (see options argument), copying is throttled to protect the source
+#   geodatabase from overload (and its editors from slowdowns). Each copy first times one request to
+#   the source geodatabase (its latency). Copying starts w/ "throttle_min" copies at the same time;
+#   once as many copies as are running finish, the average of their latencies is compared to the
+#   target ("throttle_latency_ms" option): above it, copies at the same time are halved (down to
+#   throttle_min); below half of it, they're increased by one (up to "workers", or the most allowed
+#   by the current time-of-day window, "throttle_windows" option). Rows copied per second can also
+#   be capped ("throttle_rows" option). Each decision (and its reason) is logged and listed in the
+#   run report, so the settings can be tuned.
+#
+#   With the "verify" option (see options argument), copied data objects are verified against the
+#   source geodatabase once they're all copied, in a pool of worker processes ("verify_workers"
+#   option): schema (editable fields, w/ types and lengths), row count, and extent; optionally a
+#   checksum of sampled rows (the first and last rows, in ObjectID order) or of all rows; for raster
+#   datasets, properties and optionally sampled pixels. Deltas (see "delta" option) aren't verified.
+#   Verification stops at its time budget ("verify_minutes" option); data objects not verified by
+#   then are reported as such. A data object that fails verification is flagged for recopy: it's
+#   copied again from the source geodatabase and verified again ("verify_recopy" option), and if it
+#   still fails, its fingerprint isn't saved (so the next snapshot copies it from the source
+#   geodatabase) and the email report is an ERROR CONDITION. Results are listed in the email report
+#   and the run report. An edit made to the source geodatabase after a data object is copied (and
+#   before it's verified) also fails verification.
+#
+#   By default, feature classes and tables are copied w/ the Copy tool. With the "stream_rows"
+#   option (see options argument), feature classes and tables that have at least the given number of
+#   rows are instead streamed: an empty copy is created from the source's schema, then rows are read
+#   w/ a search cursor and written w/ an insert cursor in batches ("stream_batch" option). Each batch
+#   is read w/ its own search cursor (by ObjectID range), so no read on the source geodatabase is held
+#   open for the whole copy. Progress and rows per second are printed as batches are written. The
+#   "fields:<name>" option streams only a subset of a data object's fields.
+#
+#   While a snapshot is being made, a journal (SNAPSHOT_<geodatabase nickname>_YYYYMMDD.journal, next
+#   to the snapshot geodatabase) records which data objects are planned and which have been copied.
+#   The journal is written before the snapshot geodatabase is created and deleted once the snapshot is
+#   complete; a snapshot that still has a journal is incomplete and isn't counted as a snapshot (its
+#   geodatabase may be missing or partial, and is then recreated). If a run fails partway through, the next
+#   run resumes the incomplete snapshot (keeping its date) instead of checking whether a snapshot is
+#   due: data objects that were copied are checked (they must exist and have the recorded number of
+#   rows) and kept, partial copies are deleted, and only the remaining data objects are copied.
+#
+#   With the "delta" option (see options argument), feature classes and tables that have editor
+#   tracking (or, failing that, geodatabase archiving) are snapshot as deltas. The first snapshot of
+#   such a data object is a full copy, its base. Each later snapshot has only the rows inserted or
+#   updated since the base (w/ each row's key--GlobalID, ObjectID, or the "delta_key" field--in a
+#   SNAPSHOT_KEY field) and the keys of rows deleted since the base. Changes are found by the data
+#   object's last-edited date (editor tracking) or GDB_FROM_DATE (archiving), compared to the latest
+#   one at the time of the base (rows that had that latest date in the base are only copied again if
+#   their values changed). A new base is copied once the base is "delta_base_days" old, or if
+#   the data object's schema changes. Each snapshot geodatabase w/ bases or deltas has a delta folder
+#   next to it, SNAPSHOT_<geodatabase nickname>_YYYYMMDD.delta, which has each data object's keys (of
+#   a base) or deleted keys (of a delta) and an index (index.json) that tells which data objects are
+#   bases or deltas and the date of each delta's base. The --reconstruct command (see HOW TO USE)
+#   reconstructs a data object as of any snapshot's date. Data objects w/o editor tracking or
+#   archiving, raster datasets, and data objects w/ field subsets are always copied in full. With the
+#   "incremental" option, a data object whose fingerprint is unchanged is copied from the previous
+#   snapshot as it's there (a base, or a delta of a base that's still in use), w/o reading its rows.
+#
+#   With the "catalog" option (see options argument), this script keeps a catalog of snapshots
+#   (snapshot_catalog.sqlite, a SQLite database in the snapshot folder). The catalog records each
+#   snapshot's date, path, size, and duration, and each data object's type, row count, and copy
+#   duration. It's updated when a snapshot is made. When the catalog is used, the date of the last
+#   snapshot and the sizes of snapshot geodatabases are read from the catalog instead of by
+#   scanning the snapshot folder. Snapshot geodatabases that are listed but no longer exist are
+#   removed from the catalog automatically. If snapshot geodatabases are added by hand, rebuild the
+#   catalog from the snapshot folder's contents w/ the --reconcile command (see HOW TO USE). If the
+#   catalog doesn't exist yet, it's built from the snapshot folder's contents automatically.
+#
+#   The snapshot catalog is also an index of which data objects (w/ row counts, fingerprints, and
+#   bases of deltas) are in which snapshot, for the --history, --asof, and --extract commands (see HOW
+#   TO USE). They answer questions like "what did Parcels look like on March 3?" w/o opening snapshot
+#   geodatabases: the snapshot for a date is the newest one, on or before the date, that has the data
+#   object. Before answering, they reconcile the catalog (see --reconcile), so snapshot geodatabases
+#   made w/o the "catalog" option are indexed (only those are opened). Fingerprints are only recorded
+#   for snapshots made w/ the "incremental" option; w/o them, whether a data object changed is told
+#   by its row count.
+#
+#   Snapshot geodatabases aren't deleted unless a retention option (see options argument) is set. With
+#   retention rules ("retain_daily", "retain_weekly", "retain_monthly", and "retain_yearly"
+#   options; grandfather-father-son), the newest snapshot of each of the given number of newest days,
+#   weeks, months, and years (that have snapshots) is kept; a snapshot kept by any rule is kept. With
+#   "retain_max_gb", kept snapshots are also deleted, oldest first, until the source geodatabase's
+#   snapshot geodatabases fit in the given total size. The newest snapshot, incomplete snapshots (see
+#   journal, below), and bases of deltas in kept snapshots (see "delta" option) are always kept; only
+#   snapshots of the source geodatabase (by nickname) are considered. Retention is applied at the end of
+#   each run (whether or not a snapshot was made), by the dates in snapshot-geodatabase names. A deleted
+#   snapshot's files next to it (delta folder, fingerprints, report, journal, and tile folder) are deleted
+#   w/ it, in a pool of threads ("retain_workers" option). Each snapshot geodatabase is first renamed
+#   (to <name>.deleting), so a deletion that's interrupted never leaves a partial snapshot; leftovers are
+#   deleted by the next run. The email report and run report list kept and deleted snapshots (w/ the
+#   reasons) and the space reclaimed. With "retain_dry_run", nothing is deleted; the report tells what
+#   would be.
+#
+#   With the "archive_days" option (see options argument), snapshots that are at least the given number of
+#   days old (except the newest snapshot, and bases of deltas in snapshots that aren't archived, which
+#   --reconstruct needs) are moved into a snapshot archive ("archive_folder" option), a content-addressed
+#   store in which consecutive snapshots (mostly the same files) take little more space than one. Each
+#   file of a snapshot (its geodatabase and the files next to it, as deleted by retention) is split into
+#   chunks ("archive_chunk_kb" option); each chunk is stored once, compressed (zlib), under its SHA-256
+#   hash (chunks\<first 2 characters>\<hash>.z), in a pool of threads ("archive_workers" option). The
+#   snapshot's manifest (manifests\SNAPSHOT_<geodatabase nickname>_YYYYMMDD.json) lists its folders and
+#   files and each file's chunks. A snapshot is deleted only once its manifest is saved; it's removed
+#   from the snapshot catalog (if used). Archiving is done after retention; archived snapshots aren't
+#   subject to retention. The email report lists archived snapshots w/ their logical sizes (as they'd be
+#   restored), and the logical size of all archived snapshots vs. the physical size of the archive. An
+#   archived snapshot isn't seen by --reconstruct, --history, --asof, or --extract (or used as a base of
+#   deltas) until it's restored w/ the --restore command (see HOW TO USE).
+#
+#   Each run writes a run report (JSON) to the snapshot folder, snapshot_run_<geodatabase nickname>.json,
+#   which replaces the previous run's report. If a snapshot was made, the report is also saved next to
+#   the snapshot geodatabase as SNAPSHOT_<geodatabase nickname>_YYYYMMDD.report.json. The report lists
+#   each phase of the run (discovery of pre-existing snapshots, enumeration of source data objects,
+#   copying, measuring the new snapshot, size accounting, and email) w/ its wall time, rows, bytes, and
+#   throughput, and each copied data object w/ its copy time, rows, bytes, and throughput. With the
+#   "prometheus" option (see options argument), the same metrics are also written as a Prometheus
+#   textfile-collector file. The email report lists the 10 slowest data objects.
+#
+#   Snapshot-geodatabase sizes are exact byte totals and file counts, measured by walking each
+#   geodatabase folder (and any subfolders) once. Sizes are cached in snapshot_sizes.json in the
+#   snapshot folder and reused while a geodatabase folder's modification time is unchanged. The
+#   email report also breaks down the newest snapshot geodatabase's size by data object (based on
+#   the file geodatabase's system catalog, GDB_SystemCatalog). If the system catalog can't be read,
+#   or doesn't name every feature class and table that arcpy finds, the report says so and lists
+#   sizes by file name instead.
+#
+#   Email reports are sent in the background: a report is saved to a mail spool folder (see
+#   "mail_spool" option) and queued, and a background thread (the mail worker) sends it while the
+#   script finishes its other work. The script waits for the mail worker only at its very end (see
+#   "mail_wait" option). Connections to the email server time out ("mail_timeout" option) and are
+#   reused for later emails; a failed send is retried w/ increasing waits ("mail_retries" and
+#   "mail_backoff" options). An email that still isn't sent, because the email server is down or the
+#   wait ran out, stays in the mail spool and is sent by the next run that sends email, via its own
+#   email server (or, if that email server is no longer configured, via the next run's). With the
+#   "mail_digest_minutes" option, reports (of one or many geodatabases, from separate runs that share a
+#   mail spool folder) are held in the mail spool and merged into one digest email, like a batch's
+#   report. The benchmarks folder has a stand-in email server (smtp_standin.py) for trying this out.
+#
+#   The source geodatabase's data objects are found w/ one arcpy.da.Walk per data type (feature
+#   classes, tables, and raster datasets), instead of a list request per feature dataset. The
+#   result, an inventory of feature datasets and data objects, is what include/exclude rules are
+#   applied to and what copying is planned from. With the "discovery_ttl" option, the inventory is
+#   cached in the snapshot folder (snapshot_inventory_<geodatabase nickname>.json) and reused for the
+#   given number of minutes, as long as the source geodatabase's change token (which changes when
+#   data objects are added or deleted) is unchanged.
+#
+#   While a snapshot is taken, its snapshot folder is locked (snapshot_folder.lock, a file in the
+#   snapshot folder that the operating system locks), so runs that share a snapshot folder (scheduled
+#   runs that overlap, sources of a batch, or the daemon) don't collide: a run that finds the snapshot
+#   folder locked waits for it ("lock_minutes" option). The lock is released when a run ends in any way,
+#   even if it fails.
+#
+#   Instead of being run by a scheduled task for each source geodatabase, this script can run as a
+#   daemon (--daemon command; see HOW TO USE) that takes snapshots of all sources in a configuration
+#   file as they come due. Each source's next due time is told from its tempo and the date of the last
+#   snapshot in its snapshot folder (as a run would tell it), at its "start_time". Due sources are
+#   queued as jobs in a priority queue and run in a pool of worker processes ("concurrency"), each of
+#   which imports arcpy once and keeps it imported (w/ its license and connections to source
+#   geodatabases) for all the snapshots it takes. Two jobs w/ the same snapshot folder never run at the
+#   same time. Each job's report is emailed when it's done. The daemon's status (sources w/ next due
+#   times, and queued, running, and completed jobs w/ their timings) is written to a status file and,
+#   w/ "status_port", served as JSON at http://127.0.0.1:<status_port>/.
+#
+#   arcpy is imported only when it's needed (to create and copy a snapshot, or to count rows when
+#   the snapshot catalog is rebuilt), since importing it takes a while and checks out a license.
+#   Reading arguments, finding pre-existing snapshots, and deciding whether a snapshot is due are
+#   done in plain Python, so a run on a day when no snapshot is due finishes quickly. The source
+#   geodatabase is connected to (and verified) only once a snapshot is found to be due.
 
 #HOW TO USE
 #   Write a calling script that calls this script and passes arguments per arguments described in
@@ -20,6 +218,90 @@
 #
 #   When scheduling this script to run as a scheduled task, set up the calling script with this command:
 #      <program files>\ArcGIS\Pro\bin\Python\scripts\propy.bat <this script file> <arguments>
+#
+#   COMMANDS
+#      Instead of the arguments, a command can be passed to this script:
+#
+#      --reconcile <snapshot_folder>
+#         Rebuilds the snapshot catalog (see README NOTES) of the given snapshot folder from the
+#         folder's contents. Snapshot geodatabases that no longer exist are removed from the catalog;
+#         snapshot geodatabases that aren't in the catalog are added to it.
+#
+#      --reconstruct <snapshot_folder> <gdb_nickname> <YYYYMMDD> <data object name> <output>
+#         Reconstructs a data object (feature class or table; name a feature class within a feature
+#         dataset as <feature dataset>\<name>) as it was in the newest snapshot on or before the given
+#         date, even if that snapshot has only a delta of it (see README NOTES), and writes it to the
+#         given output feature class or table (full path; it must not exist yet).
+#
+#      --history <snapshot_folder> <gdb_nickname> <data object name>
+#         Lists the snapshots (of the given geodatabase nickname) that have a data object, w/ its row
+#         count and fingerprint in each, and whether it changed since the snapshot before. It's read from
+#         the snapshot catalog (see README NOTES), not from the snapshot geodatabases.
+#
+#      --asof <snapshot_folder> <gdb_nickname> <YYYYMMDD> <data object name>
+#         Tells which snapshot has a data object as it was on the given date: the newest snapshot, on or
+#         before the date, that has it.
+#
+#      --extract <snapshot_folder> <gdb_nickname> <YYYYMMDD> <data object name> <workspace>
+#         Writes a data object, as it was on the given date (see --asof), to the given workspace (a
+#         geodatabase or folder), under its name (w/o feature dataset). A delta is reconstructed (see
+#         --reconstruct).
+#
+#      --restore <snapshot_folder> <snapshot name> {archive_folder}
+#         Restores (rehydrates) an archived snapshot (see README NOTES), for example SNAPSHOT_GDB_BigCity_ParcelData_20250101,
+#         into the snapshot folder: its geodatabase and the files next to it. Each chunk is checked against its
+#         hash. The snapshot stays in the archive (a run w/ the "archive_days" option archives it again, which
+#         stores no new chunks). archive_folder is optional; default is the snapshot_archive folder in the
+#         snapshot folder.
+#
+#      --batch <config_file>
+#         Takes snapshots (where due) of many source geodatabases in one run of this script, so arcpy
+#         is imported at most once, and sends one email report for all of them. The configuration file
+#         is JSON (.json), TOML (.toml), or YAML (.yaml or .yml; needs the PyYAML package). Its
+#         top-level settings are:
+#            sources        A list of source geodatabases. Each source has settings named after
+#                           this script's arguments (see GET ARGUMENTS): source_gdb,
+#                           snapshot_folder, include_list, exclude_list, include_rasters, tempo,
+#                           gdb_nickname, and options. include_list, exclude_list, and options can
+#                           be lists instead of comma-separated strings.
+#            email_server, email_port, email_from, to_list
+#                           Email settings for the batch's report.
+#            concurrency    Optional. Number of sources worked at the same time, each in its own
+#                           worker process. Default is 1 (sources are worked one after another in
+#                           this script's own process).
+#            Any other source setting (for example, snapshot_folder or options) can also be set at
+#            the top level as a default for all sources. A source's options are added to top-level
+#            options (a source's option wins if both set the same option).
+#
+#         For example (JSON):
+#            {"email_server": "BigCityEmailServer", "email_port": "999", "email_from": "name@domain",
+#             "to_list": ["name1@domain1", "name2@domain2"], "snapshot_folder": "D:\\snapshots",
+#             "options": ["workers=2"], "concurrency": 2,
+#             "sources": [
+#                {"source_gdb": "D:\\connections\\parcels.sde", "gdb_nickname": "GDB_BigCity_ParcelData",
+#                 "include_list": ["fds:Cadastral"], "include_rasters": false, "tempo": 7},
+#                {"source_gdb": "D:\\data\\utilities.gdb", "gdb_nickname": "GDB_BigCity_Utilities",
+#                 "exclude_list": ["Hydrants"], "include_rasters": true, "tempo": 30,
+#                 "options": ["incremental=True"]}]}
+#
+#      --daemon <config_file>
+#         Runs this script as a daemon (see README NOTES) that takes snapshots of the sources in a
+#         configuration file (same as a batch's; see --batch) as they come due, until it's interrupted
+#         (Ctrl+C). Each source's report is emailed (w/ its email settings) when its snapshot is done.
+#         The configuration file is read once, at start. Besides a batch's settings, it can have:
+#            concurrency    Number of snapshots taken at the same time (worker processes). Default is 1.
+#            priority       A source's priority (integer). When more sources are due than can be worked,
+#                           those w/ higher priority are started first. Default is 0.
+#            start_time     Time of day (HH:MM) at which a source's snapshot comes due on its due date.
+#                           Default is 00:00.
+#            check_minutes  Minutes between checks of when each source is due (in case snapshot folders
+#                           are changed by hand). A source whose snapshot failed is retried after this
+#                           many minutes. Default is 60.
+#            status_file    Path of the daemon's status file (JSON). Default is <config_file name>_status.json
+#                           next to the configuration file.
+#            status_port    Port on which the daemon's status is served (JSON, at http://127.0.0.1:<port>/).
+#                           Default is 0 (no HTTP endpoint).
+#            priority and start_time can be set for each source or at the top level.
 
 #HISTORY
 #   DATE         ORGANIZATION     PROGRAMMER          NOTES
@@ -46,229 +328,653 @@
 #      -boolean to indicate if raster datasets are to be included
 #      -tempo in which snapshots are taken (in days)
 #
-#   Get today's date. Get date of last snapshot (based on names of snapshots in snapshot folder).
+#   Lock snapshot folder (waiting while another run has it locked)
+#   Get today's date. Get date of last snapshot (based on names of snapshots in snapshot folder, or
+#      on snapshot catalog if used). Snapshots that have a journal (incomplete), and snapshots of other source
+#      geodatabases (w/ other nicknames) in the same snapshot folder, aren't counted.
+#   If an incomplete snapshot exists, resume it (it's time for a snapshot, w/ the incomplete snapshot's date).
 #   If it is time for a snapshot:
-#      Create a snapshot geodatabase w/ name that includes today's date (YYYYMMDD). Naming pattern:
+#      Import arcpy and verify that source geodatabase exists
+#      Start a journal, then create a snapshot geodatabase w/ name that includes today's date (YYYYMMDD), unless resuming
+#         (if resuming, recreate the snapshot geodatabase if it's missing or partial). Naming pattern:
 #         SNAPSHOT_<geodatabase nickname>_YYYYMMDD.gdb
+#      Compile include list and exclude list into a filter (names, wildcard patterns, and regular expressions)
 #      For each feature dataset of source geodatabase:
-#         If (include list has items and it is in include list and it isn't in exclude list) or (include list doesn't have items and it isn't in exclude list):
+#         If filter includes it ((include list has items and it matches include list and it doesn't match exclude list) or (include list doesn't have items and it doesn't match exclude list)):
 #            Create a feature dataset w/ same name in snapshot geodatabase
 #            For each feature class in that feature dataset:
-#               If (include list has items and it is in include list and it isn't in exclude list) or (include list doesn't have items and it isn't in exclude list):
-#                  Copy it to snapshot geodatabase (within a same-name feature-dataet)
+#               If it doesn't match exclude list:
+#                  Plan to copy it to snapshot geodatabase (within a same-name feature-dataet)
 #      For each stand-alone feature-class:
-#         If (include list has items and it is in include list and it isn't in exclude list) or (include list doesn't have items and it isn't in exclude list):
-#            Copy it to snapshot geodatabase
+#         If filter includes it:
+#            Plan to copy it to snapshot geodatabase
 #      For each non-spatial table:
-#         If (include list has items and it is in include list and it isn't in exclude list) or (include list doesn't have items and it isn't in exclude list):
-#            Copy it to snapshot geodatabase
+#         If filter includes it:
+#            Plan to copy it to snapshot geodatabase
 #      If raster datasets are included in process:
 #         For each raster dataset:
-#            If (include list has items and it is in include list and it isn't in exclude list) or (include list doesn't have items and it isn't in exclude list):
-#               Copy it to snapshot geodatabase
+#            If filter includes it:
+#               Plan to copy it to snapshot geodatabase
+#      If resuming, keep planned data objects that the journal lists as copied (if they check out); delete partial copies
+#      Copy remaining planned data objects to snapshot geodatabase (one after another, or in a pool of worker processes),
+#         recording each in the journal once it's copied
+#         If throttle, start copies only up to the throttle's limit, which is adjusted to latency of source geodatabase
+#            (within throttle_min, workers, and time-of-day windows), and while rows per second are under throttle_rows
+#         If incremental and data object's fingerprint is unchanged since previous snapshot:
+#            Copy it from previous snapshot geodatabase instead of from source geodatabase (a base or delta, w/ its delta
+#            info, if delta's base is still in use)
+#         If raster dataset is larger than raster_tile_size:
+#            Clip tiles from source geodatabase in parallel, then mosaic them into snapshot geodatabase
+#      If verify, verify copied data objects against source geodatabase (in a pool of worker processes, within time budget)
+#         Copy data objects that fail verification again from source geodatabase and verify them again
+#         If delta and data object has editor tracking or archiving:
+#            If it has a base (a full copy, less than delta_base_days old, w/ same schema), copy only rows changed since
+#               base and record keys of rows deleted since base; otherwise, copy it in full as a new base
 #
-#   Send email report on script activity. Report includes:
+#   Queue email report on script activity (sent by a background worker, w/ retries; unsent email is spooled to disk
+#      for the next run; reports may be held and merged into a digest). Report includes:
 #      -include list
 #      -exclude list
 #      -snapshot tempo
 #      -date of last snapshot-geodatabase, if exists
 #      -if a new snapshot-geodatabase was made, name of new snapshot-geodatabase
 #      -list of data objects that were copied or exported
-#      -list of all snapshot-geodatabases (and their approximate sizes) in snapshot-geodatabase folder
+#      -if incremental, lists of data objects reused from previous snapshot and copied from source
+#      -list of all snapshot-geodatabases (and their sizes, in bytes and files) in snapshot-geodatabase folder
+#      -sizes of data objects in newest snapshot-geodatabase
+#
+#   If snapshot catalog is used, record snapshot and its data objects in snapshot catalog.
+#   Delete journal (snapshot is complete).
+#
+#   If retention options are set, keep snapshots per retention rules (newest of each of the newest N days, weeks, months,
+#      and years), then delete oldest kept snapshots until under retain_max_gb (always keeping newest snapshot and bases of
+#      deltas in kept snapshots); delete the others w/ their delta folders, fingerprints, reports, journals, and tile
+#      folders (in parallel), unless retain_dry_run, and report space reclaimed
+#   If archive_days, move snapshots at least archive_days old (except newest, and bases of deltas in snapshots not
+#      archived) into snapshot archive: split their files into chunks, store each new chunk compressed under its hash
+#      (in parallel), save a manifest, and delete snapshot
+#   Report sizes of archived snapshots (logical) and of snapshot archive (physical)
+#
+#   In batch mode (--batch command), do all of the above for each source geodatabase in the batch's
+#   configuration file, then send one email report for all of them.
+#
+#   In daemon mode (--daemon command), for each source geodatabase in the configuration file, find when its next snapshot
+#      is due (from tempo and date of last snapshot); queue due sources by priority; take snapshots of queued sources in a
+#      pool of worker processes that keep arcpy imported (up to concurrency, never two w/ the same snapshot folder),
+#      emailing each one's report; write status (queued, running, and completed jobs) to status file and HTTP endpoint;
+#      repeat until interrupted
 
 #IMPORT MODULES
 print("IMPORTING MODULES...")
-import time, datetime, calendar, sys, os, os.path, smtplib, arcpy
+import time, datetime, calendar, sys, os, os.path, smtplib, concurrent.futures, hashlib, json, sqlite3, struct
+import logging, logging.handlers, gzip, shutil, re, fnmatch, threading, queue, glob, math, zlib, heapq, signal
+
+#arcpy IS IMPORTED BY import_arcpy(), ONLY WHEN NEEDED
+arcpy = None
 
-print("SETTING MAJOR VARIABLES BY READING ARGUMENTS...")
 #***** GET ARGUMENTS *****
 #
 #      PASS ARGUMENTS TO SCRIPT IN SAME ORDER AS PRESENTED HERE, WHICH IS:
 #
-#         <source_gdb> <snapshot_folder> <include_list> <exclude_list> <include_rasters> <tempo> <gdb_nickname> <email_server> <email_port> <email_from> <to_list>
-#
-#Set "source_gdb" argument to path of an .sde file or path of .gdb from which snapshot is made.
-#
-#   If setting to an .sde file (connection to enterprise geodatabase), make sure that:
-#      login (read-only) and password are hardwired to the connection (if script will run as
-#      automated-scheduled task).
-#
-#   Otherwise, make sure that the script has read-access to the .gdb.
-source_gdb = arcpy.GetParameterAsText(0)
-#
-#Set "snapshot_folder" argument to full path of folder in which snapshots are made.
-#
-snapshot_folder = arcpy.GetParameterAsText(1)
-#
-#Set "include_list" argument to a string of comma-separated names to indicate names of feature datasets,
-#   feature classes, non-spatial tables, and raster datasets to be explicitly included in the
-#   snapshots unless they are prohibited via the exclude_list argument and/or the include_rasters
-#   argument.
-#
-#   Set to an empty string ("") to pass in an empty include_list. In this case, data objects are
-#   included in the snapshots unless prohibited via the exclude_list argument and/or the include_rasters
-#   argument.
-#
-#   If include_list isn't empty, only its items are considered for inclusion in snapshots. Only
-#   data objects in include_list that aren't prohibited via the exclude_list argument and/or the
-#   include_rasters argument are included in snapshots.
-#
-#   Don't include schema prefixes (DATABASE.OWNER.). The script handles them on its own.
+#         <source_gdb> <snapshot_folder> <include_list> <exclude_list> <include_rasters> <tempo> <gdb_nickname> <email_server> <email_port> <email_from> <to_list> {options}
 #
-#   This argument isn't case-sensitive.
+#      options IS OPTIONAL; LEAVE IT OFF TO KEEP DEFAULT BEHAVIOR.
 #
-#   Format names with this pattern:
-#      {fds:}<name>
-#
-#      If the item is a feature dataset, begin the string w/ "fds:".
-#
-#      Examples:
-#         A feature dataset:
-#            fds:SchoolDistricts
-#
-#         A stand-alone featureclass:
-#            Parks
-#
-#         A non-spatial table:
-#            PINcrosswalk
-#
-#         A raster dataset:
-#            DEM2007
-#
-#         A feature dataset and a stand-alone feature-class:
-#            fds:PoliceDistricts,MileMarkers
-#
-include_list = arcpy.GetParameterAsText(2)
-if include_list == "":
-   include_list = []
-else:
-   include_list = include_list.split(",")
-   i = 0
-   while i < len(include_list):
-      include_list[i] = include_list[i].strip()
-      i += 1
-#
-#Set "exclude_list" argument to a string of comma-separated names to indicate names of feature datasets,
-#   feature classes, non-spatial tables, and raster datasets to be excluded from the snapshot.
-#
-#   Set to empty string ("") to pass in an empty exclude_list.
-#
-#   Don't include schema prefixes (DATABASE.OWNER.). The script handles them on its own.
-#
-#   This argument isn't case-sensitive.
-#
-#   Format names with this pattern:
-#      {fds:}<name>
-#
-#      If the item is a feature dataset, begin the string w/ "fds:".
-#
-#      Examples:
-#         A feature dataset:
-#            fds:VehicularTransportation
-#
-#         A stand-alone featureclass:
-#            CityBoundary
-#
-#         A non-spatial table:
-#            ServiceRequests
-#
-#         A raster dataset:
-#            LandCover2012
-#
-#         A stand-alone feature-class and a raster dataset:
-#            Hydrants,TreeCanopy
-#
-exclude_list = arcpy.GetParameterAsText(3)
-if exclude_list == "":
-   exclude_list = []
-else:
-   exclude_list = exclude_list.split(",")
+#THIS FUNCTION SETS MAJOR VARIABLES (GLOBALS) FROM A GIVEN LIST OF ARGUMENT STRINGS, WHICH ARE
+#   IN THE SAME ORDER AS ARGUMENTS PASSED TO THIS SCRIPT (DESCRIBED BELOW)
+def read_arguments(the_arguments):
+   global source_gdb, snapshot_folder, include_list, exclude_list, include_rasters, tempo, gdb_nickname
+   global email_server, email_port, email_from, to_list, options, workers, incremental, fingerprint_type, use_catalog
+   global size_workers, size_cache, stream_rows, stream_batch, field_subsets, prometheus_folder
+   global delta, delta_base_days, delta_key, discovery_ttl, discovery_describe
+   global raster_samples, raster_tile_size, raster_workers, raster_compression, raster_pyramids
+   global verify, verify_sample, verify_workers, verify_minutes, verify_recopy
+   global throttle, throttle_min, throttle_latency_ms, throttle_rows, throttle_windows
+   global retain_daily, retain_weekly, retain_monthly, retain_yearly, retain_max_gb, retain_dry_run, retain_workers
+   global archive_days, archive_folder, archive_workers, archive_chunk_kb, lock_minutes
+   print("SETTING MAJOR VARIABLES BY READING ARGUMENTS...")
+   #Set "source_gdb" argument to path of an .sde file or path of .gdb from which snapshot is made.
+   #
+   #   If setting to an .sde file (connection to enterprise geodatabase), make sure that:
+   #      login (read-only) and password are hardwired to the connection (if script will run as
+   #      automated-scheduled task).
+   #
+   #   Otherwise, make sure that the script has read-access to the .gdb.
+   source_gdb = the_arguments[0]
+   #
+   #Set "snapshot_folder" argument to full path of folder in which snapshots are made.
+   #
+   snapshot_folder = the_arguments[1]
+   #
+   #Set "include_list" argument to a string of comma-separated names to indicate names of feature datasets,
+   #   feature classes, non-spatial tables, and raster datasets to be explicitly included in the
+   #   snapshots unless they are prohibited via the exclude_list argument and/or the include_rasters
+   #   argument.
+   #
+   #   Set to an empty string ("") to pass in an empty include_list. In this case, data objects are
+   #   included in the snapshots unless prohibited via the exclude_list argument and/or the include_rasters
+   #   argument.
+   #
+   #   If include_list isn't empty, only its items are considered for inclusion in snapshots. Only
+   #   data objects in include_list that aren't prohibited via the exclude_list argument and/or the
+   #   include_rasters argument are included in snapshots.
+   #
+   #   Don't include schema prefixes (DATABASE.OWNER.). The script handles them on its own.
+   #
+   #   This argument isn't case-sensitive.
+   #
+   #   Format names with this pattern:
+   #      {fds:}<name>
+   #
+   #      If the item is a feature dataset, begin the string w/ "fds:".
+   #
+   #      <name> can be a wildcard pattern (* matches any characters, ? matches one character) or,
+   #      if it begins w/ "re:", a regular expression (matched anywhere in the name, unless anchored
+   #      w/ ^ or $; it can't contain commas).
+   #
+   #      Examples:
+   #         A feature dataset:
+   #            fds:SchoolDistricts
+   #
+   #         A stand-alone featureclass:
+   #            Parks
+   #
+   #         A non-spatial table:
+   #            PINcrosswalk
+   #
+   #         A raster dataset:
+   #            DEM2007
+   #
+   #         A feature dataset and a stand-alone feature-class:
+   #            fds:PoliceDistricts,MileMarkers
+   #
+   #         All feature datasets whose names begin w/ Hydro:
+   #            fds:Hydro*
+   #
+   include_list = the_arguments[2]
+   if include_list == "":
+      include_list = []
+   else:
+      include_list = include_list.split(",")
+      i = 0
+      while i < len(include_list):
+         include_list[i] = include_list[i].strip()
+         i += 1
+   #
+   #Set "exclude_list" argument to a string of comma-separated names to indicate names of feature datasets,
+   #   feature classes, non-spatial tables, and raster datasets to be excluded from the snapshot.
+   #
+   #   Set to empty string ("") to pass in an empty exclude_list.
+   #
+   #   Don't include schema prefixes (DATABASE.OWNER.). The script handles them on its own.
+   #
+   #   This argument isn't case-sensitive.
+   #
+   #   Format names with this pattern:
+   #      {fds:}<name>
+   #
+   #      If the item is a feature dataset, begin the string w/ "fds:".
+   #
+   #      <name> can be a wildcard pattern or a regular expression, as in include_list.
+   #
+   #      Feature classes within included feature datasets are also excluded if they match an item
+   #      that doesn't begin w/ "fds:".
+   #
+   #      Examples:
+   #         A feature dataset:
+   #            fds:VehicularTransportation
+   #
+   #         A stand-alone featureclass:
+   #            CityBoundary
+   #
+   #         A non-spatial table:
+   #            ServiceRequests
+   #
+   #         A raster dataset:
+   #            LandCover2012
+   #
+   #         A stand-alone feature-class and a raster dataset:
+   #            Hydrants,TreeCanopy
+   #
+   #         All data objects whose names end w/ _OLD, and all whose names begin w/ TMP_:
+   #            *_OLD,re:^TMP_
+   #
+   exclude_list = the_arguments[3]
+   if exclude_list == "":
+      exclude_list = []
+   else:
+      exclude_list = exclude_list.split(",")
+      i = 0
+      while i < len(exclude_list):
+         exclude_list[i] = exclude_list[i].strip()
+         i += 1
+   #
+   #Set "include_rasters" boolean argument to indicate if raster datasets are copied.
+   #
+   #   Set to True if raster datasets are copied (if include_list has items and raster included in include_list and
+   #   raster isn't in exclude_list) OR (if include_list doesn't have items and raster isn't in exclude_list).
+   #
+   #   Set to False if no raster datasets will be copied whatsoever (raster datasets in
+   #   include_list and exclude_list arguments are ignored when this argument is set to False, as all are excluded).
+   #
+   include_rasters = the_arguments[4]
+   if include_rasters == "True":
+      include_rasters = True
+   else:
+      include_rasters = False
+   #
+   #Set "tempo" argument to an integer that specifies number of days that lapse until time to take
+   #   a new snapshot.
+   #
+   #   For example, if a snapshot is to be taken every 7 days, set to 7.
+   #
+   #   Days are counted as if counting cells on a wall calendar--days aren't measured from the hour
+   #   level. For example, the tempo argument is set to 7 (snapshot every 7 days). The script runs
+   #   at 5:00 AM on January 1. The script then runs at 3:00 AM on January 8. Because January 8 is
+   #   7 days after January 1, the script takes a new snapshot--even though 3:00 AM is 2 hours
+   #   before the exact 7-day mark.
+   #
+   tempo = int(the_arguments[5])
+   #
+   #Set "gdb_nickname" to a string that identifies the source geodatabase/data in snapshot-geodatabase
+   #   counterparts, email, and log file. Snapshot-geodatabase names are based on this string
+   #   (snapshot_ + gdb_nickname + _YYYYMMDD.gdb)
+   #   Don't include any spaces or special characters; underscores are okay.
+   #
+   #   For example:
+   #      GDB_BigCity_ParcelData
+   #
+   gdb_nickname = the_arguments[6]
+   #
+   #email_server
+   #   Set to the host name of the SMTP router to be used for sending automated email.
+   #
+   #   For example:
+   #      BigCityEmailServer
+   #
+   email_server = the_arguments[7]
+   #
+   #email_port
+   #   The port number of the SMTP router to be used for sending email.  Set to a string.
+   #
+   #   For example:
+   #      999
+   #
+   email_port = the_arguments[8]
+   #
+   #email_from
+   #   The sender email address to be used with email notifications (must be in
+   #   name@domain format). An email account that is used for automated notifications in
+   #   your organization can be used.
+   #
+   #   For example:
+   #      name@domain
+   #
+   email_from = the_arguments[9]
+   #
+   #to_list
+   #   This setting is used to store email addresses of email recipients (must be in
+   #   name@domain format). Set to a string of comma-separated email addresses.
+   #
+   #   For example:
+   #      name1@domain1,name2@domain2
+   #
+   to_list = the_arguments[10].split(",")
    i = 0
-   while i < len(exclude_list):
-      exclude_list[i] = exclude_list[i].strip()
+   while i < len(to_list):
+      to_list[i] = to_list[i].strip()
       i += 1
+   #
+   #options
+   #   Optional. Set to a string of comma-separated <option>=<value> pairs to turn on optional behavior.
+   #   Leave off, or set to an empty string (""), to keep default behavior for all options.
+   #
+   #   Option names aren't case-sensitive.
+   #
+   #   Available options:
+   #      workers=<integer>
+   #         Number of worker processes that copy data objects into the snapshot geodatabase. Each
+   #         worker process runs its own arcpy session (and checks out its own license). Default is 1,
+   #         which copies data objects one after another in this script's own process.
+   #
+   #      incremental=<True or False>
+   #         Set to True to copy a feature class, table, or raster dataset from the previous snapshot
+   #         geodatabase, rather than from the source geodatabase, when its fingerprint hasn't changed since
+   #         the previous snapshot. Default is False.
+   #
+   #      fingerprint=<basic or checksum>
+   #         How incremental fingerprints are made. "basic" combines schema, row count, extent, and latest
+   #         editor-tracking edit date. "checksum" adds a checksum of all attributes and geometries, which
+   #         reads every row from the source geodatabase. Default is basic.
+   #
+   #      catalog=<True or False>
+   #         Set to True to keep a snapshot catalog in the snapshot folder (see README NOTES) and to read
+   #         the date of the last snapshot and snapshot-geodatabase sizes from it. Default is False.
+   #
+   #      size_workers=<integer>
+   #         Number of threads that measure snapshot-geodatabase sizes at the same time. Default is 1.
+   #
+   #      size_cache=<True or False>
+   #         Set to False to measure every snapshot geodatabase on every run instead of reusing sizes
+   #         cached in snapshot_sizes.json. Default is True.
+   #
+   #      log_folder=<folder path>
+   #         Folder in which log files are written. Default is this script's folder.
+   #
+   #      log_rotation=<size, daily, weekly, or none>
+   #         When the log file is rotated: when it reaches log_max_mb, at midnight, at midnight
+   #         before each Monday, or never. Default is size.
+   #
+   #      log_max_mb=<number>
+   #         Size (in MB) at which the log file is rotated (if log_rotation is size). Default is 10.
+   #
+   #      log_backups=<integer>
+   #         Number of rotated (compressed) log files that are kept. Default is 5.
+   #
+   #      log_json=<True or False>
+   #         Set to True to also write log lines to snapshot.jsonl as JSON objects. Default is False.
+   #
+   #      stream_rows=<integer>
+   #         Feature classes and tables w/ at least this many rows are streamed (see README NOTES)
+   #         instead of copied w/ the Copy tool. Default is 0 (never streamed).
+   #
+   #      stream_batch=<integer>
+   #         Number of rows read and written per batch when streaming. Default is 50000.
+   #
+   #      prometheus=<folder path>
+   #         Folder in which a Prometheus textfile-collector file (snapshot_<gdb_nickname>.prom) is written
+   #         at the end of each run (see README NOTES). Default is no Prometheus file.
+   #
+   #      discovery_ttl=<minutes>
+   #         The inventory of the source geodatabase's data objects (see README NOTES) is cached in the
+   #         snapshot folder and reused for this many minutes, unless the source geodatabase's change token
+   #         changes. Default is 0 (the inventory is made on every run).
+   #
+   #      discovery_describe=<True or False>
+   #         Set to True to also describe each feature class and table when the inventory is made, and keep
+   #         basic describe properties in it (data type, shape type, editor tracking, archiving, GlobalID).
+   #         This takes one more request per data object, but spares delta snapshots (see "delta" option)
+   #         from describing data objects that have neither editor tracking nor archiving. Default is False.
+   #
+   #      delta=<True or False>
+   #         Set to True to make delta snapshots of feature classes and tables that have editor tracking
+   #         or archiving (see README NOTES). Default is False.
+   #
+   #      delta_base_days=<integer>
+   #         A data object's delta snapshots are based on a full copy (base) that's at most this many days
+   #         older than the snapshot; once its base is older, a new full base is copied. Default is 30.
+   #
+   #      delta_key=<field name>
+   #         Field that identifies rows in delta snapshots, for data objects that have it. Default is the
+   #         GlobalID field, or ObjectID if there's no GlobalID field.
+   #
+   #      raster_samples=<integer>
+   #         Number of windows (of up to 64 x 64 pixels) whose pixels are read into a raster dataset's
+   #         incremental fingerprint, in addition to its properties (see README NOTES). Default is 16.
+   #
+   #      raster_tile_size=<integer>
+   #         Raster datasets that are wider or taller than this many pixels are copied in tiles of this many
+   #         pixels square (see README NOTES). Default is 0 (raster datasets are copied whole).
+   #
+   #      raster_workers=<integer>
+   #         Number of worker processes that copy tiles of one raster dataset at the same time. Default is 1.
+   #
+   #      raster_compression=<compression>
+   #         Compression of raster datasets in the snapshot geodatabase, as the arcpy compression environment
+   #         setting (for example, LZ77, "JPEG 75", or "LERC 0.01"). Default is no setting (raster datasets
+   #         are copied w/ the source's compression).
+   #
+   #      raster_pyramids=<copy, defer, or none>
+   #         When pyramids and statistics of copied raster datasets are built: while each is copied, after
+   #         all data objects are copied, or never. Raster datasets copied from the previous snapshot
+   #         geodatabase keep theirs. Default is copy.
+   #
+   #      throttle=<True or False>
+   #         Set to True to throttle copying to the load on the source geodatabase (see README NOTES): the
+   #         number of copies at the same time is adjusted (between throttle_min and workers) to the latency
+   #         of the source geodatabase. Default is False.
+   #
+   #      throttle_min=<integer>
+   #         Fewest copies at the same time when throttling. Copying starts w/ this many. Default is 1.
+   #
+   #      throttle_latency_ms=<number>
+   #         Target latency (in milliseconds) of one request to the source geodatabase. When the average
+   #         latency of recent copies is above it, copies at the same time are halved; when it's below half
+   #         of it, they're increased by one. Default is 250.
+   #
+   #      throttle_rows=<number>
+   #         Most rows per second copied from the source geodatabase (averaged over the copy stage); new
+   #         copies wait while copying is ahead of it. Default is 0 (no limit).
+   #
+   #      throttle_windows=<HH:MM>-<HH:MM>=<integer>;...
+   #         Time-of-day windows, each w/ the most copies at the same time during it (0 pauses copying:
+   #         no new copies are started until the window ends). A window can span midnight. Outside of all
+   #         windows, the most is workers.
+   #         For example:
+   #            throttle_windows=07:00-18:00=1;22:00-05:00=8
+   #
+   #      verify=<none, basic, sample, or full>
+   #         How copied data objects are verified against the source geodatabase once they're all copied
+   #         (see README NOTES). "basic" checks schema, row count, and extent (or, for raster datasets,
+   #         properties). "sample" adds a checksum of the first and last rows (or sampled pixels of raster
+   #         datasets). "full" adds a checksum of all rows. Default is none (copies aren't verified).
+   #
+   #      verify_sample=<integer>
+   #         Number of rows in the checksum of verify=sample (half from the first rows, half from the last
+   #         rows, in ObjectID order). Default is 1000.
+   #
+   #      verify_workers=<integer>
+   #         Number of worker processes that verify data objects at the same time. Default is the number
+   #         of workers (see "workers" option).
+   #
+   #      verify_minutes=<number>
+   #         Time budget (in minutes) for verification. Data objects that aren't verified when it runs out
+   #         are reported as not verified. Default is 0 (no time budget).
+   #
+   #      verify_recopy=<True or False>
+   #         Set to False to leave data objects that fail verification as they are (they're still reported
+   #         and flagged for recopy) instead of copying them again from the source geodatabase right away.
+   #         Default is True.
+   #
+   #      retain_daily=<integer>
+   #         Keep the newest snapshot of each of this many days (the newest days that have snapshots of the
+   #         source geodatabase); see README NOTES. Default is 0 (no daily rule). Snapshots aren't deleted
+   #         unless a retain_ option is set.
+   #
+   #      retain_weekly=<integer>
+   #         Keep the newest snapshot of each of this many weeks (Monday through Sunday) that have snapshots.
+   #         Default is 0 (no weekly rule).
+   #
+   #      retain_monthly=<integer>
+   #         Keep the newest snapshot of each of this many months that have snapshots. Default is 0 (no
+   #         monthly rule).
+   #
+   #      retain_yearly=<integer>
+   #         Keep the newest snapshot of each of this many years that have snapshots. Default is 0 (no
+   #         yearly rule).
+   #
+   #      retain_max_gb=<number>
+   #         Most total size (in GiB) of the source geodatabase's snapshot geodatabases. Snapshots kept by the
+   #         rules above are deleted, oldest first, until they fit (the newest snapshot, and bases of deltas
+   #         in kept snapshots, are always kept). Default is 0 (no size cap).
+   #
+   #      retain_dry_run=<True or False>
+   #         Set to True to report which snapshots retention would delete (and the space that would be
+   #         reclaimed) w/o deleting them. Default is False.
+   #
+   #      retain_workers=<integer>
+   #         Number of threads that delete snapshots at the same time. Default is 1.
+   #
+   #      archive_days=<integer>
+   #         Snapshots at least this many days old are moved into the snapshot archive (see README NOTES).
+   #         Default is 0 (snapshots aren't archived).
+   #
+   #      archive_folder=<folder path>
+   #         Folder of the snapshot archive. Default is the snapshot_archive folder in the snapshot folder.
+   #
+   #      archive_workers=<integer>
+   #         Number of threads that chunk and compress files into the snapshot archive at the same time.
+   #         Default is 1.
+   #
+   #      archive_chunk_kb=<integer>
+   #         Size (in KB) of the chunks that files are split into in the snapshot archive. Smaller chunks find
+   #         more duplicate data but make more chunk files. Default is 1024.
+   #
+   #      lock_minutes=<number>
+   #         Minutes that a run waits for the snapshot folder while another run has it locked (see README NOTES)
+   #         before it gives up. Default is 60.
+   #
+   #      mail_timeout=<seconds>
+   #         Seconds to wait for the email server (to connect, and for each reply). Default is 30.
+   #
+   #      mail_retries=<integer>
+   #         Number of times sending an email is retried (after the first try) before it's left in the
+   #         mail spool (see README NOTES). Default is 3.
+   #
+   #      mail_backoff=<seconds>
+   #         Seconds to wait before the first retry; the wait doubles for each retry after that. Default is 5.
+   #
+   #      mail_wait=<seconds>
+   #         Seconds that the end of the script waits for email to be sent; email that isn't sent by then
+   #         stays in the mail spool. Default is 120.
+   #
+   #      mail_spool=<folder path>
+   #         Folder in which email is spooled. Default is the mail_spool folder in the log folder.
+   #
+   #      mail_digest_minutes=<number>
+   #         Email reports are held and merged into one digest email, which is sent by the first run that
+   #         finds the oldest held report at least this many minutes old (see README NOTES). Default is 0
+   #         (each report is sent right away).
+   #
+   #      fields:<data object name>=<field>;<field>;...
+   #         Copies only the given fields of a feature class or table (by streaming it). ObjectID and
+   #         geometry are always copied. Name a feature class within a feature dataset as
+   #         <feature dataset>\<name>. Can be set for more than one data object.
+   #         For example:
+   #            fields:Parcels=PIN;OWNER_NAME
+   #
+   #   For example:
+   #      workers=4,incremental=True,catalog=True
+   #
+   options = read_options(the_arguments[11])
+   workers = int(options.get("workers", "1"))
+   incremental = options.get("incremental", "False").lower() == "true"
+   fingerprint_type = options.get("fingerprint", "basic").lower()
+   use_catalog = options.get("catalog", "False").lower() == "true"
+   size_workers = int(options.get("size_workers", "1"))
+   size_cache = options.get("size_cache", "True").lower() == "true"
+   stream_rows = int(options.get("stream_rows", "0"))
+   stream_batch = int(options.get("stream_batch", "50000"))
+   prometheus_folder = options.get("prometheus", "")
+   delta = options.get("delta", "False").lower() == "true"
+   delta_base_days = int(options.get("delta_base_days", "30"))
+   delta_key = options.get("delta_key", "")
+   discovery_ttl = float(options.get("discovery_ttl", "0"))
+   discovery_describe = options.get("discovery_describe", "False").lower() == "true"
+   raster_samples = int(options.get("raster_samples", "16"))
+   raster_tile_size = int(options.get("raster_tile_size", "0"))
+   raster_workers = int(options.get("raster_workers", "1"))
+   raster_compression = options.get("raster_compression", "")
+   raster_pyramids = options.get("raster_pyramids", "copy").lower()
+   verify = options.get("verify", "none").lower()
+   verify_sample = int(options.get("verify_sample", "1000"))
+   verify_workers = int(options.get("verify_workers", str(workers)))
+   verify_minutes = float(options.get("verify_minutes", "0"))
+   verify_recopy = options.get("verify_recopy", "True").lower() == "true"
+   throttle = options.get("throttle", "False").lower() == "true"
+   throttle_min = max(1, int(options.get("throttle_min", "1")))
+   throttle_latency_ms = float(options.get("throttle_latency_ms", "250"))
+   throttle_rows = float(options.get("throttle_rows", "0"))
+   throttle_windows = read_throttle_windows(options.get("throttle_windows", ""))
+   retain_daily = int(options.get("retain_daily", "0"))
+   retain_weekly = int(options.get("retain_weekly", "0"))
+   retain_monthly = int(options.get("retain_monthly", "0"))
+   retain_yearly = int(options.get("retain_yearly", "0"))
+   retain_max_gb = float(options.get("retain_max_gb", "0"))
+   retain_dry_run = options.get("retain_dry_run", "False").lower() == "true"
+   retain_workers = int(options.get("retain_workers", "1"))
+   archive_days = int(options.get("archive_days", "0"))
+   archive_folder = options.get("archive_folder", os.path.join(snapshot_folder, "snapshot_archive"))
+   archive_workers = int(options.get("archive_workers", "1"))
+   archive_chunk_kb = int(options.get("archive_chunk_kb", "1024"))
+   lock_minutes = float(options.get("lock_minutes", "60"))
+   field_subsets = {}
+   for i in options:
+      if i[0:7] == "fields:":
+         field_subsets[i[7:len(i)].upper()] = []
+         for j in options[i].split(";"):
+            if j.strip() != "":
+               field_subsets[i[7:len(i)].upper()].append(j.strip())
+   start_log(options)
+   start_email(options)
+
+#THIS FUNCTION RETURNS A DICTIONARY OF OPTIONS (W/ LOWER-CASE NAMES) FROM A GIVEN STRING OF COMMA-SEPARATED
+#   <option>=<value> PAIRS (SEE options ARGUMENT ABOVE)
+def read_options(the_string):
+   the_output = {}
+   for i in the_string.split(","):
+      if i.strip() != "":
+         the_output[i[0:i.find("=")].strip().lower()] = i[i.find("=") + 1:len(i)].strip()
+   return the_output
+#***** END OF SECTION FOR GETTING ARGUMENTS *****
+
+#***** OTHER VARIABLES
+#email_content
+#   A GLOBAL VARIABLE THAT STORES CONTENT TO BE WRITTEN TO AUTOMATED EMAIL.
+email_content = ""
 #
-#Set "include_rasters" boolean argument to indicate if raster datasets are copied.
-#
-#   Set to True if raster datasets are copied (if include_list has items and raster included in include_list and
-#   raster isn't in exclude_list) OR (if include_list doesn't have items and raster isn't in exclude_list).
-#
-#   Set to False if no raster datasets will be copied whatsoever (raster datasets in
-#   include_list and exclude_list arguments are ignored when this argument is set to False, as all are excluded).
-#
-include_rasters = arcpy.GetParameterAsText(4)
-if include_rasters == "True":
-   include_rasters = True
-else:
-   include_rasters = False
-#
-#Set "tempo" argument to an integer that specifies number of days that lapse until time to take
-#   a new snapshot.
-#
-#   For example, if a snapshot is to be taken every 7 days, set to 7.
-#
-#   Days are counted as if counting cells on a wall calendar--days aren't measured from the hour
-#   level. For example, the tempo argument is set to 7 (snapshot every 7 days). The script runs
-#   at 5:00 AM on January 1. The script then runs at 3:00 AM on January 8. Because January 8 is
-#   7 days after January 1, the script takes a new snapshot--even though 3:00 AM is 2 hours
-#   before the exact 7-day mark.
-#
-tempo = int(arcpy.GetParameterAsText(5))
-#
-#Set "gdb_nickname" to a string that identifies the source geodatabase/data in snapshot-geodatabase
-#   counterparts, email, and log file. Snapshot-geodatabase names are based on this string
-#   (snapshot_ + gdb_nickname + _YYYYMMDD.gdb)
-#   Don't include any spaces or special characters; underscores are okay.
-#
-#   For example:
-#      GDB_BigCity_ParcelData
-#
-gdb_nickname = arcpy.GetParameterAsText(6)
+#snapshot_id
+#   A GLOBAL VARIABLE THAT STORES NAME (W/O .gdb) OF SNAPSHOT BEING WORKED, FOR JSON LOG LINES.
+snapshot_id = None
 #
-#email_server
-#   Set to the host name of the SMTP router to be used for sending automated email.
+#log_started
+#   A GLOBAL VARIABLE THAT INDICATES IF LOG FILES HAVE BEEN SET UP (SEE start_log()).
+log_started = False
 #
-#   For example:
-#      BigCityEmailServer
+#object_filter
+#   A GLOBAL VARIABLE THAT STORES include_list AND exclude_list, COMPILED BY compile_filter().
+object_filter = None
 #
-email_server = arcpy.GetParameterAsText(7)
+#run_metrics
+#   A GLOBAL VARIABLE THAT STORES METRICS OF THE RUN (SEE record_phase() AND write_run_report()).
+run_metrics = None
 #
-#email_port
-#   The port number of the SMTP router to be used for sending email.  Set to a string.
+#date_style
+#   A GLOBAL VARIABLE THAT STORES HOW THE SOURCE GEODATABASE WRITES DATES IN SQL (SEE get_date_style()).
+date_style = "file"
 #
-#   For example:
-#      999
+#folder_lock
+#   A GLOBAL VARIABLE THAT STORES THE OPEN LOCK FILE OF THE SNAPSHOT FOLDER WHILE A SNAPSHOT IS TAKEN (SEE lock_folder()).
+folder_lock = None
 #
-email_port = arcpy.GetParameterAsText(8)
+#daemon_status
+#   A GLOBAL VARIABLE THAT STORES THE DAEMON'S LATEST STATUS, AS JSON TEXT, FOR ITS HTTP ENDPOINT (SEE run_daemon()).
+daemon_status = "{}"
 #
-#email_from
-#   The sender email address to be used with email notifications (must be in
-#   name@domain format). An email account that is used for automated notifications in
-#   your organization can be used.
+#mail_settings
+#   A GLOBAL VARIABLE THAT STORES EMAIL-DELIVERY SETTINGS (SEE start_email()).
+mail_settings = None
 #
-#   For example:
-#      name@domain
+#mail_queue
+#   A GLOBAL VARIABLE THAT STORES EMAIL MESSAGES WAITING TO BE SENT BY THE MAIL WORKER (SEE send_email()).
+mail_queue = None
 #
-email_from = arcpy.GetParameterAsText(9)
+#mail_thread
+#   A GLOBAL VARIABLE THAT STORES THE MAIL WORKER, A BACKGROUND THREAD (SEE mail_worker()).
+mail_thread = None
 #
-#to_list
-#   This setting is used to store email addresses of email recipients (must be in
-#   name@domain format). Set to a string of comma-separated email addresses.
+#email_servers
+#   A GLOBAL VARIABLE THAT STORES THE EMAIL SERVERS OF ALL SOURCES OF A BATCH OR DAEMON, AS (<email_server>, <email_port>)
+#   TUPLES (SEE send_email()).
+email_servers = []
 #
-#   For example:
-#      name1@domain1,name2@domain2
+#throttle_state
+#   A GLOBAL VARIABLE THAT STORES THE STATE OF LOAD THROTTLING WHILE DATA OBJECTS ARE COPIED (SEE start_throttle()).
+throttle_state = None
 #
-to_list = arcpy.GetParameterAsText(10).split(",")
-i = 0
-while i < len(to_list):
-   to_list[i] = to_list[i].strip()
-   i += 1
-#***** END OF SECTION FOR GETTING ARGUMENTS *****
-
-#***** OTHER VARIABLES
-#email_content
-#   A GLOBAL VARIABLE THAT STORES CONTENT TO BE WRITTEN TO AUTOMATED EMAIL.
-email_content = ""
+#raster_pixel_types
+#   A GLOBAL VARIABLE THAT STORES PIXEL TYPES OF THE Create Raster Dataset TOOL, KEYED BY Describe's pixelType.
+raster_pixel_types = {"U1": "1_BIT", "U2": "2_BIT", "U4": "4_BIT", "U8": "8_BIT_UNSIGNED", "S8": "8_BIT_SIGNED", "U16": "16_BIT_UNSIGNED", "S16": "16_BIT_SIGNED", "U32": "32_BIT_UNSIGNED", "S32": "32_BIT_SIGNED", "F32": "32_BIT_FLOAT", "F64": "64_BIT"}
 
 #FUNCTIONS
 
@@ -307,18 +1013,145 @@ def tell_the_time():
 #   STRING SHOULD ALSO BE INCLUDED IN EMAIL NOTIFICATION.
 #   ADDS CURRENT TIME TO BEGINNING OF FIRST PARAMETER.
 #   ADDS A \n TO FIRST PARAMETER (FOR HARD RETURNS).
-def make_note(the_note, print_it = False, email_it = False):
-   the_note = tell_the_time() + "  " + the_note
+#   OPTIONALLY, SET FOURTH ARGUMENT TO A DICTIONARY OF EXTRA FIELDS (OBJECT NAME, SECONDS, BYTES, ETC.) FOR JSON LOG LINES
+def make_note(the_note, print_it = False, email_it = False, the_fields = None):
+   if log_started == False:
+      start_log()
+   the_time = tell_the_time()
+   logging.getLogger("snapshot.log").info(the_time + "  " + the_note)
+   if len(logging.getLogger("snapshot.jsonl").handlers) > 0:
+      the_record = {"time": datetime.datetime.now().isoformat(timespec = "seconds"), "snapshot": snapshot_id, "message": the_note.strip()}
+      if the_fields:
+         the_record.update(the_fields)
+      logging.getLogger("snapshot.jsonl").info(json.dumps(the_record))
+   the_note = the_time + "  " + the_note
    the_note += "\n"
-   log_file = open(sys.path[0] + "\\snapshot.log", "a")
-   log_file.write(the_note)
-   log_file.close()
    if print_it == True:
       print(the_note)
    if email_it == True:
       global email_content
       email_content += the_note
 
+#THIS FUNCTION STARTS (OR RESTARTS) LOGGING TO snapshot.log AND, OPTIONALLY, snapshot.jsonl
+#   LOG LINES ARE BUFFERED IN MEMORY AND WRITTEN 100 AT A TIME, BY flush_log(), AND WHEN THE SCRIPT ENDS.
+#   ROTATED LOG FILES ARE COMPRESSED W/ gzip (snapshot.log.1.gz, snapshot.log.2.gz, AND SO ON; 1 IS NEWEST).
+#   ITS ARGUMENT IS A DICTIONARY OF OPTIONS (SEE read_options()); LOG OPTIONS THAT AREN'T IN IT ARE DEFAULTS
+def start_log(the_options = {}):
+   global log_started
+   stop_log()
+   the_folder = the_options.get("log_folder", os.path.dirname(os.path.abspath(__file__)))
+   the_rotation = the_options.get("log_rotation", "size").lower()
+   the_max_mb = float(the_options.get("log_max_mb", "10"))
+   the_backups = int(the_options.get("log_backups", "5"))
+   with_json = the_options.get("log_json", "False").lower() == "true"
+   for i in ("snapshot.log", "snapshot.jsonl"):
+      the_logger = logging.getLogger(i)
+      the_logger.propagate = False
+      the_logger.setLevel(logging.INFO)
+      if i == "snapshot.jsonl" and with_json == False:
+         continue
+      the_path = os.path.join(the_folder, i)
+      if the_rotation == "size":
+         the_handler = logging.handlers.RotatingFileHandler(the_path, maxBytes = int(the_max_mb * 1048576), backupCount = the_backups, encoding = "utf-8", delay = True)
+      elif the_rotation == "daily":
+         the_handler = logging.handlers.TimedRotatingFileHandler(the_path, when = "midnight", backupCount = the_backups, encoding = "utf-8", delay = True)
+      elif the_rotation == "weekly":
+         the_handler = logging.handlers.TimedRotatingFileHandler(the_path, when = "W0", backupCount = the_backups, encoding = "utf-8", delay = True)
+      else:
+         the_handler = logging.FileHandler(the_path, encoding = "utf-8", delay = True)
+      the_handler.namer = get_rotated_name
+      the_handler.rotator = compress_log
+      the_handler.setFormatter(logging.Formatter("%(message)s"))
+      the_logger.addHandler(logging.handlers.MemoryHandler(100, logging.CRITICAL, the_handler))
+   log_started = True
+
+#THIS FUNCTION WRITES BUFFERED LOG LINES TO LOG FILES
+#   CALL IT BEFORE STARTING WORKER PROCESSES (SO BUFFERED LINES AREN'T COPIED INTO THEM) AND BEFORE A
+#   WORKER PROCESS RETURNS (WORKER PROCESSES DON'T WRITE THEIR BUFFERS WHEN THEY END)
+def flush_log():
+   for i in ("snapshot.log", "snapshot.jsonl"):
+      for j in logging.getLogger(i).handlers:
+         j.flush()
+
+#THIS FUNCTION WRITES BUFFERED LOG LINES TO LOG FILES AND CLOSES THE LOG FILES
+def stop_log():
+   for i in ("snapshot.log", "snapshot.jsonl"):
+      the_logger = logging.getLogger(i)
+      for j in list(the_logger.handlers):
+         j.flush()
+         j.target.close()
+         j.close()
+         the_logger.removeHandler(j)
+
+#THIS FUNCTION RETURNS THE NAME OF A ROTATED LOG FILE (SEE start_log())
+def get_rotated_name(the_name):
+   return the_name + ".gz"
+
+#THIS FUNCTION COMPRESSES A ROTATED LOG FILE W/ gzip (SEE start_log())
+#   SET FIRST ARGUMENT TO PATH OF THE LOG FILE. SET SECOND ARGUMENT TO PATH OF THE COMPRESSED FILE.
+def compress_log(the_source, the_target):
+   with open(the_source, "rb") as the_input:
+      with gzip.open(the_target, "wb") as the_output:
+         shutil.copyfileobj(the_input, the_output)
+   os.remove(the_source)
+
+#THIS FUNCTION COMPILES INCLUDE-LIST AND EXCLUDE-LIST ITEMS INTO A FILTER (DICTIONARY) FOR should_include()
+#   PLAIN NAMES ARE KEPT IN DICTIONARIES KEYED BY UPPER-CASED NAME; WILDCARD PATTERNS AND REGULAR EXPRESSIONS
+#   ARE COMPILED. EACH IS STORED W/ ITS ITEM (RULE), SO THE RULE THAT MATCHED CAN BE REPORTED.
+#   SET FIRST ARGUMENT TO include_list. SET SECOND ARGUMENT TO exclude_list.
+def compile_filter(the_include_list, the_exclude_list):
+   the_filter = {"use_include": len(the_include_list) > 0}
+   for the_list_name, the_list in (("include", the_include_list), ("exclude", the_exclude_list)):
+      for the_kind in ("fds", "other"):
+         the_filter[the_list_name + "_" + the_kind] = ({}, [])
+      for i in the_list:
+         if i[0:4].upper() == "FDS:":
+            the_names, the_patterns = the_filter[the_list_name + "_fds"]
+            j = i[4:len(i)].strip()
+         else:
+            the_names, the_patterns = the_filter[the_list_name + "_other"]
+            j = i
+         #(PATTERNS ARE STORED AS MATCHING FUNCTIONS: A REGULAR EXPRESSION IS SEARCHED FOR; A WILDCARD PATTERN MUST MATCH WHOLE NAME)
+         if j[0:3].lower() == "re:":
+            the_patterns.append((re.compile(j[3:len(j)], re.IGNORECASE).search, i))
+         elif "*" in j or "?" in j or "[" in j:
+            the_patterns.append((re.compile(fnmatch.translate(j), re.IGNORECASE).match, i))
+         elif j != "":
+            the_names[j.upper()] = i
+   return the_filter
+
+#THIS FUNCTION RETURNS THE INCLUDE-LIST OR EXCLUDE-LIST ITEM (RULE) THAT A GIVEN NAME MATCHES, OR None
+#   SET FIRST ARGUMENT TO A (<names dictionary>, <patterns list>) TUPLE OF A FILTER (SEE compile_filter()).
+#   SET SECOND ARGUMENT TO THE DATA-OBJECT NAME (W/O SCHEMA PREFIX).
+def match_rule(the_rules, the_name):
+   the_rule = the_rules[0].get(the_name.upper())
+   if the_rule != None:
+      return the_rule
+   for i in the_rules[1]:
+      if i[0](the_name):
+         return i[1]
+   return None
+
+#THIS FUNCTION DECIDES IF A DATA OBJECT IS INCLUDED IN THE SNAPSHOT, PER object_filter (SEE compile_filter()),
+#   AND RETURNS A TUPLE OF (<True or False>, <reason>). THE REASON NAMES THE RULE THAT MATCHED, IF ANY.
+#   SET FIRST ARGUMENT TO "fds", "feature-class", "table", OR "raster". SET SECOND ARGUMENT TO THE DATA-OBJECT
+#   NAME (W/O SCHEMA PREFIX). SET THIRD ARGUMENT (BOOLEAN) TO True FOR A FEATURE CLASS WITHIN A FEATURE DATASET
+#   (ITS FEATURE DATASET WAS ALREADY INCLUDED, SO ONLY THE EXCLUDE LIST APPLIES).
+def should_include(the_kind, the_name, in_fds = False):
+   if the_kind == "fds":
+      the_key = "_fds"
+   else:
+      the_key = "_other"
+   the_rule = match_rule(object_filter["exclude" + the_key], the_name)
+   if the_rule != None:
+      return (False, "excluded by rule " + the_rule)
+   if object_filter["use_include"] == False or in_fds == True:
+      return (True, "no exclude rule matched")
+   the_rule = match_rule(object_filter["include" + the_key], the_name)
+   if the_rule != None:
+      return (True, "included by rule " + the_rule)
+   return (False, "not in include list")
+
 #THIS FUNCTION TAKES A GIVEN DATA-OBJECT NAME AND RETURNS ITS NAME W/O SCHEMA PREFIX
 def get_name(obj_name):
    i = obj_name.rfind(".")
@@ -327,230 +1160,3220 @@ def get_name(obj_name):
    else:
       return obj_name[i + 1:len(obj_name)]
    
+#THIS FUNCTION SETS (OR RESETS) EMAIL-DELIVERY SETTINGS (mail_settings)
+#   ITS ARGUMENT IS A DICTIONARY OF OPTIONS (SEE read_options()); EMAIL OPTIONS THAT AREN'T IN IT ARE DEFAULTS
+def start_email(the_options = {}):
+   global mail_settings
+   the_folder = the_options.get("log_folder", os.path.dirname(os.path.abspath(__file__)))
+   mail_settings = {}
+   mail_settings["timeout"] = float(the_options.get("mail_timeout", "30"))
+   mail_settings["retries"] = int(the_options.get("mail_retries", "3"))
+   mail_settings["backoff"] = float(the_options.get("mail_backoff", "5"))
+   mail_settings["wait"] = float(the_options.get("mail_wait", "120"))
+   mail_settings["spool"] = the_options.get("mail_spool", os.path.join(the_folder, "mail_spool"))
+   mail_settings["digest_minutes"] = float(the_options.get("mail_digest_minutes", "0"))
+
 #THIS FUNCTION SENDS A GIVEN MESSAGE (W/ STRING "SECURE" IN SUBJECT) TO AN EMAIL DISTRIBUTION-LIST
+#   THE MESSAGE IS SAVED TO THE MAIL SPOOL AND QUEUED; THE MAIL WORKER (SEE mail_worker()) SENDS IT IN THE
+#   BACKGROUND, SO THIS FUNCTION DOESN'T WAIT FOR THE EMAIL SERVER. CALL stop_email() BEFORE THE SCRIPT ENDS.
+#   IF THE MAIL WORKER ISN'T RUNNING, IT'S STARTED, AND MESSAGES LEFT IN THE MAIL SPOOL BY EARLIER RUNS ARE
+#   QUEUED FIRST. W/ THE mail_digest_minutes OPTION, THE MESSAGE MAY BE HELD FOR A DIGEST (SEE hold_for_digest()).
 #   THE FIRST ARGUMENT IS THE EMAIL'S SUBJECT STRING
 #   THE SECOND ARGUMENT IS THE EMAIL'S MESSAGE-CONTENT STRING
 def send_email(the_subject = "", the_message = ""):
-   the_header = 'From:  "Python" <' + email_from + '>\n'
+   global mail_queue, mail_thread
+   if mail_settings == None:
+      start_email()
+   the_item = {"subject": the_subject, "message": the_message, "from": email_from, "to": to_list, "server": email_server, "port": email_port, "time": time.time(), "attempts": 0, "parts": []}
+   if mail_settings["digest_minutes"] > 0:
+      the_item = hold_for_digest(the_item)
+      if the_item == None:
+         return
+   if mail_queue == None:
+      mail_queue = queue.Queue()
+   if mail_thread == None or mail_thread.is_alive() == False:
+      #(UNSENT EMAIL GOES TO ITS OWN EMAIL SERVER; IF THAT EMAIL SERVER ISN'T CONFIGURED ANYMORE, TO THE EMAIL SERVER OF THIS RUN)
+      the_servers = email_servers + [(email_server, str(email_port))]
+      for i in read_spool():
+         if (i["server"], str(i["port"])) not in the_servers:
+            make_note("Email server " + i["server"] + ":" + str(i["port"]) + " of unsent email \"" + i["subject"] + "\" isn't configured anymore. It's sent via " + email_server + ":" + str(email_port) + " instead.", True)
+            i["server"] = email_server
+            i["port"] = email_port
+         mail_queue.put(i)
+      mail_thread = threading.Thread(target = mail_worker, name = "snapshot mail worker", daemon = True)
+      mail_thread.start()
+   spool_email(the_item)
+   mail_queue.put(the_item)
+
+#THIS FUNCTION WAITS (UP TO mail_wait SECONDS) FOR THE MAIL WORKER TO SEND QUEUED MESSAGES, THEN STOPS IT
+#   MESSAGES THAT AREN'T SENT BY THEN STAY IN THE MAIL SPOOL, FOR THE NEXT RUN THAT SENDS EMAIL
+def stop_email():
+   global mail_thread
+   if mail_thread == None:
+      return
+   mail_queue.put(None)
+   mail_thread.join(mail_settings["wait"])
+   if mail_thread.is_alive():
+      make_note("Email wasn't sent within " + format(mail_settings["wait"], "g") + " seconds. Unsent email stays in " + mail_settings["spool"] + " for the next run that sends email.", True)
+   mail_thread = None
+   flush_log()
+
+#THIS FUNCTION IS THE MAIL WORKER: IT SENDS QUEUED MESSAGES (SEE send_email()) UNTIL IT GETS None
+#   IT RUNS IN A BACKGROUND THREAD. SMTP CONNECTIONS ARE KEPT OPEN AND REUSED FOR LATER MESSAGES TO THE SAME
+#   EMAIL SERVER. ONCE AN EMAIL SERVER FAILS (AFTER RETRIES), LATER MESSAGES TO IT ARE LEFT IN THE MAIL SPOOL W/O
+#   TRYING AGAIN.
+def mail_worker():
+   the_connections = {}
+   the_down = []
+   while True:
+      the_item = mail_queue.get()
+      if the_item == None:
+         break
+      try:
+         deliver_email(the_item, the_connections, the_down)
+      except Exception as e:
+         make_note("Mail worker couldn't handle email \"" + the_item["subject"] + "\". " + str(e))
+   for i in the_connections:
+      close_smtp(the_connections[i])
+
+#THIS FUNCTION SENDS ONE QUEUED MESSAGE, W/ RETRIES AND BACKOFF, AND RETURNS True IF IT WAS SENT
+#   A SENT MESSAGE IS REMOVED FROM THE MAIL SPOOL (AND SO ARE REPORTS MERGED INTO IT, IF IT'S A DIGEST). A
+#   MESSAGE THAT THE EMAIL SERVER REJECTS PERMANENTLY (5xx) IS REMOVED TOO; OTHERWISE AN UNSENT MESSAGE STAYS IN
+#   THE MAIL SPOOL.
+#   SET FIRST ARGUMENT TO THE MESSAGE (DICTIONARY; SEE send_email()). SET SECOND ARGUMENT TO DICTIONARY OF OPEN
+#   SMTP CONNECTIONS. SET THIRD ARGUMENT TO LIST OF EMAIL SERVERS THAT FAILED.
+def deliver_email(the_item, the_connections, the_down):
+   the_key = (the_item["server"], str(the_item["port"]))
+   the_error = "Email server failed earlier in this run."
+   the_attempt = 0
+   while the_key not in the_down:
+      the_attempt += 1
+      try:
+         the_connection = get_smtp_connection(the_key, the_connections)
+         the_connection.sendmail(the_item["from"], the_item["to"], make_email_text(the_item))
+         make_note("Emailed \"" + the_item["subject"] + "\" via " + the_key[0] + " (attempt " + str(the_attempt) + ").")
+         remove_spooled(the_item)
+         return True
+      except (smtplib.SMTPException, OSError) as e:
+         the_error = str(e)
+         close_smtp(the_connections.pop(the_key, None))
+         if (isinstance(e, smtplib.SMTPResponseException) and e.smtp_code >= 500) or isinstance(e, smtplib.SMTPRecipientsRefused):
+            make_note("Email server " + the_key[0] + " rejected email \"" + the_item["subject"] + "\". " + the_error)
+            remove_spooled(the_item)
+            return False
+      if the_attempt > mail_settings["retries"]:
+         the_down.append(the_key)
+      else:
+         time.sleep(mail_settings["backoff"] * 2 ** (the_attempt - 1))
+   the_item["attempts"] += the_attempt
+   spool_email(the_item)
+   make_note("Couldn't email \"" + the_item["subject"] + "\" via " + the_key[0] + " (" + the_error + "). It stays in " + mail_settings["spool"] + " for the next run that sends email.")
+   return False
+
+#THIS FUNCTION RETURNS AN OPEN SMTP CONNECTION TO A GIVEN EMAIL SERVER, REUSING AN OPEN CONNECTION IF IT STILL
+#   ANSWERS (NOOP)
+#   SET FIRST ARGUMENT TO (<email_server>, <email_port>) TUPLE. SET SECOND ARGUMENT TO DICTIONARY OF OPEN SMTP
+#   CONNECTIONS (A NEW CONNECTION IS ADDED TO IT).
+def get_smtp_connection(the_key, the_connections):
+   the_connection = the_connections.get(the_key)
+   if the_connection != None:
+      try:
+         if the_connection.noop()[0] == 250:
+            return the_connection
+      except (smtplib.SMTPException, OSError):
+         pass
+      close_smtp(the_connections.pop(the_key))
+   the_connection = smtplib.SMTP(the_key[0] + ":" + the_key[1], timeout = mail_settings["timeout"])
+   the_connections[the_key] = the_connection
+   return the_connection
+
+#THIS FUNCTION CLOSES A GIVEN SMTP CONNECTION (OR DOES NOTHING IF IT'S None), IGNORING ERRORS
+def close_smtp(the_connection):
+   if the_connection == None:
+      return
+   try:
+      the_connection.quit()
+   except (smtplib.SMTPException, OSError):
+      the_connection.close()
+
+#THIS FUNCTION RETURNS THE TEXT (HEADER AND CONTENT) OF A GIVEN QUEUED MESSAGE (SEE send_email())
+def make_email_text(the_item):
+   the_header = 'From:  "Python" <' + the_item["from"] + '>\n'
    the_header += "To:  Snapshot Watchers\n"
-   the_header += "Subject:  [SECURE] " + the_subject + "\n"
-   #INSTANTIATE AN SMTP OBJECT
-   smtp_serv = smtplib.SMTP(email_server + ":" + email_port)
-   #SEND THE EMAIL
-   smtp_serv.sendmail(email_from, to_list, the_header + the_message)
-   #QUIT THE SERVER CONNECTION
-   smtp_serv.quit()
-
-#THIS FUNCTION RETURNS AN ESTIMATED SIZE, IN MB (INTEGER), OF A GIVEN FILE-GEODATABASE
+   the_header += "Subject:  [SECURE] " + the_item["subject"] + "\n"
+   return the_header + the_item["message"]
+
+#THIS FUNCTION SAVES A GIVEN QUEUED MESSAGE (SEE send_email()) TO THE MAIL SPOOL FOLDER, AS
+#   mail_YYYYMMDD-HHMMSS_<id>.json. IF THE MESSAGE IS ALREADY IN THE MAIL SPOOL, ITS FILE IS UPDATED.
+#   A MESSAGE THAT CAN'T BE SAVED IS STILL SENT (IF THE EMAIL SERVER ANSWERS).
+def spool_email(the_item):
+   try:
+      if the_item.get("spool_path") == None:
+         os.makedirs(mail_settings["spool"], exist_ok = True)
+         the_id = hashlib.md5((the_item["subject"] + str(the_item["time"])).encode("utf-8")).hexdigest()[0:8]
+         the_item["spool_path"] = os.path.join(mail_settings["spool"], "mail_" + time.strftime("%Y%m%d-%H%M%S", time.localtime(the_item["time"])) + "_" + the_id + ".json")
+      write_file(the_item["spool_path"], json.dumps(the_item))
+      #(REPORTS MERGED INTO A DIGEST ARE NOW IN THE DIGEST'S FILE)
+      for i in the_item["parts"]:
+         if os.path.isfile(i):
+            os.remove(i)
+      the_item["parts"] = []
+   except OSError as e:
+      make_note("Couldn't save email \"" + the_item["subject"] + "\" to " + mail_settings["spool"] + ". " + str(e))
+
+#THIS FUNCTION REMOVES A GIVEN QUEUED MESSAGE (AND ANY REPORTS MERGED INTO IT) FROM THE MAIL SPOOL
+def remove_spooled(the_item):
+   for i in [the_item.get("spool_path")] + the_item["parts"]:
+      if i != None and os.path.isfile(i):
+         os.remove(i)
+
+#THIS FUNCTION RETURNS A LIST OF MESSAGES (DICTIONARIES; SEE send_email()) IN THE MAIL SPOOL, OLDEST FIRST
+def read_spool():
+   the_output = []
+   for i in sorted(glob.glob(os.path.join(mail_settings["spool"], "mail_*.json"))):
+      try:
+         with open(i, "r") as the_file:
+            the_item = json.load(the_file)
+      except (OSError, ValueError):
+         continue
+      the_item["spool_path"] = i
+      the_output.append(the_item)
+   if len(the_output) > 0:
+      make_note(str(len(the_output)) + " unsent email(s) in " + mail_settings["spool"] + " will be sent again.", True)
+   return the_output
+
+#THIS FUNCTION HOLDS A GIVEN MESSAGE FOR A DIGEST (W/ THE mail_digest_minutes OPTION; SEE README NOTES)
+#   THE MESSAGE IS SAVED IN THE MAIL SPOOL'S digest FOLDER. IF THE OLDEST HELD MESSAGE IS AT LEAST
+#   mail_digest_minutes OLD, ALL HELD MESSAGES ARE MERGED INTO ONE DIGEST MESSAGE, WHICH IS RETURNED (TO BE
+#   SENT IN PLACE OF THE GIVEN MESSAGE); OTHERWISE None IS RETURNED. IF THE MESSAGE CAN'T BE SAVED, IT'S RETURNED.
+def hold_for_digest(the_item):
+   the_folder = os.path.join(mail_settings["spool"], "digest")
+   try:
+      os.makedirs(the_folder, exist_ok = True)
+      the_id = hashlib.md5((the_item["subject"] + str(the_item["time"])).encode("utf-8")).hexdigest()[0:8]
+      write_file(os.path.join(the_folder, "part_" + time.strftime("%Y%m%d-%H%M%S", time.localtime(the_item["time"])) + "_" + the_id + ".json"), json.dumps(the_item))
+   except OSError as e:
+      make_note("Couldn't hold email \"" + the_item["subject"] + "\" for digest. " + str(e))
+      return the_item
+   the_parts = []
+   the_reports = []
+   for i in sorted(glob.glob(os.path.join(the_folder, "part_*.json"))):
+      try:
+         with open(i, "r") as the_file:
+            the_part = json.load(the_file)
+      except (OSError, ValueError):
+         continue
+      the_parts.append(i)
+      the_heading = the_part["subject"]
+      if the_heading[0:14] == "snapshot.py - ":
+         the_heading = the_heading[14:len(the_heading)]
+      if the_part["subject"].endswith("ERROR CONDITION"):
+         the_reports.append((the_heading, "ERROR CONDITION", the_part["message"], the_part["time"]))
+      else:
+         the_reports.append((the_heading, "REPORT", the_part["message"], the_part["time"]))
+   the_oldest = min([i[3] for i in the_reports] + [the_item["time"]])
+   if time.time() - the_oldest < mail_settings["digest_minutes"] * 60:
+      make_note("Email \"" + the_item["subject"] + "\" is held for digest (" + str(len(the_parts)) + " held). The digest is sent once the oldest held email is " + format(mail_settings["digest_minutes"], "g") + " minutes old.", True)
+      return None
+   the_message, the_errors = make_digest(the_reports)
+   the_digest = dict(the_item)
+   if the_errors > 0:
+      the_digest["subject"] = "snapshot.py - DIGEST - ERROR CONDITION"
+   else:
+      the_digest["subject"] = "snapshot.py - DIGEST - REPORT"
+   the_digest["message"] = the_message
+   the_digest["parts"] = the_parts
+   make_note("Merged " + str(len(the_parts)) + " held email(s) into digest.", True)
+   return the_digest
+
+#THIS FUNCTION MERGES REPORTS INTO ONE MESSAGE AND RETURNS A TUPLE OF (<message>, <number of error conditions>)
+#   ITS ARGUMENT IS A LIST OF (<heading>, <"REPORT" or "ERROR CONDITION">, <report>, ...) TUPLES, IN THE ORDER
+#   THEY'RE TO BE LISTED
+def make_digest(the_reports):
+   the_errors = 0
+   the_message = ""
+   for i in the_reports:
+      if i[1] != "REPORT":
+         the_errors += 1
+      the_message += "***** " + i[0] + " *****\n" + i[2] + "\n"
+   the_message = str(len(the_reports)) + " sources: " + str(len(the_reports) - the_errors) + " reports, " + str(the_errors) + " error conditions.\n\n" + the_message
+   return (the_message, the_errors)
+
+#THIS FUNCTION IMPORTS arcpy, IF IT ISN'T IMPORTED ALREADY
+#   CALL IT BEFORE ANY USE OF arcpy
+def import_arcpy():
+   global arcpy
+   if arcpy == None:
+      print("IMPORTING arcpy...")
+      import arcpy
+
+#THIS FUNCTION RETURNS ARGUMENT OF GIVEN INDEX (0 IS FIRST ARGUMENT) THAT WAS PASSED TO THIS SCRIPT,
+#   OR AN EMPTY STRING IF THERE IS NO SUCH ARGUMENT (SAME AS arcpy.GetParameterAsText(), W/O IMPORTING arcpy)
+def get_parameter(the_index):
+   if the_index + 1 < len(sys.argv):
+      return sys.argv[the_index + 1]
+   return ""
+
+#THIS FUNCTION RETURNS A SORTED LIST OF FULL PATHS OF FILE GEODATABASES (.gdb FOLDERS) IN A GIVEN FOLDER
+def list_file_gdbs(the_folder):
+   the_output = []
+   with os.scandir(the_folder) as the_entries:
+      for i in the_entries:
+         if i.is_dir() and i.name.lower().endswith(".gdb"):
+            the_output.append(os.path.join(the_folder, i.name))
+   the_output.sort()
+   return the_output
+
+#THIS FUNCTION PREPARES A WORKER PROCESS FOR COPYING DATA OBJECTS. EACH WORKER PROCESS HAS ITS
+#   OWN arcpy SESSION, WHOSE WORKSPACE IS SET TO THE GIVEN SOURCE GEODATABASE
+def start_worker(the_workspace):
+   import_arcpy()
+   arcpy.env.workspace = the_workspace
+
+#THIS FUNCTION RETURNS A FINGERPRINT (HEX STRING) AND ROW COUNT OF A GIVEN FEATURE CLASS OR TABLE,
+#   AS A TUPLE OF (<fingerprint>, <row count>)
+#   SET FIRST ARGUMENT TO PATH OF THE DATA OBJECT. SET THE SECOND ARGUMENT (BOOLEAN) TO True OR False TO
+#   INDICATE IF A CHECKSUM OF ALL ATTRIBUTES AND GEOMETRIES IS INCLUDED IN THE FINGERPRINT.
+def get_fingerprint(the_path, with_checksum = False):
+   the_desc = arcpy.Describe(the_path)
+   the_rows = int(arcpy.management.GetCount(the_path)[0])
+   the_hash = hashlib.sha1()
+   #SCHEMA
+   for i in the_desc.fields:
+      the_hash.update((i.name.upper() + ":" + i.type + ":" + str(i.length) + ";").encode("utf-8"))
+   #ROW COUNT
+   the_hash.update(("rows:" + str(the_rows) + ";").encode("utf-8"))
+   #EXTENT (FEATURE CLASSES ONLY)
+   if hasattr(the_desc, "shapeType"):
+      the_extent = the_desc.extent
+      the_hash.update(("extent:" + repr((the_extent.XMin, the_extent.YMin, the_extent.XMax, the_extent.YMax)) + ";").encode("utf-8"))
+   #LATEST EDIT DATE (EDITOR TRACKING ONLY)
+   if getattr(the_desc, "editorTrackingEnabled", False) == True and the_desc.editedAtFieldName != "":
+      with arcpy.da.SearchCursor(the_path, [the_desc.editedAtFieldName], the_desc.editedAtFieldName + " IS NOT NULL", sql_clause = (None, "ORDER BY " + the_desc.editedAtFieldName + " DESC")) as the_cursor:
+         for i in the_cursor:
+            the_hash.update(("edited:" + str(i[0]) + ";").encode("utf-8"))
+            break
+   #CHECKSUM OF ALL ATTRIBUTES AND GEOMETRIES
+   if with_checksum == True:
+      the_fields = []
+      for i in the_desc.fields:
+         if i.type not in ("OID", "Geometry", "Raster", "Blob"):
+            the_fields.append(i.name)
+      if hasattr(the_desc, "shapeType"):
+         the_fields.append("SHAPE@WKB")
+      with arcpy.da.SearchCursor(the_path, ["OID@"] + the_fields, sql_clause = (None, "ORDER BY " + the_desc.OIDFieldName)) as the_cursor:
+         for i in the_cursor:
+            the_hash.update(repr(i).encode("utf-8"))
+   return (the_hash.hexdigest(), the_rows)
+
+#THIS FUNCTION COPIES ONE PLANNED DATA-OBJECT AND RETURNS A DICTIONARY W/ THE NOTE TO BE LOGGED FOR IT,
+#   WHETHER IT WAS REUSED FROM THE PREVIOUS SNAPSHOT, AND ITS FINGERPRINT AND ROW COUNT (IF INCREMENTAL)
+#   ITS ARGUMENT IS A PLANNED-JOB DICTIONARY (SEE plan_object())
+#   IT RUNS IN THIS SCRIPT'S PROCESS OR IN A WORKER PROCESS. IF THE COPY FAILS, A RuntimeError
+#   IS RAISED THAT CARRIES arcpy MESSAGES (A WORKER'S MESSAGES AREN'T VISIBLE TO THIS SCRIPT'S PROCESS)
+def copy_object(the_job):
+   the_result = {"name": the_job["name"], "type": the_job["type"], "reused": False, "fingerprint": None, "rows": None, "delta": None, "pyramids": None}
+   the_start = time.time()
+   try:
+      #TIME ONE REQUEST TO SOURCE GEODATABASE (ITS LATENCY, FOR LOAD THROTTLING; SEE update_throttle())
+      if the_job["throttle"] == True:
+         arcpy.Exists(the_job["source"])
+         the_result["latency"] = time.time() - the_start
+      #DELTA SNAPSHOT, IF DATA OBJECT HAS EDITOR TRACKING OR ARCHIVING (SEE copy_delta())
+      the_delta = None
+      if the_job["delta"] == True:
+         the_delta = get_delta_source(the_job)
+      #(AN UNCHANGED DELTA-SNAPSHOT DATA OBJECT IS REUSED W/ ITS BASE OR DELTA, IF THAT DELTA'S BASE IS STILL THE BASE)
+      the_previous_delta = None
+      if the_job["incremental"] == True:
+         if the_job["type"] == "raster":
+            the_result["fingerprint"] = get_raster_fingerprint(the_job["source"], the_job["raster_samples"])
+         else:
+            the_result["fingerprint"], the_result["rows"] = get_fingerprint(the_job["source"], the_job["checksum"])
+         if the_job["previous"] and the_result["fingerprint"] == the_job["previous_fingerprint"] and arcpy.Exists(the_job["previous"]):
+            if the_delta == None:
+               the_result["reused"] = True
+            else:
+               the_previous_delta = read_delta_index(the_job["previous_gdb"]).get(the_job["name"].upper())
+               if the_previous_delta != None and (the_previous_delta["mode"] == "base" or the_previous_delta["base"] == the_job["delta_base_date"]):
+                  the_result["reused"] = True
+      #STREAM LARGE FEATURE CLASSES AND TABLES, AND THOSE W/ FIELD SUBSETS (SEE stream_object())
+      the_stream = False
+      if the_result["reused"] == False and the_job["type"] != "raster" and the_delta == None:
+         if the_job["fields"] != None:
+            the_stream = True
+         elif the_job["stream_rows"] > 0:
+            if the_result["rows"] == None:
+               the_result["rows"] = int(arcpy.management.GetCount(the_job["source"])[0])
+            the_stream = the_result["rows"] >= the_job["stream_rows"]
+      if the_delta != None and the_result["reused"] == False:
+         the_result["delta"] = copy_delta(the_job, the_delta)
+         the_result["rows"] = the_result["delta"]["rows"]
+         if the_result["delta"]["mode"] == "base":
+            the_result["note"] = "Copied " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase (as base of delta snapshots)."
+         else:
+            the_result["note"] = "Copied delta of " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase (since base of " + the_result["delta"]["base"] + ": " + format(the_result["delta"]["inserted"], ",") + " inserted, " + format(the_result["delta"]["updated"], ",") + " updated, " + format(the_result["delta"]["deleted"], ",") + " deleted rows)."
+      elif the_result["reused"] == True:
+         arcpy.management.Copy(the_job["previous"], the_job["target"])
+         the_result["note"] = "Copied unchanged " + the_job["type"] + " " + the_job["source"] + " from previous snapshot geodatabase."
+         if the_previous_delta != None:
+            write_delta_file(the_job["target"], read_delta_file(the_job["previous_gdb"], the_job["name"]))
+            the_result["delta"] = the_previous_delta
+            the_result["rows"] = the_previous_delta["rows"]
+      elif the_stream == True:
+         the_start_stream = time.time()
+         the_result["rows"] = stream_object(the_job)
+         the_rate = the_result["rows"] / max(time.time() - the_start_stream, 0.001)
+         the_result["note"] = "Streamed " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase (" + format(the_result["rows"], ",") + " rows, " + format(int(the_rate), ",") + " rows per second)."
+      elif the_job["type"] == "raster":
+         the_result["note"] = copy_raster(the_job)
+         if the_job["raster_pyramids"] == "defer":
+            the_result["pyramids"] = "deferred"
+      else:
+         arcpy.management.Copy(the_job["source"], the_job["target"])
+         the_result["note"] = "Copied " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase."
+      #COUNT ROWS OF COPY, IF NOT ALREADY COUNTED WHILE FINGERPRINTING (READS FROM SNAPSHOT GEODATABASE)
+      if the_result["rows"] == None and the_job["type"] != "raster":
+         the_result["rows"] = int(arcpy.management.GetCount(the_job["target"])[0])
+   except Exception as e:
+      raise RuntimeError("Couldn't copy " + the_job["type"] + " " + the_job["source"] + ". " + str(e) + " arcpy MESSAGES: " + arcpy.GetMessages())
+   the_result["seconds"] = time.time() - the_start
+   return the_result
+
+#THIS FUNCTION COPIES A RASTER DATASET TO THE SNAPSHOT GEODATABASE AND RETURNS THE NOTE TO BE LOGGED FOR IT
+#   W/O RASTER OPTIONS, IT'S COPIED W/ THE Copy TOOL. W/ raster_compression OR raster_pyramids, IT'S COPIED W/
+#   THE Copy Raster TOOL UNDER THOSE ENVIRONMENT SETTINGS. IF IT'S LARGER THAN raster_tile_size, IT'S COPIED IN
+#   TILES (SEE copy_raster_tiles()).
+#   ITS ARGUMENT IS A PLANNED-JOB DICTIONARY (SEE plan_object())
+def copy_raster(the_job):
+   the_settings = (arcpy.env.compression, arcpy.env.pyramid, arcpy.env.rasterStatistics)
+   the_details = []
+   try:
+      if the_job["raster_compression"] != "":
+         arcpy.env.compression = the_job["raster_compression"]
+         the_details.append("compression " + the_job["raster_compression"])
+      if the_job["raster_pyramids"] in ("defer", "none"):
+         arcpy.env.pyramid = "NONE"
+         arcpy.env.rasterStatistics = "NONE"
+         if the_job["raster_pyramids"] == "defer":
+            the_details.append("pyramids and statistics deferred")
+         else:
+            the_details.append("w/o pyramids and statistics")
+      the_properties = get_raster_properties(the_job["source"])
+      the_tiles = get_raster_tiles(the_properties, the_job["raster_tile_size"])
+      if len(the_tiles) > 1:
+         the_start = time.time()
+         copy_raster_tiles(the_job, the_properties, the_tiles)
+         the_details.insert(0, str(len(the_tiles)) + " tiles w/ " + str(min(the_job["raster_workers"], len(the_tiles))) + " worker processes in " + format(time.time() - the_start, ".1f") + " seconds")
+      elif len(the_details) > 0:
+         arcpy.management.CopyRaster(the_job["source"], the_job["target"])
+      else:
+         arcpy.management.Copy(the_job["source"], the_job["target"])
+   finally:
+      arcpy.env.compression, arcpy.env.pyramid, arcpy.env.rasterStatistics = the_settings
+   if len(the_details) > 0:
+      return "Copied " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase (" + "; ".join(the_details) + ")."
+   return "Copied " + the_job["type"] + " " + the_job["source"] + " to snapshot geodatabase."
+
+#THIS FUNCTION COPIES A RASTER DATASET TO THE SNAPSHOT GEODATABASE IN TILES. EACH TILE IS CLIPPED FROM THE SOURCE
+#   TO A TIFF FILE IN THE JOB'S TILE FOLDER (SEE copy_raster_tile()), IN A POOL OF raster_workers WORKER PROCESSES (OR
+#   ONE AFTER ANOTHER). AN EMPTY RASTER DATASET W/ THE SOURCE'S PROPERTIES IS THEN CREATED IN THE SNAPSHOT
+#   GEODATABASE, TILES ARE MOSAICKED INTO IT, AND TILE FILES ARE DELETED.
+#   SET FIRST ARGUMENT TO A PLANNED-JOB DICTIONARY (SEE plan_object()). SET SECOND ARGUMENT TO THE SOURCE'S
+#   PROPERTIES (SEE get_raster_properties()). SET THIRD ARGUMENT TO THE LIST OF TILES (SEE get_raster_tiles()).
+def copy_raster_tiles(the_job, the_properties, the_tiles):
+   the_folder = os.path.join(the_job["tile_folder"], the_job["name"].replace("\\", "_"))
+   if os.path.isdir(the_folder):
+      shutil.rmtree(the_folder)
+   os.makedirs(the_folder)
+   the_work = []
+   for i in range(len(the_tiles)):
+      the_work.append((the_job["source"], " ".join(repr(j) for j in the_tiles[i]), os.path.join(the_folder, "tile" + str(i) + ".tif")))
+   if the_job["raster_workers"] > 1:
+      with concurrent.futures.ProcessPoolExecutor(min(the_job["raster_workers"], len(the_work)), initializer = start_worker, initargs = (arcpy.env.workspace,)) as the_pool:
+         the_count = 0
+         for i in the_pool.map(copy_raster_tile, the_work):
+            the_count += 1
+            print("     " + the_job["name"] + ":  clipped " + str(the_count) + " of " + str(len(the_work)) + " tiles")
+   else:
+      for i in range(len(the_work)):
+         copy_raster_tile(the_work[i])
+         print("     " + the_job["name"] + ":  clipped " + str(i + 1) + " of " + str(len(the_work)) + " tiles")
+   #CREATE EMPTY RASTER DATASET AND MOSAIC TILES INTO IT (COMPRESSION AND PYRAMID ENVIRONMENT SETTINGS APPLY HERE)
+   the_gdb, the_name = the_job["target"].rsplit("\\", 1)
+   the_pyramids = "PYRAMIDS -1 NEAREST DEFAULT 75 NO_SKIP"
+   if arcpy.env.pyramid == "NONE":
+      the_pyramids = "NONE"
+   arcpy.management.CreateRasterDataset(the_gdb, the_name, the_properties["cell"][0], raster_pixel_types.get(the_properties["pixel_type"], "8_BIT_UNSIGNED"), the_properties["spatial_reference"], the_properties["bands"], None, the_pyramids, None, arcpy.env.compression)
+   the_paths = []
+   for i in the_work:
+      the_paths.append(i[2])
+   arcpy.management.Mosaic(";".join(the_paths), the_job["target"], "FIRST", "FIRST", nodata_value = the_properties["nodata"])
+   shutil.rmtree(the_folder)
+   try:
+      os.rmdir(the_job["tile_folder"])
+   except OSError:
+      pass
+
+#THIS FUNCTION CLIPS ONE TILE OF A RASTER DATASET TO A TIFF FILE, SNAPPED TO THE SOURCE'S CELLS
+#   IT RUNS IN THIS SCRIPT'S PROCESS OR IN A WORKER PROCESS (SEE copy_raster_tiles())
+#   ITS ARGUMENT IS A TUPLE OF (<source path>, <tile extent as "XMin YMin XMax YMax">, <TIFF file path>)
+def copy_raster_tile(the_tile):
+   arcpy.env.snapRaster = the_tile[0]
+   arcpy.management.Clip(the_tile[0], the_tile[1], the_tile[2], "#", "#", "NONE", "NO_MAINTAIN_EXTENT")
+   return the_tile[2]
+
+#THIS FUNCTION RETURNS A LIST OF TILES OF A RASTER DATASET, EACH AS A TUPLE OF (<XMin>, <YMin>, <XMax>, <YMax>)
+#   IN MAP UNITS, ROW BY ROW FROM THE TOP LEFT. A RASTER DATASET THAT FITS IN ONE TILE (OR IF TILE SIZE IS 0) HAS ONE.
+#   SET FIRST ARGUMENT TO THE RASTER DATASET'S PROPERTIES (SEE get_raster_properties()). SET SECOND ARGUMENT TO
+#   TILE SIZE (IN PIXELS).
+def get_raster_tiles(the_properties, the_size):
+   the_extent = the_properties["extent"]
+   if the_size <= 0 or (the_properties["width"] <= the_size and the_properties["height"] <= the_size):
+      return [the_extent]
+   the_width = the_size * the_properties["cell"][0]
+   the_height = the_size * the_properties["cell"][1]
+   the_output = []
+   for i in range(int(math.ceil(the_properties["height"] / float(the_size)))):
+      for j in range(int(math.ceil(the_properties["width"] / float(the_size)))):
+         the_xmin = the_extent[0] + j * the_width
+         the_ymax = the_extent[3] - i * the_height
+         the_output.append((the_xmin, max(the_extent[1], the_ymax - the_height), min(the_extent[2], the_xmin + the_width), the_ymax))
+   return the_output
+
+#THIS FUNCTION RETURNS A DICTIONARY OF A RASTER DATASET'S PROPERTIES: width AND height (PIXELS), bands, pixel_type,
+#   cell (TUPLE OF CELL WIDTH AND HEIGHT), extent (TUPLE OF XMin, YMin, XMax, YMax), spatial_reference (OBJECT),
+#   compression, AND nodata
+#   BAND PROPERTIES ARE READ FROM ITS FIRST BAND (Band_1) IF THE RASTER DATASET HAS MORE THAN ONE BAND
+#   ITS ARGUMENT IS PATH OF THE RASTER DATASET
+def get_raster_properties(the_path):
+   the_desc = arcpy.Describe(the_path)
+   the_band = the_desc
+   if getattr(the_desc, "width", None) == None:
+      the_band = arcpy.Describe(the_path + "\\Band_1")
+   the_extent = the_desc.extent
+   return {"width": the_band.width, "height": the_band.height, "bands": the_desc.bandCount, "pixel_type": the_band.pixelType, "cell": (the_band.meanCellWidth, the_band.meanCellHeight), "extent": (the_extent.XMin, the_extent.YMin, the_extent.XMax, the_extent.YMax), "spatial_reference": the_desc.spatialReference, "compression": the_desc.compressionType, "nodata": getattr(the_band, "noDataValue", None)}
+
+#THIS FUNCTION RETURNS A FINGERPRINT (HEX STRING) OF A GIVEN RASTER DATASET, FROM ITS PROPERTIES (SEE
+#   get_raster_properties()) AND THE PIXELS OF A GRID OF SAMPLE WINDOWS (UP TO 64 x 64 PIXELS EACH, CENTERED IN
+#   EQUAL CELLS OF THE GRID, SO THE SAME WINDOWS ARE READ ON EVERY RUN)
+#   SET FIRST ARGUMENT TO PATH OF THE RASTER DATASET. SET SECOND ARGUMENT TO NUMBER OF SAMPLE WINDOWS (0 FOR PROPERTIES ONLY).
+def get_raster_fingerprint(the_path, the_samples):
+   the_properties = get_raster_properties(the_path)
+   the_hash = hashlib.sha1()
+   #PROPERTIES
+   for i in ("width", "height", "bands", "pixel_type", "cell", "extent", "compression", "nodata"):
+      the_hash.update((i + ":" + repr(the_properties[i]) + ";").encode("utf-8"))
+   the_hash.update(("spatial_reference:" + str(the_properties["spatial_reference"].name) + ";").encode("utf-8"))
+   #SAMPLED PIXELS
+   add_raster_samples(the_hash, the_path, the_properties, the_samples)
+   return the_hash.hexdigest()
+
+#THIS FUNCTION ADDS THE PIXELS OF A GRID OF SAMPLE WINDOWS OF A RASTER DATASET TO A GIVEN HASH (SEE get_raster_fingerprint())
+#   SET FIRST ARGUMENT TO THE HASH (A hashlib OBJECT). SET SECOND ARGUMENT TO PATH OF THE RASTER DATASET. SET THIRD
+#   ARGUMENT TO ITS PROPERTIES (SEE get_raster_properties()). SET FOURTH ARGUMENT TO NUMBER OF SAMPLE WINDOWS.
+def add_raster_samples(the_hash, the_path, the_properties, the_samples):
+   the_grid = int(math.ceil(math.sqrt(the_samples)))
+   the_count = 0
+   for i in range(the_grid):
+      for j in range(the_grid):
+         if the_count >= the_samples:
+            break
+         the_count += 1
+         the_column = max(0, int((j + 0.5) * the_properties["width"] / the_grid) - 32)
+         the_row = max(0, int((i + 0.5) * the_properties["height"] / the_grid) - 32)
+         the_columns = min(64, the_properties["width"] - the_column)
+         the_rows = min(64, the_properties["height"] - the_row)
+         if the_columns <= 0 or the_rows <= 0:
+            continue
+         the_corner = arcpy.Point(the_properties["extent"][0] + the_column * the_properties["cell"][0], the_properties["extent"][3] - (the_row + the_rows) * the_properties["cell"][1])
+         the_hash.update(("window:" + str(the_column) + ":" + str(the_row) + ";").encode("utf-8"))
+         the_hash.update(arcpy.RasterToNumPyArray(the_path, the_corner, the_columns, the_rows).tobytes())
+
+#THIS FUNCTION VERIFIES COPIED DATA-OBJECTS AGAINST THE SOURCE GEODATABASE (SEE verify_object()) AND RETURNS A LIST OF
+#   VERIFICATION RESULTS, IN PLANNED ORDER. W/ MORE THAN ONE WORKER, DATA OBJECTS ARE VERIFIED IN A POOL OF WORKER
+#   PROCESSES. ONCE THE DEADLINE PASSES, DATA OBJECTS WHOSE VERIFICATION HASN'T STARTED ARE NOT VERIFIED.
+#   SET FIRST ARGUMENT TO LIST OF PLANNED-JOB DICTIONARIES (SEE plan_object()). SET SECOND ARGUMENT TO LIST OF THEIR
+#   RESULTS (SEE copy_object()). SET THIRD ARGUMENT TO THE DEADLINE (time.time() SECONDS), OR None. SET FOURTH ARGUMENT
+#   TO NUMBER OF WORKER PROCESSES.
+def verify_objects(the_plan, the_results, the_deadline, the_workers):
+   the_output = []
+   if the_workers > 1 and len(the_plan) > 1:
+      flush_log()
+      with concurrent.futures.ProcessPoolExecutor(min(the_workers, len(the_plan)), initializer = start_worker, initargs = (source_gdb,)) as the_pool:
+         the_futures = []
+         for i in range(len(the_plan)):
+            the_futures.append(the_pool.submit(verify_object, the_plan[i], the_results[i], verify, verify_sample, the_deadline))
+         the_timeout = None
+         if the_deadline != None:
+            the_timeout = max(0, the_deadline - time.time())
+         #(VERIFICATIONS ALREADY RUNNING AT THE DEADLINE STOP THEMSELVES; SEE verify_object())
+         the_pending = concurrent.futures.wait(the_futures, the_timeout)[1]
+         for i in the_pending:
+            i.cancel()
+      for i in range(len(the_plan)):
+         if the_futures[i].cancelled() == True:
+            the_output.append({"name": the_plan[i]["name"], "type": the_plan[i]["type"], "status": "not verified", "checks": [], "problems": ["time budget ran out"], "seconds": 0})
+         elif the_futures[i].exception() != None:
+            the_output.append({"name": the_plan[i]["name"], "type": the_plan[i]["type"], "status": "not verified", "checks": [], "problems": [str(the_futures[i].exception())], "seconds": 0})
+         else:
+            the_output.append(the_futures[i].result())
+   else:
+      for i in range(len(the_plan)):
+         the_output.append(verify_object(the_plan[i], the_results[i], verify, verify_sample, the_deadline))
+   return the_output
+
+#THIS FUNCTION VERIFIES ONE COPIED DATA-OBJECT AGAINST ITS SOURCE AND RETURNS A DICTIONARY OF ITS NAME, TYPE, STATUS
+#   ("passed", "failed", OR "not verified"), CHECKS MADE, PROBLEMS FOUND, AND SECONDS TAKEN
+#   FEATURE CLASSES AND TABLES ARE CHECKED FOR SCHEMA (EDITABLE FIELDS, W/ TYPES AND LENGTHS), ROW COUNT, EXTENT (FEATURE
+#   CLASSES W/ ROWS), AND, W/ sample OR full MODE, A CHECKSUM OF ROWS (SEE get_rows_checksum()). RASTER DATASETS ARE
+#   CHECKED FOR PROPERTIES AND, W/ sample OR full MODE, SAMPLED PIXELS (SEE add_raster_samples()). DELTAS AREN'T VERIFIED
+#   (BASES OF DELTA SNAPSHOTS ARE).
+#   IT RUNS IN THIS SCRIPT'S PROCESS OR IN A WORKER PROCESS.
+#   SET FIRST ARGUMENT TO A PLANNED-JOB DICTIONARY (SEE plan_object()). SET SECOND ARGUMENT TO ITS RESULT (SEE
+#   copy_object()). SET THIRD ARGUMENT TO MODE ("basic", "sample", OR "full"). SET FOURTH ARGUMENT TO NUMBER OF ROWS
+#   IN A SAMPLED CHECKSUM. SET FIFTH ARGUMENT TO THE DEADLINE (time.time() SECONDS), OR None.
+def verify_object(the_job, the_result, the_mode, the_sample, the_deadline):
+   the_output = {"name": the_job["name"], "type": the_job["type"], "status": "passed", "checks": [], "problems": [], "seconds": 0}
+   the_start = time.time()
+   if the_result.get("delta") and the_result["delta"]["mode"] == "delta":
+      the_output["status"] = "not verified"
+      the_output["problems"].append("deltas aren't verified")
+      return the_output
+   if the_deadline != None and time.time() > the_deadline:
+      the_output["status"] = "not verified"
+      the_output["problems"].append("time budget ran out")
+      return the_output
+   try:
+      if the_job["type"] == "raster":
+         #PROPERTIES
+         the_source = get_raster_properties(the_job["source"])
+         the_copy = get_raster_properties(the_job["target"])
+         the_output["checks"].append("properties")
+         for i in ("width", "height", "bands", "pixel_type", "cell"):
+            if the_source[i] != the_copy[i]:
+               the_output["problems"].append(i + " is " + str(the_copy[i]) + " (source has " + str(the_source[i]) + ")")
+         if compare_extents(the_source["extent"], the_copy["extent"], 0.5 * the_source["cell"][0]) == False:
+            the_output["problems"].append("extent is " + repr(the_copy["extent"]) + " (source has " + repr(the_source["extent"]) + ")")
+         #SAMPLED PIXELS
+         if the_mode in ("sample", "full") and len(the_output["problems"]) == 0:
+            the_output["checks"].append("sampled pixels")
+            the_hashes = []
+            for i in (the_job["source"], the_job["target"]):
+               the_hash = hashlib.sha1()
+               add_raster_samples(the_hash, i, the_source, max(the_job["raster_samples"], 1))
+               the_hashes.append(the_hash.hexdigest())
+            if the_hashes[0] != the_hashes[1]:
+               the_output["problems"].append("sampled pixels don't match source")
+      else:
+         the_source = arcpy.Describe(the_job["source"])
+         the_copy = arcpy.Describe(the_job["target"])
+         #SCHEMA (W/ A FIELD SUBSET, ONLY FIELDS OF THE COPY ARE CHECKED)
+         the_output["checks"].append("schema")
+         the_source_fields = {}
+         for i in the_source.fields:
+            if i.editable == True:
+               the_source_fields[i.name.upper()] = i
+         the_copy_fields = {}
+         for i in the_copy.fields:
+            if i.editable == True:
+               the_copy_fields[i.name.upper()] = i
+         for i in the_copy_fields:
+            if i not in the_source_fields:
+               the_output["problems"].append("field " + i + " isn't in source")
+            elif the_copy_fields[i].type != the_source_fields[i].type or the_copy_fields[i].length != the_source_fields[i].length:
+               the_output["problems"].append("field " + i + " is " + the_copy_fields[i].type + "(" + str(the_copy_fields[i].length) + ") (source has " + the_source_fields[i].type + "(" + str(the_source_fields[i].length) + "))")
+         if the_job["fields"] == None:
+            for i in the_source_fields:
+               if i not in the_copy_fields:
+                  the_output["problems"].append("field " + i + " is missing")
+         #ROW COUNT
+         the_output["checks"].append("rows")
+         the_rows = int(arcpy.management.GetCount(the_job["source"])[0])
+         the_copy_rows = int(arcpy.management.GetCount(the_job["target"])[0])
+         if the_rows != the_copy_rows:
+            the_output["problems"].append(format(the_copy_rows, ",") + " rows (source has " + format(the_rows, ",") + ")")
+         #EXTENT
+         if hasattr(the_source, "shapeType") and the_rows > 0 and the_rows == the_copy_rows:
+            the_output["checks"].append("extent")
+            the_tolerance = 2 * (getattr(the_source.spatialReference, "XYTolerance", None) or 0.000001)
+            the_extents = []
+            for i in (the_source.extent, the_copy.extent):
+               the_extents.append((i.XMin, i.YMin, i.XMax, i.YMax))
+            if compare_extents(the_extents[0], the_extents[1], the_tolerance) == False:
+               the_output["problems"].append("extent is " + repr(the_extents[1]) + " (source has " + repr(the_extents[0]) + ")")
+         #CHECKSUM OF ROWS (ONLY IF SCHEMA AND ROW COUNT MATCH)
+         if the_mode in ("sample", "full") and len(the_output["problems"]) == 0:
+            the_fields = []
+            for i in the_copy_fields:
+               if the_copy_fields[i].type not in ("OID", "Geometry", "Raster", "Blob"):
+                  the_fields.append(i)
+            if hasattr(the_source, "shapeType"):
+               the_fields.append("SHAPE@WKB")
+            if the_mode == "full":
+               the_output["checks"].append("checksum of all rows")
+               the_parts = [(None, "")]
+            else:
+               the_output["checks"].append("checksum of " + format(min(the_sample, the_rows), ",") + " sampled rows")
+               the_parts = [(int(math.ceil(the_sample / 2.0)), ""), (int(math.floor(the_sample / 2.0)), " DESC")]
+            for i in the_parts:
+               if get_rows_checksum(the_job["source"], the_source.OIDFieldName, the_fields, i[1], i[0], the_deadline) != get_rows_checksum(the_job["target"], the_copy.OIDFieldName, the_fields, i[1], i[0], the_deadline):
+                  the_output["problems"].append("rows don't match source")
+                  break
+   except TimeoutError:
+      the_output["status"] = "not verified"
+      the_output["problems"].append("time budget ran out")
+   except Exception as e:
+      the_output["problems"].append("couldn't be verified: " + str(e))
+   if the_output["status"] == "passed" and len(the_output["problems"]) > 0:
+      the_output["status"] = "failed"
+   the_output["seconds"] = round(time.time() - the_start, 3)
+   return the_output
+
+#THIS FUNCTION RETURNS True IF TWO EXTENTS (TUPLES OF XMin, YMin, XMax, YMax) ARE THE SAME, WITHIN A GIVEN TOLERANCE
+def compare_extents(the_extent, the_other, the_tolerance):
+   for i in range(4):
+      if abs(the_extent[i] - the_other[i]) > the_tolerance:
+         return False
+   return True
+
+#THIS FUNCTION RETURNS A CHECKSUM (HEX STRING) OF ROWS OF A FEATURE CLASS OR TABLE, IN ObjectID ORDER (ObjectIDs
+#   THEMSELVES AREN'T IN THE CHECKSUM, SO A COPY W/ RENUMBERED ObjectIDs HAS THE SAME CHECKSUM). RAISES TimeoutError IF
+#   THE DEADLINE PASSES WHILE ROWS ARE READ.
+#   SET FIRST ARGUMENT TO PATH OF THE DATA OBJECT. SET SECOND ARGUMENT TO ITS ObjectID FIELD. SET THIRD ARGUMENT TO LIST
+#   OF FIELDS. SET FOURTH ARGUMENT TO "" (ASCENDING ORDER) OR " DESC" (DESCENDING ORDER). SET FIFTH ARGUMENT TO NUMBER
+#   OF ROWS (OR None FOR ALL ROWS). SET SIXTH ARGUMENT TO THE DEADLINE (time.time() SECONDS), OR None.
+def get_rows_checksum(the_path, the_oid_field, the_fields, the_order, the_limit, the_deadline):
+   the_hash = hashlib.sha1()
+   the_count = 0
+   if the_limit == 0:
+      return the_hash.hexdigest()
+   with arcpy.da.SearchCursor(the_path, the_fields, sql_clause = (None, "ORDER BY " + the_oid_field + the_order)) as the_cursor:
+      for i in the_cursor:
+         the_hash.update(repr(i).encode("utf-8"))
+         the_count += 1
+         if the_limit != None and the_count >= the_limit:
+            break
+         if the_deadline != None and the_count % 1000 == 0 and time.time() > the_deadline:
+            raise TimeoutError()
+   return the_hash.hexdigest()
+
+#THIS FUNCTION MAKES NOTES (LOG AND EMAIL REPORT) OF VERIFICATION RESULTS AND RECORDS THEM IN run_metrics
+#   SET FIRST ARGUMENT TO LIST OF VERIFICATION RESULTS (SEE verify_objects()). SET SECOND ARGUMENT TO SECONDS TAKEN.
+def note_verification(the_verified, the_seconds):
+   the_counts = {"passed": 0, "failed": 0, "not verified": 0}
+   for i in the_verified:
+      the_counts[i["status"]] += 1
+   make_note("VERIFICATION OF COPIED DATA-OBJECTS (" + verify + "):  " + str(the_counts["passed"]) + " passed, " + str(the_counts["failed"]) + " failed, " + str(the_counts["not verified"]) + " not verified, in " + format(the_seconds, ".1f") + " seconds", True, True)
+   for i in the_verified:
+      if i["status"] != "passed":
+         the_line = "     " + i["name"] + ":  " + i["status"].upper()
+         if i.get("recopied") == True:
+            the_line += " (after recopy)"
+         make_note(the_line + " - " + "; ".join(i["problems"]), True, True, {"object": i["name"], "verification": i["status"]})
+   run_metrics["verification"] = {"mode": verify, "seconds": round(the_seconds, 3), "passed": the_counts["passed"], "failed": the_counts["failed"], "not_verified": the_counts["not verified"], "objects": the_verified}
+
+#THIS FUNCTION COPIES A FEATURE CLASS OR TABLE TO THE SNAPSHOT GEODATABASE BY STREAMING ITS ROWS AND
+#   RETURNS THE NUMBER OF ROWS COPIED. AN EMPTY COPY IS CREATED FROM THE SOURCE'S SCHEMA (W/O FIELDS THAT
+#   AREN'T IN THE JOB'S FIELD SUBSET, IF ANY). ROWS ARE THEN READ IN BATCHES, IN ObjectID ORDER, EACH BATCH W/
+#   ITS OWN SEARCH CURSOR (SO NO READ IS HELD OPEN ON THE SOURCE BETWEEN BATCHES), AND WRITTEN W/ AN INSERT
+#   CURSOR. PROGRESS IS PRINTED AFTER EACH BATCH.
+#   ITS ARGUMENT IS A PLANNED-JOB DICTIONARY (SEE plan_object())
+def stream_object(the_job):
+   the_desc = arcpy.Describe(the_job["source"])
+   create_empty_copy(the_job)
+   #STREAM ROWS OF EDITABLE FIELDS (AND GEOMETRY)
+   the_fields = get_insert_fields(the_job["target"], the_job["type"])
+   the_total = int(arcpy.management.GetCount(the_job["source"])[0])
+   the_count = 0
+   the_last = None
+   the_start = time.time()
+   while True:
+      the_where = None
+      if the_last != None:
+         the_where = the_desc.OIDFieldName + " > " + str(the_last)
+      the_batch = []
+      with arcpy.da.SearchCursor(the_job["source"], ["OID@"] + the_fields, the_where, sql_clause = (None, "ORDER BY " + the_desc.OIDFieldName)) as the_cursor:
+         for i in the_cursor:
+            the_batch.append(i)
+            if len(the_batch) >= the_job["stream_batch"]:
+               break
+      if len(the_batch) == 0:
+         break
+      with arcpy.da.InsertCursor(the_job["target"], the_fields) as the_cursor:
+         for i in the_batch:
+            the_cursor.insertRow(i[1:len(i)])
+      the_count += len(the_batch)
+      the_last = the_batch[-1][0]
+      the_rate = the_count / max(time.time() - the_start, 0.001)
+      print("     " + the_job["name"] + ":  streamed " + format(the_count, ",") + " of " + format(the_total, ",") + " rows (" + str(int(100 * the_count / max(the_total, 1))) + "%), " + format(int(the_rate), ",") + " rows per second")
+      if len(the_batch) < the_job["stream_batch"]:
+         break
+   return the_count
+
+#THIS FUNCTION CREATES AN EMPTY COPY OF A FEATURE CLASS OR TABLE IN THE SNAPSHOT GEODATABASE, FROM THE SOURCE'S
+#   SCHEMA (W/O FIELDS THAT AREN'T IN THE JOB'S FIELD SUBSET, IF ANY)
+#   ITS ARGUMENT IS A PLANNED-JOB DICTIONARY (SEE plan_object())
+def create_empty_copy(the_job):
+   the_desc = arcpy.Describe(the_job["source"])
+   the_folder, the_name = the_job["target"].rsplit("\\", 1)
+   if the_job["type"] == "feature-class":
+      the_m = "DISABLED"
+      if the_desc.hasM == True:
+         the_m = "ENABLED"
+      the_z = "DISABLED"
+      if the_desc.hasZ == True:
+         the_z = "ENABLED"
+      arcpy.management.CreateFeatureclass(the_folder, the_name, the_desc.shapeType.upper(), the_job["source"], the_m, the_z, the_desc.spatialReference)
+   else:
+      arcpy.management.CreateTable(the_folder, the_name, the_job["source"])
+   #DROP FIELDS THAT AREN'T IN FIELD SUBSET (IF ANY)
+   if the_job["fields"] != None:
+      the_subset = []
+      for i in the_job["fields"]:
+         the_subset.append(i.upper())
+      the_drops = []
+      for i in arcpy.ListFields(the_job["target"]):
+         if i.required == False and i.name.upper() not in the_subset:
+            the_drops.append(i.name)
+      if len(the_drops) > 0:
+         arcpy.management.DeleteField(the_job["target"], the_drops)
+
+#THIS FUNCTION RETURNS A LIST OF FIELDS THAT ROWS ARE WRITTEN TO W/ AN INSERT CURSOR: EDITABLE FIELDS (NOT
+#   ObjectID OR GlobalID) AND, FOR A FEATURE CLASS, GEOMETRY (SHAPE@)
+#   SET FIRST ARGUMENT TO PATH OF THE FEATURE CLASS OR TABLE. SET SECOND ARGUMENT TO "feature-class" OR "table".
+def get_insert_fields(the_path, the_type):
+   the_fields = []
+   for i in arcpy.ListFields(the_path):
+      if i.editable == True and i.type not in ("OID", "Geometry", "GlobalID"):
+         the_fields.append(i.name)
+   if the_type == "feature-class":
+      the_fields.append("SHAPE@")
+   return the_fields
+
+#THIS FUNCTION RETURNS A DICTIONARY THAT DESCRIBES HOW A DATA OBJECT'S CHANGES ARE FOUND FOR A DELTA SNAPSHOT, OR
+#   None IF THE DATA OBJECT HAS NEITHER EDITOR TRACKING NOR ARCHIVING. THE DICTIONARY HAS:
+#      key       FIELD THAT IDENTIFIES ROWS (delta_key OPTION, OR GlobalID, OR ObjectID)
+#      changes   PATH OF WHERE CHANGED ROWS ARE READ FROM (THE DATA OBJECT, OR ITS ARCHIVE CLASS, <name>_H)
+#      edited    DATE FIELD THAT TELLS WHEN A ROW CHANGED (EDITOR TRACKING'S LAST-EDITED DATE, OR GDB_FROM_DATE)
+#      where     CONDITION THAT LIMITS CHANGED ROWS TO CURRENT ROWS (ARCHIVING ONLY), OR None
+#      fields    LIST OF <FIELD NAME>:<TYPE> STRINGS (A NEW BASE IS COPIED IF THE SCHEMA CHANGES)
+#   EDITOR TRACKING IS USED IF THE DATA OBJECT HAS BOTH.
+#   ITS ARGUMENT IS A PLANNED-JOB DICTIONARY (SEE plan_object())
+def get_delta_source(the_job):
+   the_desc = arcpy.Describe(the_job["source"])
+   the_output = {"key": the_desc.OIDFieldName, "changes": the_job["source"], "edited": None, "where": None, "fields": []}
+   for i in the_desc.fields:
+      the_output["fields"].append(i.name.upper() + ":" + i.type)
+      if i.type == "GlobalID":
+         the_output["key"] = i.name
+   for i in the_desc.fields:
+      if i.name.upper() == the_job["delta_key"].upper():
+         the_output["key"] = i.name
+   if getattr(the_desc, "editorTrackingEnabled", False) == True and the_desc.editedAtFieldName != "":
+      the_output["edited"] = the_desc.editedAtFieldName
+   elif getattr(the_desc, "isArchived", False) == True:
+      the_output["changes"] = the_job["source"] + "_H"
+      the_output["edited"] = "GDB_FROM_DATE"
+      the_output["where"] = "GDB_TO_DATE = " + get_date_sql("9999-12-31 23:59:59", the_job["date_style"])
+   else:
+      return None
+   return the_output
+
+#THIS FUNCTION RETURNS HOW A GIVEN WORKSPACE WRITES DATES IN SQL (SEE get_date_sql()): "file" (FILE AND MOBILE
+#   GEODATABASES), "oracle", OR "plain" (OTHER ENTERPRISE GEODATABASES, SUCH AS SQL SERVER AND PostgreSQL)
+def get_date_style(the_workspace):
+   the_desc = arcpy.Describe(the_workspace)
+   if the_desc.workspaceType != "RemoteDatabase":
+      return "file"
+   if "oracle" in str(getattr(the_desc.connectionProperties, "instance", "")).lower():
+      return "oracle"
+   return "plain"
+
+#THIS FUNCTION RETURNS A DATE, FOR A WHERE CLAUSE
+#   SET FIRST ARGUMENT TO THE DATE AS YYYY-MM-DD HH:MM:SS. SET SECOND ARGUMENT TO A DATE STYLE (SEE get_date_style()).
+def get_date_sql(the_value, the_style):
+   if the_style == "file":
+      return "date '" + the_value + "'"
+   elif the_style == "oracle":
+      return "TO_DATE('" + the_value + "', 'YYYY-MM-DD HH24:MI:SS')"
+   return "'" + the_value + "'"
+
+#THIS FUNCTION RETURNS THE LATEST CHANGE DATE (AS YYYY-MM-DD HH:MM:SS) OF A DATA OBJECT, OR None IF IT HAS NONE
+#   IT'S READ FROM THE SOURCE GEODATABASE (NOT THIS COMPUTER'S CLOCK), SO THE NEXT DELTA SNAPSHOT CAN ASK FOR ROWS
+#   CHANGED SINCE.
+#   ITS ARGUMENT IS A DICTIONARY RETURNED BY get_delta_source()
+def get_watermark(the_delta):
+   the_where = the_delta["edited"] + " IS NOT NULL"
+   if the_delta["where"] != None:
+      the_where += " AND " + the_delta["where"]
+   with arcpy.da.SearchCursor(the_delta["changes"], [the_delta["edited"]], the_where, sql_clause = (None, "ORDER BY " + the_delta["edited"] + " DESC")) as the_cursor:
+      for i in the_cursor:
+         if hasattr(i[0], "strftime"):
+            return i[0].strftime("%Y-%m-%d %H:%M:%S")
+         return str(i[0])[0:19]
+   return None
+
+#THIS FUNCTION RETURNS A LIST OF FIELDS WHOSE VALUES TELL WHETHER A ROW OF A DELTA SNAPSHOT'S DATA OBJECT CHANGED (SEE
+#   copy_delta()): EDITABLE FIELDS (NOT ObjectID OR GlobalID) AND, FOR A FEATURE CLASS, GEOMETRY (SHAPE@WKB)
+#   SET FIRST ARGUMENT TO PATH OF THE FEATURE CLASS OR TABLE. SET SECOND ARGUMENT TO "feature-class" OR "table".
+def get_hash_fields(the_path, the_type):
+   the_fields = []
+   for i in get_insert_fields(the_path, the_type):
+      if i != "SHAPE@":
+         the_fields.append(i)
+   if the_type == "feature-class":
+      the_fields.append("SHAPE@WKB")
+   return the_fields
+
+#THIS FUNCTION RETURNS A DICTIONARY OF <key>: <hash of row's values> OF A DATA OBJECT'S ROWS THAT CHANGED AT OR AFTER
+#   A GIVEN LATEST CHANGE DATE (SEE get_watermark()), SO A DELTA CAN TELL WHICH OF THEM CHANGED AGAIN (SEE copy_delta())
+#   SET FIRST ARGUMENT TO A DICTIONARY RETURNED BY get_delta_source(). SET SECOND ARGUMENT TO THE LATEST CHANGE DATE.
+#   SET THIRD ARGUMENT TO THE DATE STYLE (SEE get_date_style()). SET FOURTH ARGUMENT TO FIELDS TO HASH (SEE
+#   get_hash_fields()).
+def get_watermark_rows(the_delta, the_watermark, the_style, the_fields):
+   the_output = {}
+   the_where = the_delta["edited"] + " >= " + get_date_sql(the_watermark, the_style)
+   if the_delta["where"] != None:
+      the_where += " AND " + the_delta["where"]
+   with arcpy.da.SearchCursor(the_delta["changes"], [the_delta["key"]] + the_fields, the_where) as the_cursor:
+      for i in the_cursor:
+         the_output[str(i[0])] = hashlib.sha1(repr(tuple(i[1:len(i)])).encode("utf-8")).hexdigest()
+   return the_output
+
+#THIS FUNCTION COPIES A DATA OBJECT FOR A DELTA SNAPSHOT AND RETURNS A DICTIONARY OF WHAT WAS COPIED (mode, base,
+#   key, rows, inserted, updated, AND deleted). IF THE JOB HAS A BASE (A PREVIOUS FULL COPY W/ THE SAME SCHEMA), ONLY
+#   ROWS INSERTED OR UPDATED SINCE THE BASE ARE COPIED, W/ EACH ROW'S KEY IN A SNAPSHOT_KEY FIELD, AND KEYS OF ROWS
+#   DELETED SINCE THE BASE ARE SAVED IN THE SNAPSHOT'S DELTA FOLDER (mode IS "delta"). OTHERWISE, THE DATA OBJECT IS
+#   COPIED W/ THE Copy TOOL (WHICH KEEPS ObjectIDs AND GlobalIDs) AND BECOMES A BASE; ITS KEYS, LATEST CHANGE DATE,
+#   AND HASHES OF ROWS CHANGED AT THAT DATE ARE SAVED IN THE SNAPSHOT'S DELTA FOLDER (mode IS "base").
+#   CHANGES ARE ROWS W/ A CHANGE DATE AT OR AFTER THE BASE'S LATEST CHANGE DATE (DATES ARE READ TO THE SECOND, SO ROWS
+#   CHANGED IN THAT SECOND AFTER THE BASE WAS READ AREN'T MISSED), EXCEPT ROWS THAT WERE IN THE BASE AT THAT DATE AND
+#   STILL HAVE THE SAME VALUES. DELTAS ARE CUMULATIVE (SINCE THE BASE, NOT SINCE THE PREVIOUS SNAPSHOT), SO A DATA
+#   OBJECT IS RECONSTRUCTED FROM ITS BASE AND ONE DELTA (SEE reconstruct_object()). ROWS CHANGED WHILE A BASE IS COPIED
+#   MAY BE COPIED AGAIN BY ITS DELTAS, WHICH DOESN'T HARM RECONSTRUCTION.
+#   SET FIRST ARGUMENT TO A PLANNED-JOB DICTIONARY (SEE plan_object()). SET SECOND ARGUMENT TO A DICTIONARY RETURNED
+#   BY get_delta_source().
+def copy_delta(the_job, the_delta):
+   the_base = None
+   if the_job["delta_base"] != None:
+      the_base = read_delta_file(the_job["delta_base"], the_job["name"])
+      if the_base != None and (the_base["mode"] != "base" or the_base["fields"] != the_delta["fields"] or the_base["key"] != the_delta["key"] or the_base["watermark"] == None or "watermark_rows" not in the_base):
+         the_base = None
+   the_hash_fields = get_hash_fields(the_job["source"], the_job["type"])
+   #KEYS OF ALL ROWS IN SOURCE
+   the_keys = set()
+   with arcpy.da.SearchCursor(the_job["source"], [the_delta["key"]]) as the_cursor:
+      for i in the_cursor:
+         the_keys.add(str(i[0]))
+   #NEW BASE (FULL COPY)
+   if the_base == None:
+      the_watermark = get_watermark(the_delta)
+      #(ROWS CHANGED AT LATEST CHANGE DATE ARE HASHED BEFORE COPYING, SO ONE CHANGED AGAIN DURING COPY ISN'T SKIPPED)
+      the_watermark_rows = {}
+      if the_watermark != None:
+         the_watermark_rows = get_watermark_rows(the_delta, the_watermark, the_job["date_style"], the_hash_fields)
+      arcpy.management.Copy(the_job["source"], the_job["target"])
+      write_delta_file(the_job["target"], {"mode": "base", "key": the_delta["key"], "fields": the_delta["fields"], "watermark": the_watermark, "watermark_rows": the_watermark_rows, "keys": sorted(the_keys)})
+      return {"mode": "base", "base": None, "key": the_delta["key"], "rows": int(arcpy.management.GetCount(the_job["target"])[0]), "inserted": 0, "updated": 0, "deleted": 0}
+   #DELTA (ROWS CHANGED AT OR AFTER BASE'S LATEST CHANGE DATE, EXCEPT UNCHANGED ROWS THAT HAD THAT DATE IN BASE)
+   create_empty_copy(the_job)
+   arcpy.management.AddField(the_job["target"], "SNAPSHOT_KEY", "TEXT", field_length = 64)
+   the_fields = []
+   for i in get_insert_fields(the_job["target"], the_job["type"]):
+      if i.upper() != "SNAPSHOT_KEY":
+         the_fields.append(i)
+   the_where = the_delta["edited"] + " >= " + get_date_sql(the_base["watermark"], the_job["date_style"])
+   if the_delta["where"] != None:
+      the_where += " AND " + the_delta["where"]
+   the_base_keys = set(the_base["keys"])
+   the_changed = set()
+   the_inserted = 0
+   the_updated = 0
+   with arcpy.da.SearchCursor(the_delta["changes"], [the_delta["key"]] + the_fields + the_hash_fields, the_where) as the_cursor:
+      with arcpy.da.InsertCursor(the_job["target"], the_fields + ["SNAPSHOT_KEY"]) as the_insert:
+         for i in the_cursor:
+            the_key = str(i[0])
+            #(SKIP ROWS DELETED SINCE, AND ANY SECOND VERSION OF A ROW)
+            if the_key not in the_keys or the_key in the_changed:
+               continue
+            #(SKIP ROWS THAT HAD BASE'S LATEST CHANGE DATE AND HAVEN'T CHANGED SINCE)
+            if the_key in the_base["watermark_rows"] and the_base["watermark_rows"][the_key] == hashlib.sha1(repr(tuple(i[1 + len(the_fields):len(i)])).encode("utf-8")).hexdigest():
+               continue
+            the_changed.add(the_key)
+            the_insert.insertRow(tuple(i[1:1 + len(the_fields)]) + (the_key,))
+            if the_key in the_base_keys:
+               the_updated += 1
+            else:
+               the_inserted += 1
+   the_deleted = sorted(the_base_keys - the_keys)
+   write_delta_file(the_job["target"], {"mode": "delta", "base": the_job["delta_base_date"], "key": the_delta["key"], "fields": the_delta["fields"], "watermark": the_base["watermark"], "deleted": the_deleted})
+   return {"mode": "delta", "base": the_job["delta_base_date"], "key": the_delta["key"], "rows": the_inserted + the_updated, "inserted": the_inserted, "updated": the_updated, "deleted": len(the_deleted)}
+
+#THIS FUNCTION RETURNS PATH OF A SNAPSHOT GEODATABASE'S DELTA FOLDER (SEE README NOTES)
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def get_delta_folder(the_gdb_path):
+   return the_gdb_path[0:len(the_gdb_path) - 4] + ".delta"
+
+#THIS FUNCTION RETURNS PATH OF THE FILE (IN A SNAPSHOT'S DELTA FOLDER) THAT HAS A DATA OBJECT'S DELTA INFO
+#   SET FIRST ARGUMENT TO FULL PATH OF THE SNAPSHOT GEODATABASE. SET SECOND ARGUMENT TO THE DATA OBJECT'S NAME
+#   (<feature dataset>\<name> OR <name>).
+def get_delta_path(the_gdb_path, the_name):
+   return os.path.join(get_delta_folder(the_gdb_path), the_name.upper().replace("\\", ".") + ".json.gz")
+
+#THIS FUNCTION SAVES A DATA OBJECT'S DELTA INFO (DICTIONARY; SEE copy_delta()) IN ITS SNAPSHOT'S DELTA FOLDER
+#   SET FIRST ARGUMENT TO THE DATA OBJECT'S PATH IN THE SNAPSHOT GEODATABASE. SET SECOND ARGUMENT TO THE DICTIONARY.
+def write_delta_file(the_target, the_entry):
+   the_gdb_path, the_name = the_target.split(".gdb\\", 1)
+   the_path = get_delta_path(the_gdb_path + ".gdb", the_name)
+   os.makedirs(os.path.dirname(the_path), exist_ok = True)
+   with gzip.open(the_path + ".tmp", "wt", encoding = "utf-8") as the_file:
+      json.dump(the_entry, the_file)
+   os.replace(the_path + ".tmp", the_path)
+
+#THIS FUNCTION RETURNS A DATA OBJECT'S DELTA INFO (DICTIONARY; SEE copy_delta()) FROM A SNAPSHOT'S DELTA FOLDER, OR
+#   None IF IT ISN'T THERE
+#   SET FIRST ARGUMENT TO FULL PATH OF THE SNAPSHOT GEODATABASE. SET SECOND ARGUMENT TO THE DATA OBJECT'S NAME.
+def read_delta_file(the_gdb_path, the_name):
+   the_path = get_delta_path(the_gdb_path, the_name)
+   if os.path.isfile(the_path) == False:
+      return None
+   with gzip.open(the_path, "rt", encoding = "utf-8") as the_file:
+      return json.load(the_file)
+
+#THIS FUNCTION RETURNS A DICTIONARY (KEYED BY UPPER-CASED OBJECT NAME) OF HOW DATA OBJECTS OF A SNAPSHOT WERE
+#   COPIED FOR DELTA SNAPSHOTS (mode AND base; SEE copy_delta()), FROM THE INDEX IN THE SNAPSHOT'S DELTA FOLDER.
+#   RETURNS AN EMPTY DICTIONARY IF THE SNAPSHOT HAS NO DELTA FOLDER.
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def read_delta_index(the_gdb_path):
+   the_path = os.path.join(get_delta_folder(the_gdb_path), "index.json")
+   if os.path.isfile(the_path) == False:
+      return {}
+   try:
+      with open(the_path, "r") as the_file:
+         return json.load(the_file)
+   except ValueError:
+      return {}
+
+#THIS FUNCTION RETURNS A DICTIONARY (KEYED BY UPPER-CASED OBJECT NAME) OF (<base snapshot path>, <YYYYMMDD>) TUPLES:
+#   THE BASE THAT EACH DATA OBJECT'S NEXT DELTA SNAPSHOT IS BASED ON. A BASE THAT'S AT LEAST delta_base_days OLD
+#   (AS OF A GIVEN DATE), OR WHOSE SNAPSHOT GEODATABASE NO LONGER EXISTS, ISN'T INCLUDED (A NEW BASE IS COPIED).
+#   SET FIRST ARGUMENT TO FULL PATH OF THE PREVIOUS SNAPSHOT GEODATABASE. SET SECOND ARGUMENT TO YYYYMMDD OF THE
+#   SNAPSHOT BEING MADE.
+def get_delta_bases(the_gdb_path, the_date):
+   the_output = {}
+   the_today = datetime.datetime.strptime(the_date, "%Y%m%d")
+   the_previous = get_snapshot_date(the_gdb_path)
+   for i, j in read_delta_index(the_gdb_path).items():
+      if j["mode"] == "base":
+         the_base = the_previous
+      else:
+         the_base = j["base"]
+      the_path = os.path.join(os.path.dirname(the_gdb_path), "SNAPSHOT_" + gdb_nickname + "_" + the_base + ".gdb")
+      if (the_today - datetime.datetime.strptime(the_base, "%Y%m%d")).days < delta_base_days and os.path.isdir(the_path) and os.path.isfile(get_journal_path(the_path)) == False:
+         the_output[i] = (the_path, the_base)
+   return the_output
+
+#THIS FUNCTION RECONSTRUCTS A DATA OBJECT AS IT WAS IN A GIVEN SNAPSHOT (EVEN IF THE SNAPSHOT HAS ONLY A DELTA OF
+#   IT) AND WRITES IT TO A GIVEN OUTPUT FEATURE CLASS OR TABLE. THE SNAPSHOT IS THE NEWEST COMPLETE SNAPSHOT OF THE
+#   GIVEN GEODATABASE NICKNAME, ON OR BEFORE THE GIVEN DATE, THAT HAS THE DATA OBJECT (SEE find_object_version()).
+#   FOR A DELTA, THE BASE IS COPIED, ROWS DELETED OR CHANGED
+#   SINCE THE BASE ARE REMOVED, AND CHANGED ROWS ARE ADDED; THE OUTPUT HAS A SNAPSHOT_KEY FIELD W/ EACH ROW'S KEY
+#   (ObjectIDs AND GlobalIDs OF CHANGED ROWS AREN'T KEPT).
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATE
+#   (YYYYMMDD). SET FOURTH ARGUMENT TO DATA OBJECT'S NAME (<feature dataset>\<name> OR <name>). SET FIFTH ARGUMENT TO
+#   PATH OF THE OUTPUT FEATURE CLASS OR TABLE (IT MUST NOT EXIST).
+def reconstruct_object(the_folder, the_nickname, the_date, the_name, the_output):
+   import_arcpy()
+   the_version = find_object_version(the_folder, the_nickname, the_date, the_name)
+   if the_version == None:
+      raise RuntimeError("There's no complete snapshot of " + the_nickname + " w/ " + the_name + " on or before " + the_date + " in " + the_folder + ".")
+   the_gdb_path = the_version["path"]
+   the_name = the_version["name"]
+   the_entry = read_delta_file(the_gdb_path, the_name)
+   if the_entry == None or the_entry["mode"] == "base":
+      arcpy.management.Copy(the_gdb_path + "\\" + the_name, the_output)
+      make_note("Copied " + the_name + " from " + the_gdb_path + " to " + the_output + ".", True)
+      return
+   the_base_path = os.path.join(the_folder, "SNAPSHOT_" + the_nickname + "_" + the_entry["base"] + ".gdb")
+   the_delta_path = the_gdb_path + "\\" + the_name
+   arcpy.management.Copy(the_base_path + "\\" + the_name, the_output)
+   arcpy.management.AddField(the_output, "SNAPSHOT_KEY", "TEXT", field_length = 64)
+   #REMOVE ROWS DELETED OR CHANGED SINCE BASE
+   the_remove = set(the_entry["deleted"])
+   with arcpy.da.SearchCursor(the_delta_path, ["SNAPSHOT_KEY"]) as the_cursor:
+      for i in the_cursor:
+         the_remove.add(i[0])
+   the_removed = 0
+   with arcpy.da.UpdateCursor(the_output, [the_entry["key"], "SNAPSHOT_KEY"]) as the_cursor:
+      for i in the_cursor:
+         if str(i[0]) in the_remove:
+            the_cursor.deleteRow()
+            the_removed += 1
+         else:
+            the_cursor.updateRow([i[0], str(i[0])])
+   #ADD CHANGED ROWS
+   the_type = "table"
+   if hasattr(arcpy.Describe(the_delta_path), "shapeType"):
+      the_type = "feature-class"
+   the_fields = get_insert_fields(the_delta_path, the_type)
+   the_added = 0
+   with arcpy.da.SearchCursor(the_delta_path, the_fields) as the_cursor:
+      with arcpy.da.InsertCursor(the_output, the_fields) as the_insert:
+         for i in the_cursor:
+            the_insert.insertRow(i)
+            the_added += 1
+   make_note("Reconstructed " + the_name + " as of " + get_snapshot_date(the_gdb_path) + " (base of " + the_entry["base"] + ", " + format(the_removed, ",") + " rows removed, " + format(the_added, ",") + " rows added) to " + the_output + ".", True)
+
+#THIS FUNCTION WRITES A DATA OBJECT, AS IT WAS ON A GIVEN DATE, TO A GIVEN WORKSPACE (SEE reconstruct_object()),
+#   UNDER ITS NAME W/O FEATURE DATASET
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATE
+#   (YYYYMMDD). SET FOURTH ARGUMENT TO DATA OBJECT'S NAME. SET FIFTH ARGUMENT TO PATH OF THE WORKSPACE (GEODATABASE OR FOLDER).
+def extract_object(the_folder, the_nickname, the_date, the_name, the_workspace):
+   import_arcpy()
+   the_output = os.path.join(the_workspace, the_name.split("\\")[-1])
+   if arcpy.Exists(the_output):
+      raise RuntimeError(the_output + " already exists.")
+   reconstruct_object(the_folder, the_nickname, read_date(the_date), the_name, the_output)
+
+#THIS FUNCTION RETURNS A DATE (YYYYMMDD) FROM A GIVEN STRING (YYYYMMDD OR YYYY-MM-DD). RAISES A RuntimeError IF IT ISN'T A DATE.
+def read_date(the_string):
+   the_date = the_string.replace("-", "")
+   try:
+      datetime.datetime.strptime(the_date, "%Y%m%d")
+   except ValueError:
+      raise RuntimeError(the_string + " isn't a date (YYYYMMDD).")
+   return the_date
+
+#THIS FUNCTION RETURNS THE HISTORY OF A DATA OBJECT IN SNAPSHOTS OF A GIVEN GEODATABASE NICKNAME, FROM THE SNAPSHOT
+#   CATALOG (INDEX; SEE README NOTES), AS A LIST OF DICTIONARIES IN DATE ORDER, ONE PER SNAPSHOT SINCE THE FIRST ONE THAT
+#   HAS THE DATA OBJECT: date, path, name (AS IN SNAPSHOT), type, rows, fingerprint, reused, delta_base, AND change
+#   ("first", "changed", "unchanged", "rows unchanged" (NO FINGERPRINTS TO TELL), "delta", OR "not in snapshot").
+#   THE CATALOG IS RECONCILED FIRST (SEE reconcile_catalog()). A DATA OBJECT NAMED W/O FEATURE DATASET ALSO MATCHES A
+#   FEATURE CLASS OF THAT NAME IN A FEATURE DATASET, IF THERE'S ONLY ONE.
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATA OBJECT'S NAME.
+def get_object_history(the_folder, the_nickname, the_name):
+   reconcile_catalog(the_folder)
+   the_prefix = "SNAPSHOT_" + the_nickname.upper() + "_"
+   the_query = "SELECT s.snapshot_date, s.snapshot_path, o.object_name, o.object_type, o.row_count, o.fingerprint, o.reused, o.delta_base FROM snapshot_objects o JOIN snapshots s ON s.snapshot_name = o.snapshot_name WHERE o.object_name = ? COLLATE NOCASE AND s.snapshot_name = ? || s.snapshot_date || '.GDB' ORDER BY s.snapshot_date"
+   the_catalog = open_catalog(the_folder)
+   the_rows = the_catalog.execute(the_query, (the_name, the_prefix)).fetchall()
+   if len(the_rows) == 0 and "\\" not in the_name:
+      the_rows = the_catalog.execute(the_query.replace("o.object_name = ? COLLATE NOCASE", "o.object_name LIKE ? ESCAPE '!'"), ("%\\" + the_name.replace("!", "!!").replace("%", "!%").replace("_", "!_"), the_prefix)).fetchall()
+      the_names = set()
+      for i in the_rows:
+         the_names.add(i[2].upper())
+      if len(the_names) > 1:
+         the_catalog.close()
+         raise RuntimeError(the_name + " is in more than one feature dataset (" + ", ".join(sorted(the_names)) + "). Name it as <feature dataset>\\<name>.")
+   the_dates = []
+   if len(the_rows) > 0:
+      for i in the_catalog.execute("SELECT snapshot_date, snapshot_path FROM snapshots WHERE snapshot_name = ? || snapshot_date || '.GDB' AND snapshot_date >= ? ORDER BY snapshot_date", (the_prefix, the_rows[0][0])):
+         the_dates.append(i)
+   the_catalog.close()
+   the_found = {}
+   for i in the_rows:
+      the_found[i[0]] = {"date": i[0], "path": i[1], "name": i[2], "type": i[3], "rows": i[4], "fingerprint": i[5], "reused": i[6] == 1, "delta_base": i[7]}
+   the_output = []
+   the_last = None
+   for i in the_dates:
+      if i[0] not in the_found:
+         the_output.append({"date": i[0], "path": i[1], "name": None, "type": None, "rows": None, "fingerprint": None, "reused": False, "delta_base": None, "change": "not in snapshot"})
+         continue
+      the_entry = the_found[i[0]]
+      if the_last == None:
+         the_entry["change"] = "first"
+      elif the_entry["delta_base"] != None:
+         the_entry["change"] = "delta"
+      elif the_entry["fingerprint"] != None and the_last["fingerprint"] != None:
+         if the_entry["fingerprint"] == the_last["fingerprint"]:
+            the_entry["change"] = "unchanged"
+         else:
+            the_entry["change"] = "changed"
+      elif the_entry["rows"] != the_last["rows"]:
+         the_entry["change"] = "changed"
+      else:
+         the_entry["change"] = "rows unchanged"
+      the_output.append(the_entry)
+      the_last = the_entry
+   return the_output
+
+#THIS FUNCTION RETURNS THE VERSION (SEE get_object_history()) OF A DATA OBJECT AS IT WAS ON A GIVEN DATE: FROM THE
+#   NEWEST SNAPSHOT, ON OR BEFORE THE DATE, THAT HAS IT (AND STILL EXISTS). RETURNS None IF THERE'S NONE.
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATE
+#   (YYYYMMDD). SET FOURTH ARGUMENT TO DATA OBJECT'S NAME.
+def find_object_version(the_folder, the_nickname, the_date, the_name):
+   the_output = None
+   for i in get_object_history(the_folder, the_nickname, the_name):
+      if i["date"] <= the_date and i["name"] != None and os.path.isdir(i["path"]):
+         the_output = i
+   return the_output
+
+#THIS FUNCTION MAKES NOTES (LOG) OF A DATA OBJECT'S HISTORY IN SNAPSHOTS (SEE get_object_history())
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATA OBJECT'S NAME.
+def show_history(the_folder, the_nickname, the_name):
+   the_history = get_object_history(the_folder, the_nickname, the_name)
+   if len(the_history) == 0:
+      make_note("No snapshot of " + the_nickname + " in " + the_folder + " has " + the_name + ".", True)
+      return
+   make_note("HISTORY OF " + the_history[0]["name"] + " IN SNAPSHOTS OF " + the_nickname + " (DATE, ROWS, FINGERPRINT, CHANGE SINCE SNAPSHOT BEFORE):", True)
+   for i in the_history:
+      the_line = "     " + i["date"] + ":  "
+      if i["name"] == None:
+         make_note(the_line + "not in snapshot", True)
+         continue
+      if i["rows"] != None:
+         the_line += format(i["rows"], ",") + " rows,  "
+      if i["fingerprint"] != None:
+         the_line += i["fingerprint"][0:12] + ",  "
+      the_line += i["change"]
+      if i["delta_base"] != None:
+         the_line += " (since base of " + i["delta_base"] + ")"
+      if i["reused"] == True:
+         the_line += " (copied from snapshot before)"
+      make_note(the_line, True)
+
+#THIS FUNCTION MAKES A NOTE (LOG) OF WHICH SNAPSHOT HAS A DATA OBJECT AS IT WAS ON A GIVEN DATE (SEE find_object_version())
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO GEODATABASE NICKNAME. SET THIRD ARGUMENT TO DATE
+#   (YYYYMMDD). SET FOURTH ARGUMENT TO DATA OBJECT'S NAME.
+def show_version(the_folder, the_nickname, the_date, the_name):
+   the_version = find_object_version(the_folder, the_nickname, read_date(the_date), the_name)
+   if the_version == None:
+      make_note("No snapshot of " + the_nickname + " in " + the_folder + " has " + the_name + " on or before " + the_date + ".", True)
+      return
+   the_line = the_version["name"] + " as of " + the_date + " is in " + the_version["path"] + " (snapshot of " + the_version["date"]
+   if the_version["rows"] != None:
+      the_line += ", " + format(the_version["rows"], ",") + " rows"
+   if the_version["delta_base"] != None:
+      the_line += ", delta since base of " + the_version["delta_base"]
+   make_note(the_line + ").", True)
+
+#THIS FUNCTION MAKES A NOTE (LOG AND EMAIL REPORT) OF A DATA OBJECT'S COPY
+#   ITS ARGUMENT IS A RESULT DICTIONARY RETURNED BY copy_object()
+def note_result(the_result):
+   make_note(the_result["note"], True, True, {"object": the_result["name"], "type": the_result["type"], "seconds": round(the_result["seconds"], 3), "rows": the_result["rows"], "reused": the_result["reused"]})
+
+#THIS FUNCTION RETURNS A PLANNED-JOB DICTIONARY FOR COPYING A DATA OBJECT TO THE SNAPSHOT GEODATABASE
+#   SET FIRST ARGUMENT TO OBJECT TYPE ("feature-class", "table", OR "raster"). SET SECOND ARGUMENT
+#   TO THE OBJECT'S SOURCE PATH (RELATIVE TO SOURCE GEODATABASE). SET THIRD ARGUMENT TO THE OBJECT'S
+#   NAME IN THE SNAPSHOT GEODATABASE (<feature dataset>\<name> OR <name>, W/O SCHEMA PREFIX).
+#   SET FOURTH ARGUMENT TO PATH OF PREVIOUS SNAPSHOT GEODATABASE (OR None). SET FIFTH ARGUMENT TO
+#   DICTIONARY OF PREVIOUS SNAPSHOT'S FINGERPRINTS (SEE read_fingerprints()). SET SIXTH ARGUMENT TO DICTIONARY
+#   OF BASES OF DELTA SNAPSHOTS (SEE get_delta_bases()). SET SEVENTH ARGUMENT TO THE OBJECT'S DESCRIBE
+#   PROPERTIES FROM THE INVENTORY (SEE discover_objects()), IF KNOWN.
+def plan_object(the_type, the_source, the_name, previous_gdb_path = None, previous_fingerprints = {}, delta_bases = {}, the_properties = None):
+   the_job = {"type": the_type, "source": the_source, "name": the_name, "target": snapshot_gdb_path + "\\" + the_name}
+   #(RASTER DATASETS ARE FINGERPRINTED BY PROPERTIES AND SAMPLED PIXELS; SEE get_raster_fingerprint())
+   the_job["incremental"] = incremental == True
+   the_job["checksum"] = fingerprint_type == "checksum"
+   the_job["throttle"] = throttle
+   #RASTER SETTINGS (SEE copy_raster())
+   the_job["raster_samples"] = raster_samples
+   the_job["raster_tile_size"] = raster_tile_size
+   the_job["raster_workers"] = raster_workers
+   the_job["raster_compression"] = raster_compression
+   the_job["raster_pyramids"] = raster_pyramids
+   the_job["tile_folder"] = snapshot_gdb_path[0:len(snapshot_gdb_path) - 4] + ".tiles"
+   #STREAMING SETTINGS (SEE stream_object())
+   the_job["stream_rows"] = stream_rows
+   the_job["stream_batch"] = stream_batch
+   the_job["fields"] = field_subsets.get(the_name.upper())
+   #DELTA SETTINGS (SEE copy_delta()); DATA OBJECTS W/ FIELD SUBSETS ARE ALWAYS COPIED IN FULL
+   the_job["delta"] = delta == True and the_type != "raster" and the_job["fields"] == None
+   #(NO NEED TO DESCRIBE IT AGAIN IF INVENTORY SAYS IT HAS NEITHER EDITOR TRACKING NOR ARCHIVING)
+   if the_properties and the_properties.get("editorTrackingEnabled") == False and the_properties.get("isArchived") == False:
+      the_job["delta"] = False
+   the_job["delta_key"] = delta_key
+   the_job["date_style"] = date_style
+   the_job["delta_base"] = None
+   the_job["delta_base_date"] = None
+   if the_name.upper() in delta_bases:
+      the_job["delta_base"], the_job["delta_base_date"] = delta_bases[the_name.upper()]
+   the_job["previous"] = None
+   the_job["previous_gdb"] = previous_gdb_path
+   the_job["previous_fingerprint"] = None
+   if previous_gdb_path and the_name.upper() in previous_fingerprints:
+      the_job["previous"] = previous_gdb_path + "\\" + the_name
+      the_job["previous_fingerprint"] = previous_fingerprints[the_name.upper()]["fingerprint"]
+   return the_job
+
+#THIS FUNCTION RETURNS THE INVENTORY OF A GEODATABASE'S DATA OBJECTS (SEE discover_objects()). W/ THE discovery_ttl
+#   OPTION, THE INVENTORY IS CACHED IN THE SNAPSHOT FOLDER (snapshot_inventory_<gdb_nickname>.json) AND REUSED UNTIL
+#   IT'S discovery_ttl MINUTES OLD OR THE GEODATABASE'S CHANGE TOKEN (SEE get_change_token()) CHANGES.
+#   ITS ARGUMENT IS THE GEODATABASE'S PATH (source_gdb)
+def get_inventory(the_workspace):
+   the_path = os.path.join(snapshot_folder, "snapshot_inventory_" + gdb_nickname + ".json")
+   the_token = get_change_token(the_workspace)
+   if discovery_ttl > 0 and os.path.isfile(the_path):
+      try:
+         with open(the_path, "r") as the_file:
+            the_cache = json.load(the_file)
+      except (OSError, ValueError):
+         the_cache = None
+      if the_cache and the_cache.get("source") == the_workspace and the_cache.get("token") == the_token and the_cache.get("describe") == discovery_describe and time.time() - the_cache.get("built", 0) < discovery_ttl * 60:
+         make_note("Reused inventory of " + str(len(the_cache["objects"])) + " data objects and feature datasets from " + the_path + " (made " + time.strftime("%Y%m%d-%H%M", time.localtime(the_cache["built"])) + ").", True, True)
+         return the_cache["objects"]
+   the_start = time.time()
+   the_objects = discover_objects(the_workspace)
+   make_note("Made inventory of " + str(len(the_objects)) + " data objects and feature datasets in " + format(time.time() - the_start, ".1f") + " seconds.", True, True)
+   if discovery_ttl > 0:
+      try:
+         write_file(the_path, json.dumps({"source": the_workspace, "token": the_token, "describe": discovery_describe, "built": time.time(), "objects": the_objects}))
+      except OSError as e:
+         make_note("Couldn't save inventory to " + the_path + ". " + str(e), True, True)
+   return the_objects
+
+#THIS FUNCTION RETURNS A LIST OF A GEODATABASE'S FEATURE DATASETS, FEATURE CLASSES, TABLES, AND RASTER DATASETS (ITS
+#   INVENTORY), MADE W/ ONE arcpy.da.Walk PER DATA TYPE INSTEAD OF A LIST REQUEST PER FEATURE DATASET. EACH ITEM IS A
+#   DICTIONARY OF:
+#      kind         "fds", "feature-class", "table", OR "raster"
+#      source       PATH RELATIVE TO THE GEODATABASE (<feature dataset>\<name> FOR A FEATURE CLASS IN A FEATURE DATASET)
+#      qualified    NAME W/ SCHEMA PREFIX
+#      name         NAME W/O SCHEMA PREFIX (SEE get_name())
+#      fds          NAME (W/O SCHEMA PREFIX) OF FEATURE DATASET THAT HAS IT, OR None
+#      properties   BASIC DESCRIBE PROPERTIES (W/ discovery_describe OPTION), OR None
+#   ITEMS ARE IN THE ORDER THAT DATA OBJECTS ARE PLANNED: EACH FEATURE DATASET FOLLOWED BY ITS FEATURE CLASSES, THEN
+#   STAND-ALONE FEATURE-CLASSES, TABLES, AND RASTER DATASETS.
+#   ITS ARGUMENT IS THE GEODATABASE'S PATH
+def discover_objects(the_workspace):
+   the_fds = []
+   the_fds_objects = {}
+   the_root_objects = []
+   for the_kind, the_type in (("feature-class", "FeatureClass"), ("table", "Table"), ("raster", "RasterDataset")):
+      for the_folder, the_folders, the_files in arcpy.da.Walk(the_workspace, datatype = the_type):
+         the_relative = the_folder[len(the_workspace):len(the_folder)].strip("\\/")
+         if the_relative == "":
+            if the_kind == "feature-class":
+               for i in the_folders:
+                  the_fds.append(i)
+                  the_fds_objects[i] = []
+            for i in the_files:
+               the_root_objects.append(make_inventory_item(the_kind, the_folder, i, None))
+         elif the_kind == "feature-class" and the_relative in the_fds_objects:
+            for i in the_files:
+               the_fds_objects[the_relative].append(make_inventory_item(the_kind, the_folder, i, the_relative))
+   the_output = []
+   for i in the_fds:
+      the_output.append({"kind": "fds", "source": i, "qualified": i, "name": get_name(i), "fds": None, "properties": None})
+      the_output.extend(the_fds_objects[i])
+   the_output.extend(the_root_objects)
+   return the_output
+
+#THIS FUNCTION RETURNS ONE ITEM (DICTIONARY) OF AN INVENTORY (SEE discover_objects())
+#   SET FIRST ARGUMENT TO KIND. SET SECOND ARGUMENT TO FULL PATH OF THE FOLDER (GEODATABASE OR FEATURE DATASET) THAT
+#   HAS IT. SET THIRD ARGUMENT TO ITS NAME (W/ SCHEMA PREFIX). SET FOURTH ARGUMENT TO NAME (W/ SCHEMA PREFIX) OF THE
+#   FEATURE DATASET THAT HAS IT, OR None.
+def make_inventory_item(the_kind, the_folder, the_name, the_fds):
+   the_item = {"kind": the_kind, "source": the_name, "qualified": the_name, "name": get_name(the_name), "fds": None, "properties": None}
+   if the_fds != None:
+      the_item["source"] = the_fds + "\\" + the_name
+      the_item["fds"] = get_name(the_fds)
+   if discovery_describe == True and the_kind != "raster":
+      the_desc = arcpy.da.Describe(os.path.join(the_folder, the_name))
+      the_item["properties"] = {}
+      for i in ("dataType", "shapeType", "editorTrackingEnabled", "isArchived", "hasGlobalID"):
+         the_item["properties"][i] = the_desc.get(i)
+   return the_item
+
+#THIS FUNCTION RETURNS A CHANGE TOKEN OF A GEODATABASE: A STRING THAT CHANGES WHEN DATA OBJECTS ARE ADDED OR DELETED
+#   (SEE get_inventory()), OR None IF THERE'S NONE
+#   FOR A FILE GEODATABASE, IT'S THE MODIFICATION TIME AND SIZE OF ITS GDB_Items TABLE (a00000004.gdbtable); FOR AN
+#   ENTERPRISE GEODATABASE, THE NUMBER AND HIGHEST ObjectID OF ROWS IN sde.GDB_ITEMS (IF THE CONNECTION CAN READ IT).
+#   ITS ARGUMENT IS THE GEODATABASE'S PATH
+def get_change_token(the_workspace):
+   the_path = os.path.join(the_workspace, "a00000004.gdbtable")
+   if os.path.isfile(the_path):
+      the_stat = os.stat(the_path)
+      return "gdb_items:" + str(the_stat.st_mtime) + ":" + str(the_stat.st_size)
+   if os.path.isdir(the_workspace):
+      return "folder:" + str(os.stat(the_workspace).st_mtime)
+   try:
+      return "gdb_items:" + str(arcpy.ArcSDESQLExecute(the_workspace).execute("SELECT COUNT(*), MAX(OBJECTID) FROM sde.GDB_ITEMS"))
+   except Exception:
+      return None
+
+#THIS FUNCTION RETURNS PATH OF A SNAPSHOT GEODATABASE'S FINGERPRINT FILE
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def get_fingerprint_path(the_gdb_path):
+   return the_gdb_path[0:len(the_gdb_path) - 4] + ".fingerprints.json"
+
+#THIS FUNCTION RETURNS PATH OF A SNAPSHOT GEODATABASE'S JOURNAL (SEE README NOTES)
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def get_journal_path(the_gdb_path):
+   return the_gdb_path[0:len(the_gdb_path) - 4] + ".journal"
+
+#THIS FUNCTION RETURNS A SORTED LIST OF FULL PATHS OF A SOURCE GEODATABASE'S INCOMPLETE SNAPSHOTS (ONES W/ A JOURNAL)
+#   IN A GIVEN SNAPSHOT FOLDER. AN INCOMPLETE SNAPSHOT'S GEODATABASE MAY BE MISSING OR PARTIAL (THE JOURNAL IS
+#   WRITTEN BEFORE THE GEODATABASE IS CREATED).
+#   SET FIRST ARGUMENT TO SNAPSHOT FOLDER. SET SECOND ARGUMENT TO SOURCE GEODATABASE'S NICKNAME.
+def list_incomplete_snapshots(the_folder, the_nickname):
+   the_output = []
+   with os.scandir(the_folder) as the_entries:
+      for i in the_entries:
+         if i.is_file() and i.name.upper().startswith("SNAPSHOT_" + the_nickname.upper() + "_") and i.name.lower().endswith(".journal"):
+            the_path = os.path.join(the_folder, i.name[0:len(i.name) - 8] + ".gdb")
+            if get_snapshot_date(the_path):
+               the_output.append(the_path)
+   the_output.sort()
+   return the_output
+
+#THIS FUNCTION RETURNS True IF A GIVEN PATH IS A (COMPLETELY CREATED) FILE GEODATABASE, OTHERWISE False
+#   (A FILE GEODATABASE'S FOLDER HOLDS A FILE NAMED gdb, WRITTEN WHEN THE GEODATABASE IS CREATED)
+def is_file_gdb(the_gdb_path):
+   if os.path.isfile(os.path.join(the_gdb_path, "gdb")) == False or arcpy.Exists(the_gdb_path) == False:
+      return False
+   try:
+      return arcpy.Describe(the_gdb_path).workspaceType == "LocalDatabase"
+   except Exception:
+      return False
+
+#THIS FUNCTION ADDS AN ENTRY (DICTIONARY) TO A SNAPSHOT GEODATABASE'S JOURNAL, AS ONE JSON LINE. THE LINE IS
+#   FLUSHED TO DISK BEFORE THIS FUNCTION RETURNS, SO IT SURVIVES THE SCRIPT FAILING RIGHT AFTER.
+#   ENTRIES ARE {"started": <time>}, {"planned": [<object name>, ...]}, OR {"completed": <result dictionary from copy_object()>}
+#   SET FIRST ARGUMENT TO FULL PATH OF THE SNAPSHOT GEODATABASE. SET SECOND ARGUMENT TO THE ENTRY.
+def write_journal(the_gdb_path, the_entry):
+   with open(get_journal_path(the_gdb_path), "a") as the_file:
+      the_file.write(json.dumps(the_entry) + "\n")
+      the_file.flush()
+      os.fsync(the_file.fileno())
+
+#THIS FUNCTION RETURNS A DICTIONARY OF RESULTS OF DATA OBJECTS THAT A SNAPSHOT GEODATABASE'S JOURNAL LISTS AS
+#   COPIED, KEYED BY UPPER-CASED OBJECT NAME. A LAST LINE THAT WAS CUT OFF (BY A FAILURE WHILE IT WAS WRITTEN)
+#   IS IGNORED. RETURNS AN EMPTY DICTIONARY IF THE SNAPSHOT HAS NO JOURNAL.
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def read_journal(the_gdb_path):
+   the_output = {}
+   if os.path.isfile(get_journal_path(the_gdb_path)) == False:
+      return the_output
+   with open(get_journal_path(the_gdb_path), "r") as the_file:
+      for i in the_file:
+         try:
+            the_entry = json.loads(i)
+         except ValueError:
+            continue
+         if "completed" in the_entry:
+            the_output[the_entry["completed"]["name"].upper()] = the_entry["completed"]
+   return the_output
+
+#THIS FUNCTION CHECKS PLANNED DATA-OBJECTS AGAINST RESULTS FROM A JOURNAL (SEE read_journal()) WHEN AN INCOMPLETE
+#   SNAPSHOT IS RESUMED. A DATA OBJECT THAT THE JOURNAL LISTS AS COPIED IS KEPT IF IT EXISTS IN THE SNAPSHOT
+#   GEODATABASE W/ THE RECORDED NUMBER OF ROWS. OTHERWISE, ANY (PARTIAL) COPY OF IT IS DELETED SO IT CAN BE COPIED AGAIN.
+#   RETURNS A TUPLE OF (<list of planned jobs still to be copied>, <dictionary of kept results, keyed by object name>)
+#   SET FIRST ARGUMENT TO LIST OF PLANNED-JOB DICTIONARIES (SEE plan_object()). SET SECOND ARGUMENT TO THE JOURNAL'S RESULTS.
+def check_journal(the_plan, the_completed):
+   the_remaining = []
+   the_kept = {}
+   for i in the_plan:
+      the_result = the_completed.get(i["name"].upper())
+      if the_result != None and arcpy.Exists(i["target"]):
+         if i["type"] == "raster" or the_result["rows"] == None or int(arcpy.management.GetCount(i["target"])[0]) == the_result["rows"]:
+            the_kept[i["name"]] = the_result
+            make_note("Kept " + i["type"] + " " + i["source"] + ", which was copied before snapshot was interrupted.", True, True)
+            continue
+      if arcpy.Exists(i["target"]):
+         arcpy.management.Delete(i["target"])
+         make_note("Deleted partial copy of " + i["type"] + " " + i["source"] + ".", True, True)
+      the_remaining.append(i)
+   return (the_remaining, the_kept)
+
+#THIS FUNCTION RETURNS A DICTIONARY OF FINGERPRINTS THAT WERE SAVED W/ A SNAPSHOT GEODATABASE, KEYED
+#   BY UPPER-CASED OBJECT NAME. RETURNS AN EMPTY DICTIONARY IF THE SNAPSHOT HAS NO FINGERPRINT FILE.
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def read_fingerprints(the_gdb_path):
+   the_path = get_fingerprint_path(the_gdb_path)
+   if os.path.isfile(the_path) == False:
+      return {}
+   with open(the_path, "r") as the_file:
+      the_fingerprints = json.load(the_file)
+   the_output = {}
+   for i in the_fingerprints:
+      the_output[i.upper()] = the_fingerprints[i]
+   return the_output
+
+#THIS FUNCTION RETURNS THE EXACT SIZE OF A GIVEN FILE-GEODATABASE AS A TUPLE OF (<bytes>, <number of files>)
+#   THE GEODATABASE'S FOLDER (AND ANY SUBFOLDERS) IS WALKED ONCE W/ os.scandir(), WHOSE ENTRIES CARRY FILE
+#   SIZES W/O AN EXTRA CALL PER FILE ON WINDOWS
 #   ITS ARGUMENT IS FULL PATH OF THE FILE GEODATABASE
 def get_gdb_size(the_path):
-   file_list = os.listdir(the_path)
-   total_mb = 0
-   for i in file_list:
-      total_mb = total_mb + ((os.path.getsize(os.path.join(the_path, i)) / 1000) / 1000)
-   return total_mb
-
-try:
-   #GET CURRENT DATE, TO BE CONSIDERED TO BE CURRENT DATE THROUGHOUT SCRIPT EXECUTION
-   t = time.localtime()
-
-   #VERIFY THAT SOURCE GEODATABASE EXISTS
-   if arcpy.Exists(source_gdb) == False:
-      make_note("Couldn't connect to source geodatabase " + source_gdb + ". Script terminated.", True, True)
-      sys.exit()
-
-   #VERIFY THAT SNAPSHOT FOLDER EXISTS
-   if arcpy.Exists(snapshot_folder) == False:
-      make_note("Snapshot folder " + snapshot_folder + " doesn't exist. Script terminated.", True, True)
-      sys.exit()
-
-   #CAPTURE TODAY'S DAY AND 8-CHARACTER DATE-REPRESENTATION
-   y2 = t.tm_year
-   m2 = t.tm_mon
-   d2 = t.tm_mday
-   n2 = t.tm_yday
-   today8 = str(y2)
-   the_string = str(m2)
-   while len(the_string) < 2:
-      the_string = "0" + the_string
-   today8 += the_string
-   the_string = str(d2)
-   while len(the_string) < 2:
-      the_string = "0" + the_string
-   today8 += the_string
-   make_note("Today is day " + str(n2) + " of the year.", True)
-   make_note("Today's date--in YYYYMMDD pattern--is " + today8, True)
-
-   #GET LIST OF SNAPSHOTS IN SNAPSHOT FOLDER, W/ PATTERN YYYYMMDD,<full snapshot name>,<.gdb size, in MB>
-   arcpy.env.workspace = snapshot_folder
-   the_list = arcpy.ListWorkspaces("*", "FileGDB")
-   snapshots = []
-   for i in the_list:
-      j = i.upper()
-      the_date = j[len(j) - 12:len(j) - 4]
+   the_bytes = 0
+   the_files = 0
+   the_folders = [the_path]
+   while len(the_folders) > 0:
+      with os.scandir(the_folders.pop()) as the_entries:
+         for i in the_entries:
+            if i.is_dir(follow_symlinks = False):
+               the_folders.append(i.path)
+            else:
+               the_bytes += i.stat(follow_symlinks = False).st_size
+               the_files += 1
+   return (the_bytes, the_files)
+
+#THIS FUNCTION RETURNS SIZES OF GIVEN FILE-GEODATABASES AS A DICTIONARY OF <path>: (<bytes>, <number of files>)
+#   SET FIRST ARGUMENT TO A LIST OF FULL PATHS OF THE FILE GEODATABASES. SET SECOND ARGUMENT TO FOLDER IN
+#   WHICH THE SIZE CACHE (snapshot_sizes.json) IS KEPT, OR None TO MEASURE EVERY GEODATABASE. SET THIRD
+#   ARGUMENT TO NUMBER OF THREADS THAT MEASURE GEODATABASES AT THE SAME TIME.
+#   A CACHED SIZE IS REUSED WHILE ITS GEODATABASE FOLDER'S MODIFICATION TIME IS UNCHANGED.
+def get_gdb_sizes(the_paths, the_cache_folder = None, the_threads = 1):
+   the_cache = {}
+   if the_cache_folder:
       try:
-         x = int(the_date)
-         gdb_size = str(get_gdb_size(os.path.join(arcpy.env.workspace,i)))
-         snapshots.append(the_date + "," + j + "," + gdb_size)
-         make_note("Found snapshot from " + the_date + " (" + i + ").", True, True)
-      except:
-         make_note("Geodatabase " + i + " isn't named according to how this script names snapshots. Excluding it from list of pre-exising snapshots.", True, True)
-   snapshots.sort()
-   snapshots.reverse()
-
-   #MAKE SURE SNAPSHOT W/ TODAY'S DATE DOESN'T ALREADY EXIST
-   for i in snapshots:
-      if i[0:8] == today8:
-         make_note("A snapshot (" + i[9:i.rfind(",")] + ") w/ today's date already exists. Script terminated.", True, True)
-         sys.exit()
+         with open(os.path.join(the_cache_folder, "snapshot_sizes.json"), "r") as the_file:
+            the_cache = json.load(the_file)
+      except (OSError, ValueError):
+         the_cache = {}
+   the_output = {}
+   the_mtimes = {}
+   to_measure = []
+   for i in the_paths:
+      the_key = os.path.normcase(os.path.abspath(i))
+      the_mtimes[i] = os.stat(i).st_mtime_ns
+      if the_key in the_cache and the_cache[the_key]["mtime"] == the_mtimes[i]:
+         the_output[i] = (the_cache[the_key]["bytes"], the_cache[the_key]["files"])
+      else:
+         to_measure.append(i)
+   if the_threads > 1 and len(to_measure) > 1:
+      with concurrent.futures.ThreadPoolExecutor(min(the_threads, len(to_measure))) as the_pool:
+         for i, j in zip(to_measure, the_pool.map(get_gdb_size, to_measure)):
+            the_output[i] = j
+   else:
+      for i in to_measure:
+         the_output[i] = get_gdb_size(i)
+   #UPDATE CACHE (AND DROP GEODATABASES THAT NO LONGER EXIST)
+   if the_cache_folder and len(to_measure) > 0:
+      for i in list(the_cache):
+         if os.path.isdir(i) == False:
+            del the_cache[i]
+      for i in to_measure:
+         the_cache[os.path.normcase(os.path.abspath(i))] = {"mtime": the_mtimes[i], "bytes": the_output[i][0], "files": the_output[i][1]}
+      with open(os.path.join(the_cache_folder, "snapshot_sizes.json.tmp"), "w") as the_file:
+         json.dump(the_cache, the_file)
+      os.replace(os.path.join(the_cache_folder, "snapshot_sizes.json.tmp"), os.path.join(the_cache_folder, "snapshot_sizes.json"))
+   return the_output
 
-   #GET DAY OF LAST SNAPSHOT (PER SNAPSHOTS IN SNAPSHOT FOLDER)
-   if len(snapshots) > 0:
-      latest8 = snapshots[0][0:8]
-      make_note("Day of last snapshot (per snapshot-folder contents) is " + latest8 + ".", True, True)
+#THIS FUNCTION RETURNS A GIVEN NUMBER OF BYTES AS PRESENTABLE TEXT
+#   FOR EXAMPLE:
+#      1,234,567,890 bytes (1177.4 MiB)
+def format_size(the_bytes):
+   return "{:,}".format(the_bytes) + " bytes (" + str(round(the_bytes / 1048576, 1)) + " MiB)"
+
+#THIS FUNCTION READS A VARIABLE-LENGTH UNSIGNED INTEGER (7 BITS PER BYTE, LEAST SIGNIFICANT FIRST) FROM
+#   GIVEN BYTES AT A GIVEN POSITION AND RETURNS A TUPLE OF (<integer>, <position after integer>)
+def read_varuint(the_bytes, the_pos):
+   the_value = 0
+   the_shift = 0
+   while True:
+      the_byte = the_bytes[the_pos]
+      the_pos += 1
+      the_value = the_value | ((the_byte & 0x7F) << the_shift)
+      the_shift += 7
+      if the_byte & 0x80 == 0:
+         return (the_value, the_pos)
+
+#THIS FUNCTION RETURNS A DICTIONARY OF <table number>: <table name> FOR A GIVEN FILE-GEODATABASE, READ FROM
+#   ITS SYSTEM CATALOG (GDB_SystemCatalog, STORED IN a00000001.gdbtable). A TABLE'S FILES ARE NAMED
+#   a<table number, as 8 hex digits>.*
+#   ONLY THE FILE-GEODATABASE 10.x TABLE FORMAT IS READ. AN EMPTY DICTIONARY IS RETURNED FOR OTHER FORMATS.
+#   ITS ARGUMENT IS FULL PATH OF THE FILE GEODATABASE
+def read_gdb_table_names(the_gdb_path):
+   the_output = {}
+   with open(os.path.join(the_gdb_path, "a00000001.gdbtablx"), "rb") as the_file:
+      the_tablx = the_file.read()
+   with open(os.path.join(the_gdb_path, "a00000001.gdbtable"), "rb") as the_file:
+      the_table = the_file.read()
+   #.gdbtablx HEADER: MAGIC, 1024-ROW BLOCKS, ROWS, SIZE OF EACH ROW OFFSET (IN BYTES)
+   the_blocks, the_rows, the_offset_size = struct.unpack("<3i", the_tablx[4:16])
+   if struct.unpack("<i", the_table[0:4])[0] != 3 or the_blocks * 1024 < the_rows:
+      return the_output
+   #FIELD DESCRIPTIONS: HEADER SIZE, VERSION, FLAGS, NUMBER OF FIELDS, THEN ONE DESCRIPTION PER FIELD
+   the_pos = struct.unpack("<Q", the_table[32:40])[0] + 12
+   the_count = struct.unpack("<H", the_table[the_pos:the_pos + 2])[0]
+   the_pos += 2
+   the_fields = []
+   for i in range(the_count):
+      the_name = the_table[the_pos + 1:the_pos + 1 + 2 * the_table[the_pos]].decode("utf-16-le").upper()
+      the_pos += 1 + 2 * the_table[the_pos]
+      the_pos += 1 + 2 * the_table[the_pos]
+      the_type = the_table[the_pos]
+      the_pos += 1
+      #(STRING)
+      if the_type == 4:
+         the_flag = the_table[the_pos + 4]
+         the_length, the_pos = read_varuint(the_table, the_pos + 5)
+         the_pos += the_length
+      #(NUMBERS AND DATES)
+      elif the_type in (0, 1, 2, 3, 5, 13, 14, 15, 16):
+         the_flag = the_table[the_pos + 1]
+         the_pos += 3 + the_table[the_pos + 2]
+      #(OBJECTID, BINARY, GUID, GLOBALID, XML)
+      elif the_type in (6, 8, 10, 11, 12):
+         the_flag = the_table[the_pos + 1]
+         the_pos += 2
+      else:
+         return the_output
+      the_fields.append((the_name, the_type, the_flag & 1))
+   the_nullables = 0
+   for i in the_fields:
+      the_nullables += i[2]
+   #ROWS: SIZE, NULL FLAGS, THEN VALUES OF NON-NULL FIELDS (OBJECTID ISN'T STORED)
+   for i in range(the_rows):
+      the_offset = int.from_bytes(the_tablx[16 + i * the_offset_size:16 + (i + 1) * the_offset_size], "little")
+      if the_offset == 0:
+         continue
+      the_pos = the_offset + 4
+      the_flags = the_table[the_pos:the_pos + (the_nullables + 7) // 8]
+      the_pos += len(the_flags)
+      k = 0
+      for the_name, the_type, the_nullable in the_fields:
+         if the_type == 6:
+            continue
+         if the_nullable == 1:
+            k += 1
+            if (the_flags[(k - 1) >> 3] >> ((k - 1) & 7)) & 1 == 1:
+               continue
+         if the_type == 4:
+            the_length, the_pos = read_varuint(the_table, the_pos)
+            the_value = the_table[the_pos:the_pos + the_length].decode("utf-8")
+            the_pos += the_length
+         elif the_type == 1:
+            the_value = struct.unpack("<i", the_table[the_pos:the_pos + 4])[0]
+            the_pos += 4
+         else:
+            break
+         if the_name == "NAME":
+            the_output[i + 1] = the_value
+   return the_output
+
+#THIS FUNCTION RETURNS SIZES OF DATA OBJECTS IN A GIVEN FILE-GEODATABASE AS A TUPLE OF (<list of (<object name>,
+#   <bytes>, <number of files>) tuples, largest first>, <True if files were matched to data objects, otherwise False>)
+#   FILES ARE MATCHED TO DATA OBJECTS VIA THE GEODATABASE'S SYSTEM CATALOG (SEE read_gdb_table_names()). THE
+#   SYSTEM CATALOG IS ONLY TRUSTED IF IT NAMES EVERY FEATURE CLASS AND TABLE THAT arcpy FINDS IN THE GEODATABASE (IF
+#   arcpy IS IMPORTED). A RASTER DATASET'S TABLES (fras_<part>_<name>) ARE COUNTED W/ THE RASTER DATASET.
+#   GEODATABASE SYSTEM TABLES ARE COUNTED TOGETHER. IF THE SYSTEM CATALOG CAN'T BE READ (OR ISN'T TRUSTED), FILES
+#   ARE GROUPED BY FILE NAME W/O EXTENSION.
+#   ITS ARGUMENT IS FULL PATH OF THE FILE GEODATABASE
+def get_object_sizes(the_gdb_path):
+   try:
+      the_names = read_gdb_table_names(the_gdb_path)
+   except (OSError, ValueError, IndexError, struct.error):
+      the_names = {}
+   if len(the_names) > 0 and arcpy != None:
+      the_found = set()
+      for i in the_names.values():
+         the_found.add(i.upper())
+      for the_name, the_type in list_snapshot_objects(the_gdb_path):
+         if the_type != "raster" and the_name.split("\\")[-1].upper() not in the_found:
+            the_names = {}
+            break
+   the_sizes = {}
+   with os.scandir(the_gdb_path) as the_entries:
+      for i in the_entries:
+         if i.is_dir(follow_symlinks = False):
+            continue
+         the_name = i.name[0:i.name.find(".")] if i.name.find(".") > -1 else i.name
+         if len(the_name) == 9 and the_name[0] == "a" and len(the_names) > 0:
+            try:
+               the_name = the_names.get(int(the_name[1:9], 16), the_name)
+            except ValueError:
+               pass
+            if the_name.upper().startswith("GDB_"):
+               the_name = "(geodatabase system tables)"
+            elif the_name.upper().startswith("FRAS_") and the_name.find("_", 5) > -1:
+               the_name = the_name[the_name.find("_", 5) + 1:len(the_name)]
+         elif len(the_names) > 0:
+            the_name = "(geodatabase system tables)"
+         if the_name not in the_sizes:
+            the_sizes[the_name] = [0, 0]
+         the_sizes[the_name][0] += i.stat(follow_symlinks = False).st_size
+         the_sizes[the_name][1] += 1
+   the_output = []
+   for i in the_sizes:
+      the_output.append((i, the_sizes[i][0], the_sizes[i][1]))
+   the_output.sort(key = lambda x: x[1], reverse = True)
+   return (the_output, len(the_names) > 0)
+
+#THIS FUNCTION RETURNS THE 8-CHARACTER DATE (YYYYMMDD) AT THE END OF A GIVEN SNAPSHOT-GEODATABASE NAME
+#   OR PATH (<name>_YYYYMMDD.gdb). RETURNS None IF THE NAME ISN'T NAMED THE WAY THIS SCRIPT NAMES SNAPSHOTS.
+def get_snapshot_date(the_path):
+   j = the_path.upper()
+   the_date = j[len(j) - 12:len(j) - 4]
+   try:
+      x = int(the_date)
+   except:
+      return None
+   return the_date
+
+#THIS FUNCTION OPENS THE SNAPSHOT CATALOG OF A GIVEN SNAPSHOT FOLDER AND RETURNS A sqlite3 CONNECTION
+#   TO IT. THE CATALOG'S TABLES ARE CREATED IF THEY DON'T EXIST.
+#   TABLE snapshots HAS ONE ROW PER SNAPSHOT GEODATABASE. TABLE snapshot_objects HAS ONE ROW PER DATA
+#   OBJECT IN A SNAPSHOT GEODATABASE. BOTH ARE KEYED BY UPPER-CASED SNAPSHOT-GEODATABASE NAME.
+def open_catalog(the_folder):
+   the_catalog = sqlite3.connect(os.path.join(the_folder, "snapshot_catalog.sqlite"))
+   the_catalog.execute("CREATE TABLE IF NOT EXISTS snapshots (snapshot_name TEXT PRIMARY KEY, snapshot_date TEXT NOT NULL, snapshot_path TEXT NOT NULL, size_bytes INTEGER, file_count INTEGER, created TEXT, duration_seconds REAL)")
+   the_catalog.execute("CREATE TABLE IF NOT EXISTS snapshot_objects (snapshot_name TEXT NOT NULL, object_name TEXT NOT NULL, object_type TEXT, row_count INTEGER, duration_seconds REAL, reused INTEGER, fingerprint TEXT, delta_base TEXT, PRIMARY KEY (snapshot_name, object_name))")
+   the_catalog.execute("CREATE INDEX IF NOT EXISTS snapshot_objects_by_name ON snapshot_objects (object_name COLLATE NOCASE, snapshot_name)")
+   return the_catalog
+
+#THIS FUNCTION RETURNS A LIST OF (<object name>, <object type>) TUPLES OF DATA OBJECTS IN A GIVEN SNAPSHOT
+#   GEODATABASE. OBJECT NAMES ARE <feature dataset>\<name> OR <name>, AS NAMED IN plan_object().
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def list_snapshot_objects(the_gdb_path):
+   the_output = []
+   for the_type, the_datatype in (("feature-class", "FeatureClass"), ("table", "Table"), ("raster", "RasterDataset")):
+      for the_dir, the_dirs, the_files in arcpy.da.Walk(the_gdb_path, datatype = the_datatype):
+         for i in the_files:
+            if os.path.normcase(os.path.normpath(the_dir)) == os.path.normcase(os.path.normpath(the_gdb_path)):
+               the_output.append((i, the_type))
+            else:
+               the_output.append((os.path.basename(the_dir) + "\\" + i, the_type))
+   return the_output
+
+#THIS FUNCTION RECORDS A SNAPSHOT GEODATABASE AND ITS DATA OBJECTS IN THE SNAPSHOT CATALOG
+#   SET FIRST ARGUMENT TO THE SNAPSHOT FOLDER. SET SECOND ARGUMENT TO THE SNAPSHOT'S 8-CHARACTER DATE.
+#   SET THIRD ARGUMENT TO FULL PATH OF THE SNAPSHOT GEODATABASE. SET FOURTH ARGUMENT TO ITS SIZE, AS A TUPLE
+#   OF (<bytes>, <number of files>) (SEE get_gdb_size()).
+#   SET FIFTH ARGUMENT TO NUMBER OF SECONDS TAKEN TO MAKE THE SNAPSHOT (OR None). SET SIXTH ARGUMENT TO
+#   A LIST OF RESULTS RETURNED BY copy_object() (OR DICTIONARIES W/ THE SAME KEYS).
+#   CREATION TIME IS ONLY RECORDED FOR SNAPSHOTS MADE BY THIS RUN (WHEN NUMBER OF SECONDS ISN'T None).
+#   FOR A DELTA, THE DATE (YYYYMMDD) OF ITS BASE IS RECORDED AS delta_base.
+def record_snapshot(the_folder, the_date, the_gdb_path, the_size, the_seconds, the_results):
+   the_name = os.path.basename(the_gdb_path).upper()
+   the_created = None
+   if the_seconds != None:
+      the_created = tell_the_time()
+   the_catalog = open_catalog(the_folder)
+   with the_catalog:
+      the_catalog.execute("DELETE FROM snapshot_objects WHERE snapshot_name = ?", (the_name,))
+      the_catalog.execute("INSERT OR REPLACE INTO snapshots (snapshot_name, snapshot_date, snapshot_path, size_bytes, file_count, created, duration_seconds) VALUES (?, ?, ?, ?, ?, ?, ?)", (the_name, the_date, the_gdb_path, the_size[0], the_size[1], the_created, the_seconds))
+      for i in the_results:
+         the_base = None
+         if i.get("delta") and i["delta"]["mode"] == "delta":
+            the_base = i["delta"]["base"]
+         the_catalog.execute("INSERT OR REPLACE INTO snapshot_objects (snapshot_name, object_name, object_type, row_count, duration_seconds, reused, fingerprint, delta_base) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (the_name, i["name"], i["type"], i.get("rows"), i.get("seconds"), int(i.get("reused", False)), i.get("fingerprint"), the_base))
+   the_catalog.close()
+
+#THIS FUNCTION REMOVES A SNAPSHOT GEODATABASE AND ITS DATA OBJECTS FROM THE SNAPSHOT CATALOG
+#   SET FIRST ARGUMENT TO THE SNAPSHOT FOLDER. SET SECOND ARGUMENT TO THE UPPER-CASED SNAPSHOT-GEODATABASE NAME.
+def forget_snapshot(the_folder, the_name):
+   the_catalog = open_catalog(the_folder)
+   with the_catalog:
+      the_catalog.execute("DELETE FROM snapshot_objects WHERE snapshot_name = ?", (the_name,))
+      the_catalog.execute("DELETE FROM snapshots WHERE snapshot_name = ?", (the_name,))
+   the_catalog.close()
+
+#THIS FUNCTION REBUILDS THE SNAPSHOT CATALOG OF A GIVEN SNAPSHOT FOLDER FROM THE FOLDER'S CONTENTS
+#   SNAPSHOT GEODATABASES THAT NO LONGER EXIST ARE REMOVED FROM THE CATALOG. SNAPSHOT GEODATABASES THAT
+#   AREN'T IN THE CATALOG ARE ADDED TO IT (W/ ROW COUNTS FROM THEIR FINGERPRINT FILES, IF ANY, OR COUNTED).
+def reconcile_catalog(the_folder):
+   make_note("Reconciling snapshot catalog w/ contents of snapshot folder " + the_folder + ".", True)
+   on_disk = {}
+   for i in list_file_gdbs(the_folder):
+      if get_snapshot_date(i) and os.path.isfile(get_journal_path(i)) == False:
+         on_disk[os.path.basename(i).upper()] = i
+   the_catalog = open_catalog(the_folder)
+   in_catalog = []
+   for i in the_catalog.execute("SELECT snapshot_name FROM snapshots"):
+      in_catalog.append(i[0])
+   the_catalog.close()
+   #REMOVE SNAPSHOTS THAT NO LONGER EXIST
+   for i in in_catalog:
+      if i not in on_disk:
+         forget_snapshot(the_folder, i)
+         make_note("Removed snapshot " + i + " from snapshot catalog (no longer in snapshot folder).", True)
+   #ADD SNAPSHOTS THAT AREN'T IN CATALOG
+   for i in sorted(on_disk):
+      if i not in in_catalog:
+         import_arcpy()
+         the_fingerprints = read_fingerprints(on_disk[i])
+         the_deltas = read_delta_index(on_disk[i])
+         the_results = []
+         for j in list_snapshot_objects(on_disk[i]):
+            the_result = {"name": j[0], "type": j[1], "rows": None, "delta": the_deltas.get(j[0].upper())}
+            if j[0].upper() in the_fingerprints:
+               the_result["rows"] = the_fingerprints[j[0].upper()]["rows"]
+               the_result["fingerprint"] = the_fingerprints[j[0].upper()]["fingerprint"]
+            elif j[1] != "raster":
+               the_result["rows"] = int(arcpy.management.GetCount(os.path.join(on_disk[i], j[0]))[0])
+            the_results.append(the_result)
+         record_snapshot(the_folder, get_snapshot_date(i), on_disk[i], get_gdb_size(on_disk[i]), None, the_results)
+         make_note("Added snapshot " + i + " to snapshot catalog (" + str(len(the_results)) + " data objects).", True)
+   make_note("Snapshot catalog reconciled. It lists " + str(len(on_disk)) + " snapshots.", True)
+
+#THIS FUNCTION RETURNS A LIST OF SNAPSHOTS IN THE SNAPSHOT CATALOG OF A GIVEN SNAPSHOT FOLDER, AS
+#   (<YYYYMMDD>, <full snapshot path>, <bytes>, <number of files>) TUPLES (SAME AS snapshots LIST IN take_snapshot())
+#   IF THE CATALOG DOESN'T EXIST YET, IT'S BUILT FROM THE FOLDER'S CONTENTS FIRST. SNAPSHOTS THAT NO LONGER
+#   EXIST (E.G., DELETED BY HAND) ARE REMOVED FROM THE CATALOG (AS IN reconcile_catalog()).
+def read_catalog(the_folder):
+   if os.path.isfile(os.path.join(the_folder, "snapshot_catalog.sqlite")) == False:
+      reconcile_catalog(the_folder)
+   the_output = []
+   the_missing = []
+   the_catalog = open_catalog(the_folder)
+   for i in the_catalog.execute("SELECT snapshot_date, snapshot_path, size_bytes, file_count, snapshot_name FROM snapshots"):
+      if os.path.isdir(i[1]):
+         the_output.append(i[0:4])
+      else:
+         the_missing.append(i[4])
+   #REMOVE SNAPSHOTS THAT NO LONGER EXIST
+   for i in the_missing:
+      forget_snapshot(the_folder, i)
+      make_note("Removed snapshot " + i + " from snapshot catalog (no longer in snapshot folder).", True)
+   the_catalog.close()
+   return the_output
+
+#THIS FUNCTION RETURNS WHY EACH OF A GIVEN LIST OF SNAPSHOTS IS KEPT BY THE RETENTION POLICY (SEE README NOTES),
+#   AS A DICTIONARY OF <full snapshot path>: <list of reasons>. A SNAPSHOT W/ AN EMPTY LIST ISN'T KEPT.
+#   IT USES MAJOR VARIABLES SET BY read_arguments()
+#   SET ARGUMENT TO LIST OF ONE SOURCE GEODATABASE'S SNAPSHOTS, AS (<YYYYMMDD>, <full snapshot path>, <bytes>,
+#   <number of files>) TUPLES, NEWEST FIRST.
+def get_retention(the_snapshots):
+   the_reasons = {}
+   for i in the_snapshots:
+      the_reasons[i[1]] = []
+   if len(the_snapshots) == 0:
+      return the_reasons
+   #RULES: NEWEST SNAPSHOT OF EACH OF THE NEWEST N DAYS, WEEKS, MONTHS, AND YEARS THAT HAVE SNAPSHOTS
+   #(W/ NO RULES, ALL SNAPSHOTS ARE KEPT UNTIL SIZE CAP)
+   the_rules = (("daily", retain_daily, lambda x: x), ("weekly", retain_weekly, lambda x: datetime.date(int(x[0:4]), int(x[4:6]), int(x[6:8])).isocalendar()[0:2]), ("monthly", retain_monthly, lambda x: x[0:6]), ("yearly", retain_yearly, lambda x: x[0:4]))
+   the_ruled = False
+   for the_rule, the_count, the_period in the_rules:
+      if the_count <= 0:
+         continue
+      the_ruled = True
+      the_periods = []
+      for i in the_snapshots:
+         the_key = the_period(i[0])
+         if the_key in the_periods:
+            continue
+         if len(the_periods) == the_count:
+            break
+         the_periods.append(the_key)
+         the_reasons[i[1]].append(the_rule)
+   if the_ruled == False:
+      for i in the_snapshots:
+         the_reasons[i[1]].append("no rules")
+   the_reasons[the_snapshots[0][1]].insert(0, "newest")
+   #SIZE CAP: DROP OLDEST KEPT SNAPSHOTS UNTIL KEPT SNAPSHOTS FIT (THE NEWEST SNAPSHOT IS ALWAYS KEPT)
+   if retain_max_gb > 0:
+      the_total = 0
+      the_full = False
+      for i in the_snapshots:
+         if len(the_reasons[i[1]]) == 0:
+            continue
+         if i[1] != the_snapshots[0][1] and (the_full == True or the_total + (i[2] or 0) > retain_max_gb * 1024 ** 3):
+            the_full = True
+            the_reasons[i[1]] = []
+            continue
+         the_total += i[2] or 0
+   #BASES OF DELTAS IN KEPT SNAPSHOTS ARE KEPT (DELTAS CAN'T BE RECONSTRUCTED W/O THEM)
+   add_base_reasons(the_snapshots, the_reasons)
+   return the_reasons
+
+#THIS FUNCTION ADDS A "base of deltas in <YYYYMMDD>" REASON TO EACH SNAPSHOT THAT'S THE BASE OF DELTAS IN A SNAPSHOT
+#   THAT HAS REASONS (IS KEPT; SEE get_retention()). SNAPSHOTS ARE GONE THROUGH NEWEST FIRST, SO A BASE'S SNAPSHOT
+#   THAT'S KEPT FOR IT ALSO KEEPS BASES OF ITS OWN DELTAS.
+#   SET FIRST ARGUMENT TO LIST OF ONE SOURCE GEODATABASE'S SNAPSHOTS, AS (<YYYYMMDD>, <full snapshot path>, <bytes>,
+#   <number of files>) TUPLES, NEWEST FIRST. SET SECOND ARGUMENT TO DICTIONARY OF <full snapshot path>: <list of reasons>.
+def add_base_reasons(the_snapshots, the_reasons):
+   the_dates = {}
+   for i in the_snapshots:
+      the_dates[i[0]] = i[1]
+   for i in the_snapshots:
+      if len(the_reasons[i[1]]) == 0:
+         continue
+      the_index = read_delta_index(i[1])
+      for j in the_index:
+         if the_index[j]["mode"] == "delta" and the_index[j]["base"] in the_dates:
+            the_base = the_dates[the_index[j]["base"]]
+            if "base of deltas in " + i[0] not in the_reasons[the_base]:
+               the_reasons[the_base].append("base of deltas in " + i[0])
+
+#THIS FUNCTION APPLIES THE RETENTION POLICY (SEE README NOTES) TO THE SOURCE GEODATABASE'S SNAPSHOTS. SNAPSHOTS THAT
+#   AREN'T KEPT (SEE get_retention()) ARE DELETED W/ THEIR FILES (SEE delete_snapshot()), IN A POOL OF retain_workers
+#   THREADS, AND REMOVED FROM THE SNAPSHOT CATALOG (IF USED). W/ retain_dry_run, NOTHING IS DELETED.
+#   IT USES MAJOR VARIABLES SET BY read_arguments()
+#   SET ARGUMENT TO LIST OF SNAPSHOTS IN SNAPSHOT FOLDER, AS (<YYYYMMDD>, <full snapshot path>, <bytes>, <number of files>)
+#   TUPLES (SEE take_snapshot()); SNAPSHOTS OF OTHER SOURCE GEODATABASES (BY NICKNAME) ARE LEFT ALONE.
+#   RETURNS A TUPLE OF (<the list, w/o deleted snapshots>, <bytes reclaimed (or that would be, w/ retain_dry_run)>)
+def prune_snapshots(the_snapshots):
+   the_prefix = "SNAPSHOT_" + gdb_nickname.upper() + "_"
+   #DELETE LEFTOVERS OF INTERRUPTED DELETIONS
+   if retain_dry_run == False:
+      for i in glob.glob(os.path.join(snapshot_folder, "*.deleting")):
+         if os.path.basename(i).upper().startswith(the_prefix):
+            shutil.rmtree(i, ignore_errors = True)
+            make_note("Deleted " + i + ", left over from an interrupted deletion.", True, True)
+   the_mine = []
+   for i in the_snapshots:
+      if os.path.basename(i[1]).upper().startswith(the_prefix):
+         the_mine.append(i)
+   the_mine.sort(reverse = True)
+   the_reasons = get_retention(the_mine)
+   the_doomed = []
+   for i in the_mine:
+      if len(the_reasons[i[1]]) == 0 and os.path.isdir(i[1]):
+         the_doomed.append(i[1])
+   #DELETE SNAPSHOTS THAT AREN'T KEPT (OR, W/ retain_dry_run, ONLY MEASURE THEM)
+   the_sizes = {}
+   if retain_dry_run == True:
+      for i in the_doomed:
+         the_sizes[i] = get_snapshot_size(i)
+   elif retain_workers > 1 and len(the_doomed) > 1:
+      with concurrent.futures.ThreadPoolExecutor(min(retain_workers, len(the_doomed))) as the_pool:
+         for i, j in zip(the_doomed, the_pool.map(delete_snapshot, the_doomed)):
+            the_sizes[i] = j
    else:
-      latest8 = None
-      make_note("Snapshot folder doesn't have pre-existing snapshots.", True, True)
+      for i in the_doomed:
+         the_sizes[i] = delete_snapshot(i)
+   if use_catalog == True and retain_dry_run == False:
+      for i in the_doomed:
+         forget_snapshot(snapshot_folder, os.path.basename(i).upper())
+   #REPORT
+   the_reclaimed = 0
+   the_deleted = []
+   for i in the_doomed:
+      the_reclaimed += the_sizes[i][0]
+      the_deleted.append({"snapshot": os.path.basename(i), "date": get_snapshot_date(i), "bytes": the_sizes[i][0], "files": the_sizes[i][1]})
+   the_kept = []
+   for i in the_mine:
+      if len(the_reasons[i[1]]) > 0:
+         the_kept.append({"snapshot": os.path.basename(i[1]), "date": i[0], "reasons": the_reasons[i[1]]})
+   if retain_dry_run == True:
+      make_note("RETENTION (DRY RUN; NOTHING WAS DELETED):", True, True)
+   else:
+      make_note("RETENTION:", True, True)
+   for i in the_kept:
+      make_note("     Kept " + i["snapshot"] + " (" + ", ".join(i["reasons"]) + ")", True, True)
+   for i in the_deleted:
+      if retain_dry_run == True:
+         make_note("     Would delete " + i["snapshot"] + ":  " + format_size(i["bytes"]) + " in " + str(i["files"]) + " files", True, True, {"gdb": i["snapshot"], "bytes": i["bytes"], "files": i["files"]})
+      else:
+         make_note("     Deleted " + i["snapshot"] + ":  " + format_size(i["bytes"]) + " in " + str(i["files"]) + " files", True, True, {"gdb": i["snapshot"], "bytes": i["bytes"], "files": i["files"]})
+   make_note("     SPACE RECLAIMED:  " + format_size(the_reclaimed), True, True)
+   run_metrics["retention"] = {"dry_run": retain_dry_run, "kept": the_kept, "deleted": the_deleted, "reclaimed_bytes": the_reclaimed}
+   if retain_dry_run == True:
+      return (the_snapshots, the_reclaimed)
+   the_output = []
+   for i in the_snapshots:
+      if i[1] not in the_doomed:
+         the_output.append(i)
+   return (the_output, the_reclaimed)
+
+#THIS FUNCTION RETURNS A LIST OF PATHS OF A SNAPSHOT GEODATABASE'S FILES AND FOLDERS THAT EXIST: THE GEODATABASE
+#   ITSELF, AND ITS DELTA FOLDER, FINGERPRINT FILE, REPORT, JOURNAL, AND TILE FOLDER NEXT TO IT
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def get_snapshot_files(the_gdb_path):
+   the_output = []
+   the_stem = the_gdb_path[0:len(the_gdb_path) - 4]
+   for i in (the_gdb_path, get_delta_folder(the_gdb_path), get_fingerprint_path(the_gdb_path), the_stem + ".report.json", get_journal_path(the_gdb_path), the_stem + ".tiles"):
+      if os.path.exists(i):
+         the_output.append(i)
+   return the_output
+
+#THIS FUNCTION RETURNS THE SIZE OF A SNAPSHOT GEODATABASE AND ITS FILES (SEE get_snapshot_files()) AS A TUPLE OF
+#   (<bytes>, <number of files>)
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def get_snapshot_size(the_gdb_path):
+   the_bytes = 0
+   the_files = 0
+   for i in get_snapshot_files(the_gdb_path):
+      if os.path.isdir(i):
+         j = get_gdb_size(i)
+      else:
+         j = (os.path.getsize(i), 1)
+      the_bytes += j[0]
+      the_files += j[1]
+   return (the_bytes, the_files)
+
+#THIS FUNCTION DELETES A SNAPSHOT GEODATABASE AND ITS FILES (SEE get_snapshot_files()) AND RETURNS THEIR SIZE, AS A
+#   TUPLE OF (<bytes>, <number of files>). THE GEODATABASE IS FIRST RENAMED TO <name>.deleting, SO IT'S NO LONGER
+#   COUNTED AS A SNAPSHOT EVEN IF DELETING IT IS INTERRUPTED (prune_snapshots() DELETES SUCH LEFTOVERS).
+#   ITS ARGUMENT IS FULL PATH OF THE SNAPSHOT GEODATABASE
+def delete_snapshot(the_gdb_path):
+   the_size = get_snapshot_size(the_gdb_path)
+   the_files = get_snapshot_files(the_gdb_path)
+   os.replace(the_gdb_path, the_gdb_path + ".deleting")
+   shutil.rmtree(the_gdb_path + ".deleting")
+   for i in the_files[1:len(the_files)]:
+      if os.path.isdir(i):
+         shutil.rmtree(i)
+      else:
+         os.remove(i)
+   return the_size
+
+#THIS FUNCTION MOVES THE SOURCE GEODATABASE'S SNAPSHOTS THAT ARE AT LEAST archive_days OLD (EXCEPT THE NEWEST SNAPSHOT,
+#   AND BASES OF DELTAS IN SNAPSHOTS THAT AREN'T ARCHIVED; SEE add_base_reasons()) INTO THE SNAPSHOT ARCHIVE (SEE
+#   README NOTES), ONE AT A TIME. A SNAPSHOT'S FILES ARE CHUNKED AND COMPRESSED (SEE archive_file()) IN A POOL OF
+#   archive_workers THREADS. A SNAPSHOT IS DELETED (SEE delete_snapshot()) ONLY ONCE ITS MANIFEST IS SAVED, SO AN
+#   ARCHIVING THAT FAILS PARTWAY THROUGH LEAVES ALL SNAPSHOTS IN PLACE OR IN THE ARCHIVE.
+#   IT USES MAJOR VARIABLES SET BY read_arguments()
+#   SET FIRST ARGUMENT TO LIST OF SNAPSHOTS IN SNAPSHOT FOLDER, AS (<YYYYMMDD>, <full snapshot path>, <bytes>,
+#   <number of files>) TUPLES (SEE take_snapshot()). SET SECOND ARGUMENT TO TODAY'S 8-CHARACTER DATE.
+#   RETURNS A TUPLE OF (<the list, w/o archived snapshots>, <logical bytes archived>)
+def archive_snapshots(the_snapshots, the_today):
+   the_prefix = "SNAPSHOT_" + gdb_nickname.upper() + "_"
+   the_mine = []
+   for i in the_snapshots:
+      if os.path.basename(i[1]).upper().startswith(the_prefix):
+         the_mine.append(i)
+   the_mine.sort(reverse = True)
+   the_today = datetime.datetime.strptime(the_today, "%Y%m%d")
+   #SNAPSHOTS THAT STAY IN SNAPSHOT FOLDER KEEP BASES OF THEIR DELTAS THERE (reconstruct NEEDS THEM)
+   the_reasons = {}
+   for i in the_mine:
+      the_reasons[i[1]] = ["not archived"]
+   for i in the_mine[1:len(the_mine)]:
+      if (the_today - datetime.datetime.strptime(i[0], "%Y%m%d")).days >= archive_days and os.path.isdir(i[1]) and os.path.isfile(get_journal_path(i[1])) == False:
+         the_reasons[i[1]] = []
+   add_base_reasons(the_mine, the_reasons)
+   to_archive = []
+   for i in the_mine[1:len(the_mine)]:
+      if len(the_reasons[i[1]]) == 0:
+         to_archive.append(i[1])
+      elif the_reasons[i[1]][0] != "not archived":
+         make_note("Not archiving snapshot " + i[1] + " (" + ", ".join(the_reasons[i[1]]) + ").", True)
+   if len(to_archive) == 0:
+      return (the_snapshots, 0)
+   make_note("Archiving " + str(len(to_archive)) + " snapshots into snapshot archive " + archive_folder + ".", True)
+   os.makedirs(os.path.join(archive_folder, "manifests"), exist_ok = True)
+   #ARCHIVE SNAPSHOTS ONE AT A TIME, OLDEST FIRST (SO NEW DATA STORED IS COUNTED FOR THE SNAPSHOT THAT FIRST HAS IT)
+   the_pool = None
+   if archive_workers > 1:
+      the_pool = concurrent.futures.ThreadPoolExecutor(archive_workers)
+   the_logical = 0
+   the_archived = []
+   try:
+      for i in reversed(to_archive):
+         #LIST FOLDERS AND FILES OF SNAPSHOT (PATHS IN MANIFEST ARE RELATIVE TO SNAPSHOT FOLDER)
+         the_manifest = {"snapshot": os.path.basename(i), "date": get_snapshot_date(i), "archived": None, "chunk_kb": archive_chunk_kb, "logical_bytes": 0, "stored_bytes": 0, "folders": [], "files": []}
+         the_paths = []
+         for j in get_snapshot_files(i):
+            if os.path.isdir(j):
+               for the_dir, the_dirs, the_files in os.walk(j):
+                  the_manifest["folders"].append(os.path.relpath(the_dir, snapshot_folder))
+                  for k in the_files:
+                     the_paths.append(os.path.join(the_dir, k))
+            else:
+               the_paths.append(j)
+         #CHUNK, DEDUPLICATE, AND COMPRESS FILES
+         the_jobs = []
+         for j in the_paths:
+            the_jobs.append((j, archive_folder, archive_chunk_kb * 1024))
+         if the_pool != None:
+            the_results = list(the_pool.map(archive_file, the_jobs))
+         else:
+            the_results = []
+            for j in the_jobs:
+               the_results.append(archive_file(j))
+         for j, k in zip(the_paths, the_results):
+            the_manifest["logical_bytes"] += k["bytes"]
+            the_manifest["stored_bytes"] += k.pop("stored")
+            k["path"] = os.path.relpath(j, snapshot_folder)
+            the_manifest["files"].append(k)
+         #SAVE MANIFEST, THEN DELETE SNAPSHOT
+         the_manifest["archived"] = tell_the_time()
+         write_file(get_manifest_path(archive_folder, the_manifest["snapshot"]), json.dumps(the_manifest))
+         delete_snapshot(i)
+         if use_catalog == True:
+            forget_snapshot(snapshot_folder, os.path.basename(i).upper())
+         the_logical += the_manifest["logical_bytes"]
+         the_archived.append({"snapshot": the_manifest["snapshot"], "date": the_manifest["date"], "logical_bytes": the_manifest["logical_bytes"], "stored_bytes": the_manifest["stored_bytes"]})
+         make_note("Archived snapshot " + the_manifest["snapshot"] + ":  " + format_size(the_manifest["logical_bytes"]) + " in " + str(len(the_manifest["files"])) + " files; new data stored (compressed):  " + format_size(the_manifest["stored_bytes"]), True, True, {"gdb": the_manifest["snapshot"], "bytes": the_manifest["logical_bytes"], "stored_bytes": the_manifest["stored_bytes"]})
+   finally:
+      if the_pool != None:
+         the_pool.shutdown()
+   run_metrics["archive"] = {"archived": the_archived}
+   the_output = []
+   for i in the_snapshots:
+      if i[1] not in to_archive:
+         the_output.append(i)
+   return (the_output, the_logical)
+
+#THIS FUNCTION STORES A FILE IN THE SNAPSHOT ARCHIVE (SEE README NOTES). THE FILE IS SPLIT INTO CHUNKS; EACH CHUNK IS
+#   HASHED (SHA-256) AND, UNLESS A CHUNK W/ THE SAME HASH IS ALREADY STORED, COMPRESSED (zlib) AND SAVED UNDER ITS HASH.
+#   A CHUNK IS SAVED TO A TEMPORARY FILE FIRST, SO A CHUNK FILE IS NEVER PARTIAL (EVEN IF TWO THREADS SAVE THE SAME CHUNK).
+#   ITS ARGUMENT IS A TUPLE OF (<full path of file>, <archive folder>, <chunk size in bytes>)
+#   RETURNS A DICTIONARY OF bytes (SIZE OF FILE), chunks (LIST OF HASHES OF ITS CHUNKS, IN ORDER), AND stored (COMPRESSED
+#   BYTES OF CHUNKS THAT WEREN'T STORED YET)
+def archive_file(the_arguments):
+   the_path, the_folder, the_size = the_arguments
+   the_output = {"bytes": 0, "chunks": [], "stored": 0}
+   with open(the_path, "rb") as the_file:
+      while True:
+         the_chunk = the_file.read(the_size)
+         if len(the_chunk) == 0:
+            break
+         the_hash = hashlib.sha256(the_chunk).hexdigest()
+         the_chunk_path = get_chunk_path(the_folder, the_hash)
+         if os.path.isfile(the_chunk_path) == False:
+            the_data = zlib.compress(the_chunk, 6)
+            os.makedirs(os.path.dirname(the_chunk_path), exist_ok = True)
+            the_temp = the_chunk_path + "." + str(os.getpid()) + "_" + str(threading.get_ident()) + ".tmp"
+            with open(the_temp, "wb") as the_chunk_file:
+               the_chunk_file.write(the_data)
+            os.replace(the_temp, the_chunk_path)
+            the_output["stored"] += len(the_data)
+         the_output["bytes"] += len(the_chunk)
+         the_output["chunks"].append(the_hash)
+   return the_output
+
+#THIS FUNCTION RETURNS PATH OF A CHUNK IN THE SNAPSHOT ARCHIVE
+#   SET FIRST ARGUMENT TO THE ARCHIVE FOLDER. SET SECOND ARGUMENT TO THE CHUNK'S HASH.
+def get_chunk_path(the_folder, the_hash):
+   return os.path.join(the_folder, "chunks", the_hash[0:2], the_hash + ".z")
+
+#THIS FUNCTION RETURNS PATH OF AN ARCHIVED SNAPSHOT'S MANIFEST
+#   SET FIRST ARGUMENT TO THE ARCHIVE FOLDER. SET SECOND ARGUMENT TO THE SNAPSHOT GEODATABASE'S NAME (W/ OR W/O .gdb).
+def get_manifest_path(the_folder, the_name):
+   if the_name.lower().endswith(".gdb"):
+      the_name = the_name[0:len(the_name) - 4]
+   return os.path.join(the_folder, "manifests", the_name + ".json")
+
+#THIS FUNCTION RETURNS A LIST OF MANIFESTS (DICTIONARIES; SEE archive_snapshots()) OF SNAPSHOTS IN A GIVEN SNAPSHOT
+#   ARCHIVE, SORTED BY SNAPSHOT NAME. MANIFESTS THAT CAN'T BE READ ARE SKIPPED.
+def read_manifests(the_folder):
+   the_output = []
+   for i in sorted(glob.glob(os.path.join(the_folder, "manifests", "*.json"))):
+      try:
+         with open(i, "r") as the_file:
+            the_output.append(json.load(the_file))
+      except (OSError, ValueError):
+         continue
+   return the_output
+
+#THIS FUNCTION ADDS THE SNAPSHOT ARCHIVE (SEE README NOTES) TO THE REPORT'S SIZES: EACH OF THE SOURCE GEODATABASE'S
+#   ARCHIVED SNAPSHOTS W/ ITS LOGICAL SIZE, AND THE LOGICAL SIZE OF ALL ARCHIVED SNAPSHOTS VS. THE PHYSICAL SIZE OF THE
+#   ARCHIVE FOLDER (CHUNKS AND MANIFESTS)
+#   IT USES MAJOR VARIABLES SET BY read_arguments()
+def note_archive():
+   if os.path.isdir(archive_folder) == False:
+      return
+   the_manifests = read_manifests(archive_folder)
+   the_logical = 0
+   make_note("SIZES OF ARCHIVED SNAPSHOTS (LOGICAL, AS RESTORED) IN " + archive_folder + ":", True, True)
+   for i in the_manifests:
+      the_logical += i["logical_bytes"]
+      if i["snapshot"].upper().startswith("SNAPSHOT_" + gdb_nickname.upper() + "_"):
+         make_note("     " + i["snapshot"] + ":  " + format_size(i["logical_bytes"]) + " in " + str(len(i["files"])) + " files", True, True, {"gdb": i["snapshot"], "bytes": i["logical_bytes"], "files": len(i["files"])})
+   the_physical = get_gdb_size(archive_folder)
+   the_ratio = ""
+   if the_physical[0] > 0:
+      the_ratio = " (" + str(round(the_logical / the_physical[0], 1)) + " to 1)"
+   make_note("     TOTAL (ALL ARCHIVED SNAPSHOTS):  " + format_size(the_logical) + " logical, " + format_size(the_physical[0]) + " physical in " + str(the_physical[1]) + " files" + the_ratio, True, True)
+   if "archive" not in run_metrics:
+      run_metrics["archive"] = {"archived": []}
+   run_metrics["archive"].update({"snapshots": len(the_manifests), "logical_bytes": the_logical, "physical_bytes": the_physical[0], "physical_files": the_physical[1]})
+
+#THIS FUNCTION RESTORES (REHYDRATES) AN ARCHIVED SNAPSHOT INTO A SNAPSHOT FOLDER (SEE --restore IN HOW TO USE). ITS
+#   GEODATABASE IS WRITTEN TO <name>.gdb.restoring AND RENAMED ONCE COMPLETE, SO A RESTORE THAT FAILS NEVER LEAVES A
+#   PARTIAL SNAPSHOT. EACH CHUNK IS CHECKED AGAINST ITS HASH.
+#   SET FIRST ARGUMENT TO THE SNAPSHOT FOLDER. SET SECOND ARGUMENT TO THE SNAPSHOT GEODATABASE'S NAME (W/ OR W/O .gdb).
+#   SET THIRD ARGUMENT TO THE ARCHIVE FOLDER (OR AN EMPTY STRING FOR THE snapshot_archive FOLDER IN THE SNAPSHOT FOLDER).
+def restore_snapshot(the_folder, the_name, the_archive = ""):
+   if the_archive == "":
+      the_archive = os.path.join(the_folder, "snapshot_archive")
+   the_path = get_manifest_path(the_archive, the_name)
+   #(MANIFEST NAMES AREN'T CASE-SENSITIVE)
+   for i in glob.glob(os.path.join(the_archive, "manifests", "*.json")):
+      if os.path.basename(i).upper() == os.path.basename(the_path).upper():
+         the_path = i
+   if os.path.isfile(the_path) == False:
+      make_note("Snapshot " + the_name + " isn't in snapshot archive " + the_archive + ".", True)
+      return
+   with open(the_path, "r") as the_file:
+      the_manifest = json.load(the_file)
+   the_gdb_path = os.path.join(the_folder, the_manifest["snapshot"])
+   if os.path.exists(the_gdb_path):
+      make_note("Snapshot " + the_gdb_path + " already exists. It wasn't restored.", True)
+      return
+   make_note("Restoring snapshot " + the_manifest["snapshot"] + " from snapshot archive " + the_archive + ".", True)
+   the_temp = the_gdb_path + ".restoring"
+   shutil.rmtree(the_temp, ignore_errors = True)
+   #(PATHS IN GEODATABASE ARE WRITTEN UNDER THE TEMPORARY FOLDER)
+   the_targets = {}
+   for i in the_manifest["folders"] + [j["path"] for j in the_manifest["files"]]:
+      the_target = os.path.join(the_folder, i)
+      if the_target == the_gdb_path or the_target.startswith(the_gdb_path + os.sep):
+         the_target = the_temp + the_target[len(the_gdb_path):len(the_target)]
+      the_targets[i] = the_target
+   for i in the_manifest["folders"]:
+      os.makedirs(the_targets[i], exist_ok = True)
+   for i in the_manifest["files"]:
+      with open(the_targets[i["path"]], "wb") as the_file:
+         for j in i["chunks"]:
+            with open(get_chunk_path(the_archive, j), "rb") as the_chunk_file:
+               the_chunk = zlib.decompress(the_chunk_file.read())
+            if hashlib.sha256(the_chunk).hexdigest() != j:
+               raise ValueError("Chunk " + j + " of " + i["path"] + " in snapshot archive " + the_archive + " is damaged.")
+            the_file.write(the_chunk)
+   os.replace(the_temp, the_gdb_path)
+   make_note("Restored snapshot " + the_gdb_path + ":  " + format_size(the_manifest["logical_bytes"]) + " in " + str(len(the_manifest["files"])) + " files.", True)
+
+#THIS FUNCTION TAKES A SNAPSHOT OF THE SOURCE GEODATABASE, IF ONE IS DUE, AND EMAILS A REPORT
+#   IT USES MAJOR VARIABLES SET BY read_arguments()
+#   SET ARGUMENT (BOOLEAN) TO True OR False TO INDICATE IF REPORT IS EMAILED (IF False, REPORT IS LEFT
+#   IN email_content). RETURNS "REPORT" OR, IF SOMETHING WENT WRONG (OR A SNAPSHOT WASN'T DUE), "ERROR CONDITION".
+def take_snapshot(send_report = True):
+   global snapshot_gdb_path, snapshot_id, object_filter, run_metrics, date_style, folder_lock
+   snapshot_id = None
+   snapshot_gdb_path = None
+   run_metrics = {"source": gdb_nickname, "source_gdb": source_gdb, "snapshot": None, "started": datetime.datetime.now().isoformat(timespec = "seconds"), "start_time": time.time(), "phases": [], "objects": []}
+   try:
+      #GET CURRENT DATE, TO BE CONSIDERED TO BE CURRENT DATE THROUGHOUT SCRIPT EXECUTION
+      t = time.localtime()
+
+      #VERIFY THAT SNAPSHOT FOLDER EXISTS
+      if os.path.isdir(snapshot_folder) == False:
+         make_note("Snapshot folder " + snapshot_folder + " doesn't exist. Script terminated.", True, True)
+         sys.exit()
+
+      #LOCK SNAPSHOT FOLDER, SO RUNS THAT SHARE IT (OF THIS OR OTHER SOURCE GEODATABASES) DON'T OVERLAP (SEE lock_folder())
+      folder_lock = lock_folder(snapshot_folder, lock_minutes)
+      if folder_lock == None:
+         make_note("Snapshot folder " + snapshot_folder + " is still locked by another run after " + str(lock_minutes) + " minutes. Script terminated.", True, True)
+         sys.exit()
+
+      #CAPTURE TODAY'S DAY AND 8-CHARACTER DATE-REPRESENTATION
+      y2 = t.tm_year
+      m2 = t.tm_mon
+      d2 = t.tm_mday
+      n2 = t.tm_yday
+      today8 = str(y2)
+      the_string = str(m2)
+      while len(the_string) < 2:
+         the_string = "0" + the_string
+      today8 += the_string
+      the_string = str(d2)
+      while len(the_string) < 2:
+         the_string = "0" + the_string
+      today8 += the_string
+      snapshot_id = "SNAPSHOT_" + gdb_nickname + "_" + today8
+      make_note("Today is day " + str(n2) + " of the year.", True)
+      make_note("Today's date--in YYYYMMDD pattern--is " + today8, True)
+
+      #GET LIST OF SNAPSHOTS OF SOURCE GEODATABASE IN SNAPSHOT FOLDER, AS (<YYYYMMDD>, <full snapshot path>, <bytes>, <number of files>) TUPLES
+      #(FROM SNAPSHOT CATALOG, IF USED; OTHERWISE, BY SCANNING SNAPSHOT FOLDER)
+      #(SNAPSHOTS OF OTHER SOURCE GEODATABASES, BY NICKNAME, IN A SHARED SNAPSHOT FOLDER AREN'T COUNTED)
+      the_start = time.time()
+      the_prefix = "SNAPSHOT_" + gdb_nickname.upper() + "_"
+      if use_catalog == True:
+         snapshots = []
+         for i in read_catalog(snapshot_folder):
+            if os.path.basename(i[1]).upper().startswith(the_prefix):
+               snapshots.append(i)
+               make_note("Found snapshot from " + i[0] + " (" + i[1] + ") in snapshot catalog.", True, True)
+      else:
+         the_list = list_file_gdbs(snapshot_folder)
+         the_paths = []
+         for i in the_list:
+            the_date = get_snapshot_date(i)
+            if the_date and os.path.basename(i).upper().startswith(the_prefix) == False:
+               make_note("Geodatabase " + i + " is a snapshot of another source geodatabase. Excluding it from list of pre-exising snapshots.", True, True)
+            elif the_date and os.path.isfile(get_journal_path(i)):
+               make_note("Geodatabase " + i + " is an incomplete snapshot. Excluding it from list of pre-exising snapshots.", True, True)
+            elif the_date:
+               the_paths.append(i)
+               make_note("Found snapshot from " + the_date + " (" + i + ").", True, True)
+            else:
+               make_note("Geodatabase " + i + " isn't named according to how this script names snapshots. Excluding it from list of pre-exising snapshots.", True, True)
+         if size_cache == True:
+            the_sizes = get_gdb_sizes(the_paths, snapshot_folder, size_workers)
+         else:
+            the_sizes = get_gdb_sizes(the_paths, None, size_workers)
+         snapshots = []
+         for i in the_paths:
+            snapshots.append((get_snapshot_date(i), i) + the_sizes[i])
+      snapshots.sort()
+      snapshots.reverse()
+      the_bytes = 0
+      for i in snapshots:
+         the_bytes += i[2] or 0
+      record_phase("discovery", time.time() - the_start, None, the_bytes)
+
+      #MAKE SURE SNAPSHOT W/ TODAY'S DATE DOESN'T ALREADY EXIST
+      for i in snapshots:
+         if i[0] == today8:
+            make_note("A snapshot (" + i[1] + ") w/ today's date already exists. Script terminated.", True, True)
+            sys.exit()
+
+      #GET DAY OF LAST SNAPSHOT (PER SNAPSHOTS IN SNAPSHOT FOLDER)
+      if len(snapshots) > 0:
+         latest8 = snapshots[0][0]
+         make_note("Day of last snapshot (per snapshot-folder contents) is " + latest8 + ".", True, True)
+      else:
+         latest8 = None
+         make_note("Snapshot folder doesn't have pre-existing snapshots.", True, True)
       
-   #DETERMINE IF IT IS TIME FOR A SNAPSHOT
-   #(IF A SNAPSHOT EXISTS, GET NUMBER OF DAYS SINCE)
-   if latest8:
-      y1 = int(latest8[0:4])
-      m1 = int(latest8[4:6])
-      d1 = int(latest8[6:8])
-      n1 = datetime.date(y1,m1,d1).timetuple()[7]
-      day_count = n2
-      #IF YEAR OF LAST SNAPSHOT IS BEFORE THIS YEAR, COUNT DAYS THROUGH YEARS BACK TO LAST SNAPSHOT
-      if y1 < y2:
-         i = y2 - 1
-         while i >= y1:
-            if calendar.isleap(i):
-               if i > y1:
-                  day_count += 366
+      #DETERMINE IF IT IS TIME FOR A SNAPSHOT
+      #(IF A SNAPSHOT EXISTS, GET NUMBER OF DAYS SINCE)
+      if latest8:
+         y1 = int(latest8[0:4])
+         m1 = int(latest8[4:6])
+         d1 = int(latest8[6:8])
+         n1 = datetime.date(y1,m1,d1).timetuple()[7]
+         day_count = n2
+         #IF YEAR OF LAST SNAPSHOT IS BEFORE THIS YEAR, COUNT DAYS THROUGH YEARS BACK TO LAST SNAPSHOT
+         if y1 < y2:
+            i = y2 - 1
+            while i >= y1:
+               if calendar.isleap(i):
+                  if i > y1:
+                     day_count += 366
+                  else:
+                     day_count = day_count + 366 - n1
                else:
-                  day_count = day_count + 366 - n1
+                  if i > y1:
+                     day_count += 365
+                  else:
+                     day_count = day_count + 365 - n1
+               i = i - 1
+         else:
+            day_count = n2 - n1
+      else:
+         day_count = 0
+      if day_count >= tempo or latest8 == None:
+         time_for_snapshot = True
+      else:
+         time_for_snapshot = False
+      make_note(str(day_count) + " days have passed since last snapshot. Snapshot tempo is " + str(tempo) + " days.", True, True)
+
+      #LOOK FOR AN INCOMPLETE SNAPSHOT (ONE W/ A JOURNAL) OF THIS SOURCE GEODATABASE; IF FOUND, RESUME NEWEST ONE
+      #(IT KEEPS ITS OWN DATE)
+      resume_gdb_path = None
+      for i in list_incomplete_snapshots(snapshot_folder, gdb_nickname):
+         resume_gdb_path = i
+      if resume_gdb_path:
+         today8 = get_snapshot_date(resume_gdb_path)
+         snapshot_id = "SNAPSHOT_" + gdb_nickname + "_" + today8
+         time_for_snapshot = True
+         make_note("Found incomplete snapshot " + resume_gdb_path + ". Resuming it.", True, True)
+
+      #IF IT IS TIME FOR A SNAPSHOT, PROCEED
+      verify_failed = []
+      if time_for_snapshot == True:
+         #IMPORT arcpy (NOT NEEDED UNTIL NOW)
+         import_arcpy()
+
+         #VERIFY THAT SOURCE GEODATABASE EXISTS
+         if arcpy.Exists(source_gdb) == False:
+            make_note("Couldn't connect to source geodatabase " + source_gdb + ". Script terminated.", True, True)
+            sys.exit()
+
+         #CREATE SNAPSHOT GEODATABASE (UNLESS RESUMING AN INCOMPLETE SNAPSHOT WHOSE GEODATABASE WAS CREATED)
+         #(JOURNAL IS WRITTEN FIRST, SO A RUN THAT FAILS WHILE CREATING THE GEODATABASE LEAVES A RESUMABLE SNAPSHOT;
+         #A MISSING OR PARTIAL GEODATABASE OF A RESUMED SNAPSHOT IS (RE)CREATED)
+         snapshot_gdb_name = snapshot_id + ".gdb"
+         snapshot_gdb_path = os.path.join(snapshot_folder, snapshot_gdb_name)
+         if resume_gdb_path:
+            snapshot_gdb_path = resume_gdb_path
+            snapshot_gdb_name = os.path.basename(resume_gdb_path)
+         else:
+            write_journal(snapshot_gdb_path, {"started": tell_the_time()})
+         if resume_gdb_path == None or is_file_gdb(snapshot_gdb_path) == False:
+            if os.path.isdir(snapshot_gdb_path):
+               make_note("Snapshot geodatabase " + snapshot_gdb_name + " is partial. Deleting and recreating it.", True, True)
+               shutil.rmtree(snapshot_gdb_path)
+            arcpy.management.CreateFileGDB(snapshot_folder, snapshot_gdb_name)
+            make_note("Created snapshot geodatabase " + snapshot_gdb_name + ".", True, True)
+
+         #CAPTURE include_list INTO LOG/REPORT
+         if len(include_list) > 0:
+            make_note("DATA OBJECTS TO BE INCLUDED IN SNAPSHOT (VIA EXPLICIT INCLUDE-LIST):", True, True)
+            for i in include_list:
+               make_note("     " + i, True, True)
+
+         #CAPTURE exclude_list INTO LOG/REPORT
+         make_note("DATA OBJECTS TO BE EXCLUDED FROM SNAPSHOT:", True, True)
+         for i in exclude_list:
+            make_note("     " + i, True, True)         
+
+         #COMPILE include_list AND exclude_list INTO FILTER (SEE should_include())
+         object_filter = compile_filter(include_list, exclude_list)
+
+         #SET WORKSPACE
+         run_metrics["snapshot"] = snapshot_id
+         the_start = time.time()
+         arcpy.env.workspace = source_gdb
+
+         #GET PREVIOUS SNAPSHOT'S FINGERPRINTS (IF INCREMENTAL)
+         previous_gdb_path = None
+         previous_fingerprints = {}
+         if incremental == True and latest8:
+            previous_gdb_path = snapshots[0][1]
+            previous_fingerprints = read_fingerprints(previous_gdb_path)
+            make_note("Found " + str(len(previous_fingerprints)) + " fingerprints from previous snapshot (" + previous_gdb_path + ").", True, True)
+
+         #GET BASES OF DELTA SNAPSHOTS (IF DELTA)
+         delta_bases = {}
+         if delta == True:
+            date_style = get_date_style(source_gdb)
+            if len(snapshots) > 0:
+               delta_bases = get_delta_bases(snapshots[0][1], today8)
+               make_note("Found " + str(len(delta_bases)) + " bases for delta snapshots (see previous snapshot " + snapshots[0][1] + ").", True, True)
+
+         #PLAN COPY SET, AS A LIST OF PLANNED-JOB DICTIONARIES (SEE plan_object())
+         copy_plan = []
+
+         #GET INVENTORY OF SOURCE GEODATABASE'S DATA OBJECTS (CACHED, IF discovery_ttl IS SET; SEE get_inventory())
+         the_inventory = get_inventory(source_gdb)
+
+         #WORK FEATURE DATASETS (AND THEIR FEATURE CLASSES), STAND-ALONE FEATURE-CLASSES, TABLES, AND RASTER DATASETS,
+         #IN INVENTORY ORDER
+         #(FEATURE DATASETS ARE CREATED NOW, SO THEY EXIST BEFORE THEIR FEATURE CLASSES ARE COPIED)
+         the_labels = {"feature-class": "Feature class", "table": "Table", "raster": "Raster dataset"}
+         the_included_fds = []
+         for i in the_inventory:
+            if i["kind"] == "fds":
+               the_decision = should_include("fds", i["name"])
+               make_note("Feature dataset " + i["name"] + ": " + the_decision[1] + ".")
+               if the_decision[0] == True:
+                  if arcpy.Exists(snapshot_gdb_path + "\\" + i["name"]) == False:
+                     arcpy.management.CreateFeatureDataset(snapshot_gdb_path, i["name"], i["source"])
+                  the_included_fds.append(i["name"])
+            elif i["fds"] != None:
+               if i["fds"] in the_included_fds:
+                  the_decision = should_include(i["kind"], i["name"], True)
+                  make_note(the_labels[i["kind"]] + " " + i["fds"] + "\\" + i["name"] + ": " + the_decision[1] + ".")
+                  if the_decision[0] == True:
+                     copy_plan.append(plan_object(i["kind"], i["source"], i["fds"] + "\\" + i["name"], previous_gdb_path, previous_fingerprints, delta_bases, i["properties"]))
+            elif i["kind"] != "raster" or include_rasters == True:
+               the_decision = should_include(i["kind"], i["name"])
+               make_note(the_labels[i["kind"]] + " " + i["name"] + ": " + the_decision[1] + ".")
+               if the_decision[0] == True:
+                  copy_plan.append(plan_object(i["kind"], i["source"], i["name"], previous_gdb_path, previous_fingerprints, delta_bases, i["properties"]))
+         make_note("Planned " + str(len(copy_plan)) + " data objects to be copied to snapshot geodatabase.", True, True)
+         record_phase("enumeration", time.time() - the_start)
+
+         #CHECK DATA OBJECTS THAT WERE ALREADY COPIED (IF RESUMING) AND RECORD PLAN IN JOURNAL
+         copy_remaining, copy_done = check_journal(copy_plan, read_journal(snapshot_gdb_path))
+         the_names = []
+         for i in copy_plan:
+            the_names.append(i["name"])
+         write_journal(snapshot_gdb_path, {"planned": the_names})
+
+         #COPY PLANNED DATA-OBJECTS (THAT WEREN'T ALREADY COPIED)
+         #(EACH IS RECORDED IN JOURNAL AS SOON AS IT'S COPIED; NOTES ARE MADE IN PLANNED ORDER)
+         copy_results = []
+         copy_start = time.time()
+         #(W/ throttle, COPIES ARE STARTED ONLY UP TO THE THROTTLE'S LIMIT; SEE start_throttle())
+         start_throttle(min(workers, max(len(copy_remaining), 1)))
+         if workers > 1 and len(copy_remaining) > 1:
+            make_note("Copying w/ " + str(min(workers, len(copy_remaining))) + " worker processes.", True, True)
+            flush_log()
+            with concurrent.futures.ProcessPoolExecutor(min(workers, len(copy_remaining)), initializer = start_worker, initargs = (source_gdb,)) as the_pool:
+               the_running = set()
+               the_error = None
+               the_started = 0
+               the_next = 0
+               while (the_error == None and the_started < len(copy_remaining)) or len(the_running) > 0:
+                  #START COPIES, UP TO THE THROTTLE'S LIMIT (STOP STARTING NEW COPIES ONCE ONE FAILS)
+                  the_delay = get_throttle_delay()
+                  while the_error == None and the_started < len(copy_remaining) and len(the_running) < get_throttle_limit() and the_delay == 0:
+                     the_running.add(the_pool.submit(copy_object, copy_remaining[the_started]))
+                     the_started += 1
+                  if len(the_running) == 0:
+                     time.sleep(min(max(the_delay, 1), 60))
+                     continue
+                  the_timeout = None
+                  if the_delay > 0:
+                     the_timeout = min(the_delay, 60)
+                  the_done, the_running = concurrent.futures.wait(the_running, the_timeout, concurrent.futures.FIRST_COMPLETED)
+                  for i in the_done:
+                     if i.exception() != None:
+                        #(COPIES ALREADY RUNNING ARE STILL RECORDED IN JOURNAL)
+                        if the_error == None:
+                           the_error = i.exception()
+                           make_note(str(the_error), True, True)
+                        continue
+                     write_journal(snapshot_gdb_path, {"completed": i.result()})
+                     copy_done[i.result()["name"]] = i.result()
+                     update_throttle(i.result())
+                  while the_error == None and the_next < len(copy_remaining) and copy_remaining[the_next]["name"] in copy_done:
+                     note_result(copy_done[copy_remaining[the_next]["name"]])
+                     the_next += 1
+               if the_error != None:
+                  #(COPIES THAT COMPLETED AFTER THE FAILED ONE STARTED ARE STILL NOTED, IN PLANNED ORDER)
+                  for i in copy_remaining[the_next:len(copy_remaining)]:
+                     if i["name"] in copy_done:
+                        note_result(copy_done[i["name"]])
+                  raise the_error
+         else:
+            for i in copy_remaining:
+               the_delay = get_throttle_delay()
+               while the_delay > 0:
+                  time.sleep(min(the_delay, 60))
+                  the_delay = get_throttle_delay()
+               try:
+                  j = copy_object(i)
+               except Exception as e:
+                  make_note(str(e), True, True)
+                  raise
+               write_journal(snapshot_gdb_path, {"completed": j})
+               note_result(j)
+               copy_done[j["name"]] = j
+               update_throttle(j)
+         for i in copy_plan:
+            copy_results.append(copy_done[i["name"]])
+         copy_seconds = time.time() - copy_start
+
+         #VERIFY COPIED DATA-OBJECTS AGAINST SOURCE GEODATABASE (IF verify IS SET; SEE verify_objects())
+         #(DATA OBJECTS THAT FAIL ARE FLAGGED FOR RECOPY: THEY'RE COPIED AGAIN FROM SOURCE GEODATABASE AND VERIFIED AGAIN, IF
+         #verify_recopy; THOSE THAT STILL FAIL AREN'T FINGERPRINTED, SO THE NEXT SNAPSHOT COPIES THEM FROM SOURCE GEODATABASE)
+         if verify != "none":
+            the_start = time.time()
+            the_deadline = None
+            if verify_minutes > 0:
+               the_deadline = the_start + verify_minutes * 60
+            the_verified = verify_objects(copy_plan, copy_results, the_deadline, verify_workers)
+            for i in range(len(copy_plan)):
+               if the_verified[i]["status"] == "failed" and verify_recopy == True:
+                  make_note("Verification of " + copy_plan[i]["type"] + " " + copy_plan[i]["source"] + " failed (" + "; ".join(the_verified[i]["problems"]) + "). Copying it again from source geodatabase.", True, True)
+                  the_job = dict(copy_plan[i])
+                  the_job["previous"] = None
+                  try:
+                     if arcpy.Exists(the_job["target"]):
+                        arcpy.management.Delete(the_job["target"])
+                     copy_results[i] = copy_object(the_job)
+                  except Exception as e:
+                     make_note(str(e), True, True)
+                     the_verified[i]["problems"].append("recopy failed")
+                     continue
+                  write_journal(snapshot_gdb_path, {"completed": copy_results[i]})
+                  note_result(copy_results[i])
+                  the_verified[i] = verify_object(the_job, copy_results[i], verify, verify_sample, the_deadline)
+                  the_verified[i]["recopied"] = True
+            for i in range(len(copy_plan)):
+               if the_verified[i]["status"] == "failed":
+                  copy_results[i]["fingerprint"] = None
+                  verify_failed.append(copy_plan[i]["name"])
+            note_verification(the_verified, time.time() - the_start)
+            record_phase("verification", time.time() - the_start)
+
+         #BUILD PYRAMIDS AND STATISTICS OF RASTER DATASETS THAT WERE COPIED W/O THEM (IF raster_pyramids IS defer)
+         the_start = time.time()
+         the_count = 0
+         for i in copy_results:
+            if i.get("pyramids") == "deferred":
+               try:
+                  arcpy.management.BuildPyramids(snapshot_gdb_path + "\\" + i["name"])
+                  arcpy.management.CalculateStatistics(snapshot_gdb_path + "\\" + i["name"])
+                  i["pyramids"] = "built"
+                  the_count += 1
+               except Exception as e:
+                  make_note("Couldn't build pyramids and statistics of raster " + i["name"] + ". " + str(e), True, True)
+         if the_count > 0:
+            make_note("Built pyramids and statistics of " + str(the_count) + " raster datasets (deferred until data objects were copied).", True, True)
+            record_phase("raster_pyramids", time.time() - the_start)
+
+         #SAVE FINGERPRINTS W/ SNAPSHOT GEODATABASE AND REPORT REUSED/COPIED DATA-OBJECTS (IF INCREMENTAL)
+         if incremental == True:
+            the_fingerprints = {}
+            for i in copy_results:
+               if i["fingerprint"]:
+                  the_fingerprints[i["name"]] = {"fingerprint": i["fingerprint"], "rows": i["rows"]}
+            with open(get_fingerprint_path(snapshot_gdb_path), "w") as the_file:
+               json.dump(the_fingerprints, the_file, indent = 1)
+            make_note("DATA OBJECTS REUSED FROM PREVIOUS SNAPSHOT (UNCHANGED):", True, True)
+            for i in copy_results:
+               if i["reused"] == True:
+                  make_note("     " + i["name"], True, True)
+            make_note("DATA OBJECTS COPIED FROM SOURCE GEODATABASE (NEW OR CHANGED):", True, True)
+            for i in copy_results:
+               if i["reused"] == False:
+                  make_note("     " + i["name"], True, True)
+
+         #SAVE INDEX OF DELTA SNAPSHOTS AND REPORT BASES/DELTAS (IF DELTA)
+         if delta == True:
+            the_index = {}
+            for i in copy_results:
+               if i.get("delta"):
+                  the_index[i["name"].upper()] = i["delta"]
+            os.makedirs(get_delta_folder(snapshot_gdb_path), exist_ok = True)
+            write_file(os.path.join(get_delta_folder(snapshot_gdb_path), "index.json"), json.dumps(the_index, indent = 1))
+            make_note("DATA OBJECTS COPIED IN FULL AS BASES OF DELTA SNAPSHOTS:", True, True)
+            for i in copy_results:
+               if i.get("delta") and i["delta"]["mode"] == "base":
+                  make_note("     " + i["name"], True, True)
+            make_note("DATA OBJECTS COPIED AS DELTAS (ROWS INSERTED, UPDATED, AND DELETED SINCE BASE):", True, True)
+            for i in copy_results:
+               if i.get("delta") and i["delta"]["mode"] == "delta":
+                  make_note("     " + i["name"] + " (base of " + i["delta"]["base"] + "):  " + format(i["delta"]["inserted"], ",") + " inserted, " + format(i["delta"]["updated"], ",") + " updated, " + format(i["delta"]["deleted"], ",") + " deleted", True, True)
+
+         #GET SNAPSHOT-GEODATABASE'S 8-CHARACTER DATE AND SIZE INTO snapshots LIST
+         the_start = time.time()
+         gdb_size = get_gdb_size(snapshot_gdb_path)
+         snapshots.append((today8, snapshot_gdb_path) + gdb_size)
+         snapshots.sort()
+         record_phase("snapshot_size", time.time() - the_start, None, gdb_size[0])
+
+         #RECORD COPY METRICS (BYTES OF EACH DATA OBJECT ARE ADDED W/ SIZES OF DATA OBJECTS, BELOW)
+         the_rows = 0
+         for i in copy_results:
+            the_rows += i["rows"] or 0
+            the_entry = {"name": i["name"], "type": i["type"], "reused": i["reused"], "seconds": round(i["seconds"], 6), "rows": i["rows"], "bytes": None}
+            the_entry.update(get_throughput(i["seconds"], i["rows"], None))
+            run_metrics["objects"].append(the_entry)
+         record_phase("copy", copy_seconds, the_rows, gdb_size[0])
+
+         #RECORD SNAPSHOT IN SNAPSHOT CATALOG (IF USED)
+         if use_catalog == True:
+            record_snapshot(snapshot_folder, today8, snapshot_gdb_path, gdb_size, time.time() - copy_start, copy_results)
+            make_note("Recorded snapshot in snapshot catalog.", True, True)
+
+         #MARK SNAPSHOT COMPLETE BY DELETING ITS JOURNAL
+         os.remove(get_journal_path(snapshot_gdb_path))
+         make_note("Snapshot " + snapshot_gdb_path + " is complete.", True, True)
+
+      #OTHERWISE, SIMPLY REPORT
+      else:
+         make_note("Snapshot geodatabase not made.", True, True)
+
+      #APPLY RETENTION POLICY, DELETING SNAPSHOTS THAT AREN'T KEPT (IF RETENTION OPTIONS ARE SET; SEE prune_snapshots())
+      if retain_daily > 0 or retain_weekly > 0 or retain_monthly > 0 or retain_yearly > 0 or retain_max_gb > 0:
+         the_start = time.time()
+         snapshots, the_reclaimed = prune_snapshots(snapshots)
+         record_phase("retention", time.time() - the_start, None, the_reclaimed)
+
+      #MOVE SNAPSHOTS THAT ARE AT LEAST archive_days OLD INTO SNAPSHOT ARCHIVE (IF SET; SEE archive_snapshots())
+      if archive_days > 0:
+         the_start = time.time()
+         snapshots, the_archived = archive_snapshots(snapshots, today8)
+         record_phase("archive", time.time() - the_start, None, the_archived)
+      
+      #SCRIPT COMPLETED, EMAIL REPORT (INDLUDING SNAPSHOT-GEODATABASE SIZES, IF APPLICABLE)
+      the_start = time.time()
+      if len(snapshots) > 0:
+         make_note("SIZES OF SNAPSHOT GEODATABASES:", True, True)
+         the_total = 0
+         for i in snapshots:
+            #(SIZE IS None IF IT COULDN'T BE MEASURED; IT'S LEFT OUT OF TOTAL)
+            if i[2] == None:
+               make_note("     " + i[1] + ":  unknown", True, True, {"gdb": i[1], "bytes": i[2], "files": i[3]})
             else:
-               if i > y1:
-                  day_count += 365
-               else:
-                  day_count = day_count + 365 - n1
-            i = i - 1
+               make_note("     " + i[1] + ":  " + format_size(i[2]) + " in " + str(i[3]) + " files", True, True, {"gdb": i[1], "bytes": i[2], "files": i[3]})
+            the_total += i[2] or 0
+         make_note("     TOTAL:  " + format_size(the_total), True, True)
+         the_newest = max(snapshots)
+         if os.path.isdir(the_newest[1]):
+            make_note("SIZES OF DATA OBJECTS IN NEWEST SNAPSHOT GEODATABASE (" + os.path.basename(the_newest[1]) + "):", True, True)
+            the_sizes = {}
+            the_objects, the_matched = get_object_sizes(the_newest[1])
+            if the_matched == False:
+               make_note("     (Geodatabase system catalog couldn't be read; sizes are of files grouped by file name, not of data objects.)", True, True)
+            for i in the_objects:
+               make_note("     " + i[0] + ":  " + format_size(i[1]) + " in " + str(i[2]) + " files", True, True, {"object": i[0], "bytes": i[1], "files": i[2]})
+               the_sizes[i[0].upper()] = i[1]
+            #(ADD BYTES TO COPY METRICS OF DATA OBJECTS; SIZES ARE BY NAME W/O FEATURE DATASET)
+            for i in run_metrics["objects"]:
+               i["bytes"] = the_sizes.get(i["name"].split("\\")[-1].upper())
+               i.update(get_throughput(i["seconds"], i["rows"], i["bytes"]))
+      if archive_days > 0:
+         note_archive()
+      record_phase("size_accounting", time.time() - the_start)
+
+      #REPORT 10 SLOWEST DATA OBJECTS
+      if len(run_metrics["objects"]) > 0:
+         make_note("TOP 10 SLOWEST DATA OBJECTS (SECONDS, ROWS, ROWS PER SECOND, SIZE):", True, True)
+         for i in sorted(run_metrics["objects"], key = lambda x: x["seconds"], reverse = True)[0:10]:
+            the_line = "     " + format(i["seconds"], ",.1f") + " s"
+            if i["rows"] != None:
+               the_line += ",  " + format(i["rows"], ",") + " rows,  " + format(int(i["rows_per_second"] or 0), ",") + " rows/s"
+            if i["bytes"] != None:
+               the_line += ",  " + format_size(i["bytes"])
+            make_note(the_line + ":  " + i["name"], True, True)
+      #(A SNAPSHOT W/ DATA OBJECTS THAT FAILED VERIFICATION IS COMPLETE, BUT ITS REPORT IS AN ERROR CONDITION)
+      the_status = "REPORT"
+      if len(verify_failed) > 0:
+         the_status = "ERROR CONDITION"
+         make_note(str(len(verify_failed)) + " data objects failed verification and are flagged for recopy: " + ", ".join(verify_failed) + ".", True, True)
+      make_note("Script completed.\n\n", True)
+      if send_report == True:
+         the_start = time.time()
+         send_email("snapshot.py - " + gdb_nickname + " - " + the_status, email_content)
+         record_phase("email", time.time() - the_start, None, len(email_content))
+      write_run_report(the_status)
+      return the_status
+
+   except:
+      make_note("Either a snapshot is not due at this time or something went wrong.", True, True)
+      if snapshot_gdb_path != None and os.path.isfile(get_journal_path(snapshot_gdb_path)):
+         make_note("Snapshot " + snapshot_gdb_path + " is incomplete. The next run will resume it.", True, True)
+      if arcpy != None:
+         make_note("arcpy MESSAGES: " + arcpy.GetMessages(), True, True)
+      if send_report == True:
+         the_start = time.time()
+         send_email("snapshot.py - " + gdb_nickname + " - ERROR CONDITION", email_content)
+         record_phase("email", time.time() - the_start, None, len(email_content))
+      write_run_report("ERROR CONDITION")
+      return "ERROR CONDITION"
+
+   finally:
+      unlock_folder(folder_lock)
+      folder_lock = None
+
+#THIS FUNCTION LOCKS A GIVEN SNAPSHOT FOLDER (SEE README NOTES) AND RETURNS THE OPEN LOCK FILE (snapshot_folder.lock),
+#   WAITING WHILE ANOTHER RUN HAS IT LOCKED. THE LOCK IS THE OPERATING SYSTEM'S LOCK ON THE FILE, SO IT'S RELEASED
+#   WHEN A RUN ENDS IN ANY WAY. RETURNS None IF THE FOLDER IS STILL LOCKED AFTER THE WAIT.
+#   SET FIRST ARGUMENT TO THE SNAPSHOT FOLDER. SET SECOND ARGUMENT TO THE MOST MINUTES TO WAIT.
+def lock_folder(the_folder, the_minutes):
+   the_file = open(os.path.join(the_folder, "snapshot_folder.lock"), "a+")
+   the_deadline = time.time() + the_minutes * 60
+   the_waiting = False
+   while True:
+      try:
+         if os.name == "nt":
+            import msvcrt
+            the_file.seek(0)
+            msvcrt.locking(the_file.fileno(), msvcrt.LK_NBLCK, 1)
+         else:
+            import fcntl
+            fcntl.flock(the_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+      except OSError:
+         if time.time() >= the_deadline:
+            the_file.close()
+            return None
+         if the_waiting == False:
+            make_note("Snapshot folder " + the_folder + " is locked by another run. Waiting for it.", True, True)
+            the_waiting = True
+         time.sleep(min(5, max(the_deadline - time.time(), 0.1)))
+         continue
+      #(LOCK FILE TELLS WHICH RUN HAS THE LOCK, FOR ANYONE LOOKING)
+      the_file.seek(0)
+      the_file.truncate()
+      the_file.write(json.dumps({"source": gdb_nickname, "pid": os.getpid(), "locked": tell_the_time()}))
+      the_file.flush()
+      return the_file
+
+#THIS FUNCTION UNLOCKS A SNAPSHOT FOLDER LOCKED BY lock_folder() (OR DOES NOTHING IF ITS ARGUMENT IS None)
+#   ITS ARGUMENT IS THE OPEN LOCK FILE
+def unlock_folder(the_file):
+   if the_file == None:
+      return
+   try:
+      if os.name == "nt":
+         import msvcrt
+         the_file.seek(0)
+         msvcrt.locking(the_file.fileno(), msvcrt.LK_UNLCK, 1)
       else:
-         day_count = n2 - n1
+         import fcntl
+         fcntl.flock(the_file.fileno(), fcntl.LOCK_UN)
+   finally:
+      the_file.close()
+
+#THIS FUNCTION RETURNS A LIST OF TIME-OF-DAY WINDOWS OF LOAD THROTTLING, AS (<start minute>, <end minute>, <most
+#   copies at the same time>) TUPLES (MINUTES SINCE MIDNIGHT), FROM A STRING OF <HH:MM>-<HH:MM>=<integer> WINDOWS
+#   SEPARATED BY SEMICOLONS (SEE throttle_windows OPTION)
+def read_throttle_windows(the_string):
+   the_output = []
+   for i in the_string.split(";"):
+      if i.strip() == "":
+         continue
+      the_times, the_limit = i.split("=")
+      the_minutes = []
+      for j in the_times.split("-"):
+         the_hour, the_minute = j.strip().split(":")
+         the_minutes.append(int(the_hour) * 60 + int(the_minute))
+      the_output.append((the_minutes[0], the_minutes[1], int(the_limit)))
+   return the_output
+
+#THIS FUNCTION RETURNS THE MOST COPIES AT THE SAME TIME ALLOWED BY THE CURRENT TIME-OF-DAY WINDOW OF LOAD THROTTLING
+#   (THE FIRST WINDOW THAT HAS THE CURRENT TIME), OR None IF THE CURRENT TIME ISN'T IN ANY WINDOW
+def get_throttle_window():
+   the_now = time.localtime()
+   the_minute = the_now.tm_hour * 60 + the_now.tm_min
+   for i in throttle_windows:
+      if i[0] <= i[1] and i[0] <= the_minute < i[1]:
+         return i[2]
+      if i[0] > i[1] and (the_minute >= i[0] or the_minute < i[1]):
+         return i[2]
+   return None
+
+#THIS FUNCTION STARTS LOAD THROTTLING OF THE COPY STAGE BY SETTING throttle_state: THE LIMIT OF COPIES AT THE SAME
+#   TIME (throttle_min, OR workers IF NOT THROTTLING), LATENCIES OF FINISHED COPIES, ROWS COPIED, AND DECISIONS MADE
+#   (ALSO LISTED IN run_metrics)
+#   ITS ARGUMENT IS THE MOST COPIES AT THE SAME TIME (NUMBER OF WORKER PROCESSES)
+def start_throttle(the_most):
+   global throttle_state
+   throttle_state = {"most": the_most, "limit": the_most, "latencies": [], "since_change": 0, "rows": 0, "start": time.time(), "window": None, "decisions": []}
+   if throttle == True:
+      throttle_state["limit"] = min(throttle_min, the_most)
+      run_metrics["throttle"] = throttle_state["decisions"]
+      note_throttle(None, throttle_state["limit"], "start (throttle_min)")
+
+#THIS FUNCTION RETURNS THE LIMIT OF COPIES AT THE SAME TIME: THE THROTTLE'S LIMIT (SEE update_throttle()), BUT NO
+#   MORE THAN THE CURRENT TIME-OF-DAY WINDOW ALLOWS. A CHANGE OF WINDOW IS NOTED AS A DECISION.
+def get_throttle_limit():
+   if throttle == False:
+      return throttle_state["most"]
+   the_window = get_throttle_window()
+   if the_window != throttle_state["window"]:
+      if the_window == None:
+         note_throttle(throttle_state["limit"], throttle_state["limit"], "time-of-day window ended")
+      else:
+         note_throttle(throttle_state["limit"], min(throttle_state["limit"], the_window), "time-of-day window allows at most " + str(the_window))
+      throttle_state["window"] = the_window
+   if the_window != None:
+      return min(throttle_state["limit"], the_window)
+   return throttle_state["limit"]
+
+#THIS FUNCTION RETURNS THE NUMBER OF SECONDS TO WAIT BEFORE STARTING ANOTHER COPY: WHILE ROWS COPIED ARE AHEAD OF
+#   throttle_rows (ROWS PER SECOND SINCE THE COPY STAGE STARTED), OR WHILE THE CURRENT TIME-OF-DAY WINDOW PAUSES
+#   COPYING (ALLOWS 0 COPIES). RETURNS 0 IF A COPY CAN BE STARTED NOW.
+def get_throttle_delay():
+   if throttle == False:
+      return 0
+   if get_throttle_limit() == 0:
+      return 60
+   if throttle_rows > 0:
+      return max(0, throttle_state["start"] + throttle_state["rows"] / throttle_rows - time.time())
+   return 0
+
+#THIS FUNCTION UPDATES THE THROTTLE W/ A FINISHED COPY'S LATENCY AND ROWS. ONCE AS MANY COPIES AS THE LIMIT HAVE
+#   FINISHED SINCE THE LIMIT LAST CHANGED, THE AVERAGE LATENCY OF THE LAST OF THEM IS COMPARED TO throttle_latency_ms:
+#   ABOVE IT, THE LIMIT IS HALVED (DOWN TO throttle_min); BELOW HALF OF IT, THE LIMIT IS INCREASED BY ONE (UP TO
+#   workers, OR THE CURRENT TIME-OF-DAY WINDOW'S MOST).
+#   ITS ARGUMENT IS A RESULT DICTIONARY RETURNED BY copy_object()
+def update_throttle(the_result):
+   if throttle == False or the_result.get("latency") == None:
+      return
+   throttle_state["latencies"].append(the_result["latency"])
+   throttle_state["rows"] += the_result["rows"] or 0
+   throttle_state["since_change"] += 1
+   the_limit = throttle_state["limit"]
+   if throttle_state["since_change"] < the_limit:
+      return
+   the_recent = throttle_state["latencies"][-the_limit:len(throttle_state["latencies"])]
+   the_average = 1000 * sum(the_recent) / len(the_recent)
+   the_most = throttle_state["most"]
+   if get_throttle_window() != None:
+      the_most = max(min(the_most, get_throttle_window()), throttle_min)
+   the_reason = "average latency of last " + str(len(the_recent)) + " copies is " + format(the_average, ".0f") + " ms"
+   if the_average > throttle_latency_ms and the_limit > throttle_min:
+      throttle_state["limit"] = max(throttle_min, the_limit // 2)
+      the_reason += " (over " + format(throttle_latency_ms, "g") + " ms target)"
+   elif the_average < throttle_latency_ms / 2 and the_limit < the_most:
+      throttle_state["limit"] = the_limit + 1
+      the_reason += " (under half of " + format(throttle_latency_ms, "g") + " ms target)"
    else:
-      day_count = 0
-   if day_count >= tempo or latest8 == None:
-      time_for_snapshot = True
+      return
+   throttle_state["since_change"] = 0
+   note_throttle(the_limit, throttle_state["limit"], the_reason, the_average)
+
+#THIS FUNCTION MAKES A NOTE (LOG ONLY) OF A DECISION OF THE THROTTLE, WHICH IS ALSO LISTED IN THE RUN REPORT
+#   SET FIRST ARGUMENT TO THE LIMIT OF COPIES AT THE SAME TIME BEFORE (OR None). SET SECOND ARGUMENT TO THE LIMIT AFTER.
+#   SET THIRD ARGUMENT TO THE REASON. OPTIONALLY, SET FOURTH ARGUMENT TO THE AVERAGE LATENCY (MILLISECONDS) THE
+#   DECISION WAS BASED ON.
+def note_throttle(the_before, the_after, the_reason, the_latency = None):
+   the_decision = {"time": tell_the_time(), "before": the_before, "after": the_after, "reason": the_reason, "latency_ms": None}
+   if the_latency != None:
+      the_decision["latency_ms"] = round(the_latency, 1)
+   throttle_state["decisions"].append(the_decision)
+   make_note("Throttle: " + str(the_before) + " -> " + str(the_after) + " copies at the same time; " + the_reason + ".", True, False, {"throttle": the_after, "latency_ms": the_decision["latency_ms"]})
+
+#THIS FUNCTION RETURNS A DICTIONARY OF ROWS PER SECOND AND BYTES PER SECOND FOR GIVEN SECONDS, ROWS, AND BYTES
+#   (VALUES ARE None WHERE ROWS OR BYTES ARE None, OR SECONDS ARE 0)
+def get_throughput(the_seconds, the_rows, the_bytes):
+   the_output = {"rows_per_second": None, "bytes_per_second": None}
+   if the_seconds > 0 and the_rows != None:
+      the_output["rows_per_second"] = round(the_rows / the_seconds, 1)
+   if the_seconds > 0 and the_bytes != None:
+      the_output["bytes_per_second"] = round(the_bytes / the_seconds, 1)
+   return the_output
+
+#THIS FUNCTION RECORDS WALL TIME, ROWS, AND BYTES OF A PHASE OF THIS RUN IN run_metrics. IF THE PHASE IS ALREADY
+#   RECORDED, THE GIVEN NUMBERS ARE ADDED TO IT.
+#   SET FIRST ARGUMENT TO NAME OF THE PHASE. SET SECOND ARGUMENT TO ITS SECONDS. OPTIONALLY, SET THIRD AND FOURTH
+#   ARGUMENTS TO ITS ROWS AND BYTES.
+def record_phase(the_phase, the_seconds, the_rows = None, the_bytes = None):
+   for i in run_metrics["phases"]:
+      if i["phase"] == the_phase:
+         i["seconds"] = round(i["seconds"] + the_seconds, 6)
+         if the_rows != None:
+            i["rows"] = (i["rows"] or 0) + the_rows
+         if the_bytes != None:
+            i["bytes"] = (i["bytes"] or 0) + the_bytes
+         i.update(get_throughput(i["seconds"], i["rows"], i["bytes"]))
+         return
+   the_entry = {"phase": the_phase, "seconds": round(the_seconds, 6), "rows": the_rows, "bytes": the_bytes}
+   the_entry.update(get_throughput(the_seconds, the_rows, the_bytes))
+   run_metrics["phases"].append(the_entry)
+
+#THIS FUNCTION WRITES A GIVEN STRING TO A GIVEN FILE PATH, REPLACING THE FILE IN ONE STEP (VIA A TEMPORARY FILE)
+def write_file(the_path, the_string):
+   with open(the_path + ".tmp", "w") as the_file:
+      the_file.write(the_string)
+   os.replace(the_path + ".tmp", the_path)
+
+#THIS FUNCTION WRITES THE RUN REPORT (SEE README NOTES) FROM run_metrics AND, IF THE prometheus OPTION IS SET,
+#   THE PROMETHEUS TEXTFILE-COLLECTOR FILE. A FAILURE TO WRITE THEM IS NOTED BUT DOESN'T STOP THE SCRIPT.
+#   ITS ARGUMENT IS THE RUN'S STATUS ("REPORT" OR "ERROR CONDITION")
+def write_run_report(the_status):
+   try:
+      run_metrics["status"] = the_status
+      run_metrics["finished"] = datetime.datetime.now().isoformat(timespec = "seconds")
+      run_metrics["seconds"] = round(time.time() - run_metrics["start_time"], 3)
+      the_report = json.dumps(run_metrics, indent = 1)
+      write_file(os.path.join(snapshot_folder, "snapshot_run_" + gdb_nickname + ".json"), the_report)
+      if run_metrics["snapshot"] != None and os.path.isdir(snapshot_gdb_path):
+         write_file(snapshot_gdb_path[0:len(snapshot_gdb_path) - 4] + ".report.json", the_report)
+      if prometheus_folder != "":
+         write_file(os.path.join(prometheus_folder, "snapshot_" + gdb_nickname + ".prom"), get_prometheus_text(run_metrics))
+   except Exception as e:
+      make_note("Couldn't write run report. " + str(e), True)
+
+#THIS FUNCTION RETURNS METRICS OF A RUN (SEE write_run_report()) AS PROMETHEUS TEXT-EXPOSITION FORMAT
+def get_prometheus_text(the_metrics):
+   the_source = 'source="' + prometheus_label(gdb_nickname) + '"'
+   the_lines = []
+   the_lines.append("# HELP snapshot_last_run_timestamp_seconds Time when the last run of snapshot.py finished.")
+   the_lines.append("# TYPE snapshot_last_run_timestamp_seconds gauge")
+   the_lines.append("snapshot_last_run_timestamp_seconds{" + the_source + "} " + str(int(time.time())))
+   the_lines.append("# HELP snapshot_last_run_success 1 if the last run of snapshot.py didn't end in an error condition.")
+   the_lines.append("# TYPE snapshot_last_run_success gauge")
+   the_lines.append("snapshot_last_run_success{" + the_source + "} " + str(int(the_metrics["status"] == "REPORT")))
+   the_lines.append("# HELP snapshot_last_run_seconds Wall time of the last run of snapshot.py.")
+   the_lines.append("# TYPE snapshot_last_run_seconds gauge")
+   the_lines.append("snapshot_last_run_seconds{" + the_source + "} " + str(the_metrics["seconds"]))
+   for the_key, the_help in (("seconds", "Wall time"), ("rows", "Rows"), ("bytes", "Bytes")):
+      the_lines.append("# HELP snapshot_phase_" + the_key + " " + the_help + " of a phase of the last run of snapshot.py.")
+      the_lines.append("# TYPE snapshot_phase_" + the_key + " gauge")
+      for i in the_metrics["phases"]:
+         if i[the_key] != None:
+            the_lines.append("snapshot_phase_" + the_key + "{" + the_source + ',phase="' + i["phase"] + '"} ' + str(i[the_key]))
+   for the_key, the_help in (("seconds", "Copy time"), ("rows", "Rows"), ("bytes", "Bytes")):
+      the_lines.append("# HELP snapshot_object_" + the_key + " " + the_help + " of a data object copied by the last run of snapshot.py.")
+      the_lines.append("# TYPE snapshot_object_" + the_key + " gauge")
+      for i in the_metrics["objects"]:
+         if i[the_key] != None:
+            the_lines.append("snapshot_object_" + the_key + "{" + the_source + ',object="' + prometheus_label(i["name"]) + '",type="' + i["type"] + '"} ' + str(i[the_key]))
+   return "\n".join(the_lines) + "\n"
+
+#THIS FUNCTION RETURNS A GIVEN STRING ESCAPED FOR USE AS A PROMETHEUS LABEL VALUE
+def prometheus_label(the_string):
+   return the_string.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+#THIS FUNCTION READS A BATCH CONFIGURATION FILE AND RETURNS ITS CONTENTS AS A DICTIONARY
+#   THE FILE'S FORMAT IS BASED ON ITS EXTENSION: .toml (TOML), .yaml OR .yml (YAML), OR OTHERWISE JSON
+#   ITS ARGUMENT IS FULL PATH OF THE CONFIGURATION FILE
+def read_config(the_path):
+   the_extension = os.path.splitext(the_path)[1].lower()
+   if the_extension == ".toml":
+      import tomllib
+      with open(the_path, "rb") as the_file:
+         return tomllib.load(the_file)
+   elif the_extension in (".yaml", ".yml"):
+      try:
+         import yaml
+      except ImportError:
+         raise RuntimeError("Batch configuration file " + the_path + " is YAML, but the PyYAML package isn't installed. Use JSON or TOML instead.")
+      with open(the_path, "r") as the_file:
+         return yaml.safe_load(the_file)
    else:
-      time_for_snapshot = False
-   make_note(str(day_count) + " days have passed since last snapshot. Snapshot tempo is " + str(tempo) + " days.", True, True)
-
-   #IF IT IS TIME FOR A SNAPSHOT, PROCEED
-   if time_for_snapshot == True:
-      #CREATE SNAPSHOT GEODATABASE
-      snapshot_gdb_name = "SNAPSHOT_" + gdb_nickname + "_" + today8 + ".gdb"
-      arcpy.management.CreateFileGDB(snapshot_folder, snapshot_gdb_name)
-      snapshot_gdb_path = snapshot_folder + "\\" + snapshot_gdb_name
-      make_note("Created snapshot geodatabase " + snapshot_gdb_name + ".", True, True)
-
-      #CAPTURE include_list INTO LOG/REPORT
-      if len(include_list) > 0:
-         make_note("DATA OBJECTS TO BE INCLUDED IN SNAPSHOT (VIA EXPLICIT INCLUDE-LIST):", True, True)
-         for i in include_list:
-            make_note("     " + i, True, True)
-
-      #CAPTURE exclude_list INTO LOG/REPORT
-      make_note("DATA OBJECTS TO BE EXCLUDED FROM SNAPSHOT:", True, True)
-      for i in exclude_list:
-         make_note("     " + i, True, True)         
-
-      #DERIVE OBJECT-TYPE-SPECIFIC INCLUDE-LISTS FROM include_list (UPPER-CASED)
-      #(FEATURE DATASETS)
-      if len(include_list) > 0:
-         included_fds = []
-         for i in include_list:
-            if i[0:4].upper() == "FDS:":
-               included_fds.append(i[4:len(i)].upper())
-         #(OTHER DATA-OBJECTS)
-         included_other = []
-         for i in include_list:
-            if i[0:4].upper() != "FDS:":
-               included_other.append(i.upper())
+      with open(the_path, "r") as the_file:
+         return json.load(the_file)
+
+#THIS FUNCTION RETURNS A LIST OF ARGUMENT STRINGS (FOR read_arguments()) FOR ONE SOURCE OF A BATCH
+#   CONFIGURATION. A SETTING THAT THE SOURCE DOESN'T HAVE IS TAKEN FROM THE CONFIGURATION'S TOP LEVEL.
+#   SET FIRST ARGUMENT TO THE CONFIGURATION (SEE read_config()). SET SECOND ARGUMENT TO THE SOURCE'S DICTIONARY.
+def get_source_arguments(the_config, the_source):
+   the_output = []
+   for i in ("source_gdb", "snapshot_folder", "include_list", "exclude_list", "include_rasters", "tempo", "gdb_nickname", "email_server", "email_port", "email_from", "to_list", "options"):
+      if i == "options":
+         the_value = [the_config.get(i, ""), the_source.get(i, "")]
       else:
-         included_fds = []
-         included_other = []
-         
-      #DERIVE OBJECT-TYPE-SPECIFIC EXCLUDE-LISTS FROM exclude_list (UPPER-CASED)
-      #(FEATURE DATASETS)
-      excluded_fds = []
-      for i in exclude_list:
-         if i[0:4].upper() == "FDS:":
-            excluded_fds.append(i[4:len(i)].upper())
-      #(OTHER DATA-OBJECTS)
-      excluded_other = []
-      for i in exclude_list:
-         if i[0:4].upper() != "FDS:":
-            excluded_other.append(i.upper())
-
-      #SET WORKSPACE
-      arcpy.env.workspace = source_gdb
-
-      #WORK FEATURE DATASETS
-      fds_list = arcpy.ListDatasets("*","Feature")
-      for i in fds_list:
-         j = get_name(i)
-         if (len(include_list) > 0 and j.upper() in included_fds and j.upper() not in excluded_fds) or (len(include_list) == 0 and j.upper() not in excluded_fds):
-            arcpy.management.CreateFeatureDataset(snapshot_gdb_path, j, i)
-            fc_list = arcpy.ListFeatureClasses("*", "All", i)
-            for k in fc_list:
-               l = get_name(k)
-               if l.upper() not in excluded_other:
-                  arcpy.management.Copy(i + "\\" + k, snapshot_gdb_path + "\\" + j + "\\" + l)
-                  make_note("Copied feature-class " + i + "\\" + k + " to snapshot geodatabase.", True, True)
-
-      #WORK STAND-ALONE FEATURE-CLASSES
-      fc_list = arcpy.ListFeatureClasses()
-      for i in fc_list:
-         j = get_name(i)
-         if (len(include_list) > 0 and j.upper() in included_other and j.upper() not in excluded_other) or (len(include_list) == 0 and j.upper() not in excluded_other):
-            arcpy.management.Copy(i, snapshot_gdb_path + "\\" + j)
-            make_note("Copied feature-class " + i + " to snapshot geodatbase.", True, True)
-
-      #WORK TABLES
-      table_list = arcpy.ListTables()
-      for i in table_list:
-         j = get_name(i)
-         if (len(include_list) > 0 and j.upper() in included_other and j.upper() not in excluded_other) or (len(include_list) == 0 and j.upper() not in excluded_other):
-            arcpy.management.Copy(i, snapshot_gdb_path + "\\" + j)
-            make_note("Copied table " + i + " to snapshot geodatbase.", True, True)
-
-      #WORK RASTER DATASETS
-      if include_rasters == True:
-         raster_list = arcpy.ListRasters()
-         for i in raster_list:
-            j = get_name(i)
-            if (len(include_list) > 0 and j.upper() in included_other and j.upper() not in excluded_other) or (len(include_list) == 0 and j.upper() not in excluded_other):
-               arcpy.management.Copy(i, snapshot_gdb_path + "\\" + j)
-               make_note("Copied raster " + i + " to snapshot geodatbase.", True, True)
-
-      #GET SNAPSHOT-GEODATABASE'S 8-CHARACTER DATE AND SIZE INTO snapshots LIST
-      gdb_size = str(get_gdb_size(snapshot_gdb_path))
-      snapshots.append(today8 + "," + snapshot_gdb_path + "," + gdb_size)
-      snapshots.sort()
+         the_value = the_source.get(i, the_config.get(i, ""))
+      #(LISTS AND DICTIONARIES BECOME COMMA-SEPARATED STRINGS)
+      if isinstance(the_value, dict):
+         the_value = ",".join(str(j) + "=" + str(the_value[j]) for j in the_value)
+      if isinstance(the_value, list):
+         the_strings = []
+         for j in the_value:
+            if isinstance(j, dict):
+               j = ",".join(str(k) + "=" + str(j[k]) for k in j)
+            elif isinstance(j, list):
+               j = ",".join(str(k) for k in j)
+            if str(j) != "":
+               the_strings.append(str(j))
+         the_value = ",".join(the_strings)
+      the_output.append(str(the_value))
+   return the_output
+
+#THIS FUNCTION TAKES A SNAPSHOT (IF DUE) OF ONE SOURCE OF A BATCH AND RETURNS A TUPLE OF
+#   (<gdb_nickname>, <"REPORT" or "ERROR CONDITION">, <report>)
+#   IT RUNS IN THIS SCRIPT'S PROCESS OR IN A WORKER PROCESS
+#   ITS ARGUMENT IS A LIST OF ARGUMENT STRINGS (SEE get_source_arguments())
+def run_batch_source(the_arguments):
+   global email_content
+   email_content = ""
+   try:
+      read_arguments(the_arguments)
+   except Exception as e:
+      make_note("Couldn't read settings of source " + the_arguments[6] + " (" + the_arguments[0] + "). " + str(e), True, True)
+      flush_log()
+      return (the_arguments[6], "ERROR CONDITION", email_content)
+   the_status = take_snapshot(False)
+   flush_log()
+   return (gdb_nickname, the_status, email_content)
 
-   #OTHERWISE, SIMPLY REPORT
+#THIS FUNCTION TAKES SNAPSHOTS (WHERE DUE) OF ALL SOURCES IN A GIVEN BATCH CONFIGURATION FILE AND EMAILS
+#   ONE REPORT FOR ALL OF THEM
+def run_batch(the_config_path):
+   global email_server, email_port, email_from, to_list, email_servers
+   the_config = read_config(the_config_path)
+   the_jobs = []
+   for i in the_config.get("sources", []):
+      the_jobs.append(get_source_arguments(the_config, i))
+   email_servers = []
+   for i in the_jobs:
+      email_servers.append((i[7], str(i[8])))
+   the_concurrency = int(the_config.get("concurrency", 1))
+   #(BATCH'S OWN LOG LINES GO TO LOG FOLDER OF TOP-LEVEL OPTIONS)
+   the_arguments = get_source_arguments(the_config, {})
+   start_log(read_options(the_arguments[11]))
+   start_email(read_options(the_arguments[11]))
+   make_note("Running batch of " + str(len(the_jobs)) + " sources from " + the_config_path + ".", True)
+   flush_log()
+   the_reports = []
+   if the_concurrency > 1 and len(the_jobs) > 1:
+      with concurrent.futures.ProcessPoolExecutor(min(the_concurrency, len(the_jobs))) as the_pool:
+         for i in the_pool.map(run_batch_source, the_jobs):
+            the_reports.append(i)
    else:
-      make_note("Snapshot geodatabase not made.", True, True)
-      
-   #SCRIPT COMPLETED, EMAIL REPORT (INDLUDING SNAPSHOT-GEODATABASE SIZES, IF APPLICABLE)
-   if len(snapshots) > 0:
-      make_note("ESTIMATED SIZES OF SNAPSHOT GEODATABASES, IN MB:", True, True)
-      for i in snapshots:
-         make_note("     " + i[9:i.rfind(",")] + ":  " + i[i.rfind(",") + 1:len(i)], True, True)
-   make_note("Script completed.\n\n", True)
-   send_email("snapshot.py - " + gdb_nickname + " - REPORT", email_content)
-
-except:
-   make_note("Either a snapshot is not due at this time or something went wrong.", True, True)
-   make_note("arcpy MESSAGES: " + arcpy.GetMessages(), True, True)
-   send_email("snapshot.py - " + gdb_nickname + " - ERROR CONDITION", email_content)
+      for i in the_jobs:
+         the_reports.append(run_batch_source(i))
+      #(EACH SOURCE SET UP LOGGING AND EMAIL DELIVERY W/ ITS OWN OPTIONS IN THIS PROCESS; GO BACK TO TOP-LEVEL OPTIONS)
+      start_log(read_options(the_arguments[11]))
+      start_email(read_options(the_arguments[11]))
+   #EMAIL ONE REPORT FOR WHOLE BATCH (IN ORDER OF SOURCES IN CONFIGURATION FILE)
+   email_server = the_arguments[7]
+   email_port = the_arguments[8]
+   email_from = the_arguments[9]
+   to_list = []
+   for i in the_arguments[10].split(","):
+      to_list.append(i.strip())
+   the_digest = []
+   for i in the_reports:
+      the_digest.append((i[0] + " - " + i[1], i[1], i[2]))
+   the_message, the_errors = make_digest(the_digest)
+   make_note("Batch completed. " + str(len(the_reports)) + " sources, " + str(the_errors) + " error conditions.\n\n", True)
+   if the_errors > 0:
+      send_email("snapshot.py - BATCH - ERROR CONDITION", the_message)
+   else:
+      send_email("snapshot.py - BATCH - REPORT", the_message)
+
+#THIS FUNCTION RETURNS WHEN A SNAPSHOT OF ONE SOURCE OF A DAEMON'S CONFIGURATION IS NEXT DUE (SEE run_daemon()), AS
+#   SECONDS SINCE THE EPOCH, FROM ITS TEMPO AND THE DATE OF ITS LAST SNAPSHOT IN ITS SNAPSHOT FOLDER (THE SAME WAY
+#   take_snapshot() TELLS WHETHER A SNAPSHOT IS DUE), AT ITS start_time (HH:MM) ON THAT DATE. IT'S DUE NOW IF THE
+#   SNAPSHOT FOLDER HAS NO SNAPSHOTS OF THE SOURCE OR AN INCOMPLETE ONE (TO BE RESUMED).
+#   SET FIRST ARGUMENT TO A LIST OF ARGUMENT STRINGS (SEE get_source_arguments()). SET SECOND ARGUMENT TO start_time.
+def get_next_due(the_arguments, the_start_time):
+   the_latest = None
+   if len(list_incomplete_snapshots(the_arguments[1], the_arguments[6])) > 0:
+      return time.time()
+   for i in list_file_gdbs(the_arguments[1]):
+      the_date = get_snapshot_date(i)
+      if the_date == None or os.path.basename(i).upper().startswith("SNAPSHOT_" + the_arguments[6].upper() + "_") == False:
+         continue
+      if os.path.isfile(get_journal_path(i)):
+         continue
+      elif the_latest == None or the_date > the_latest:
+         the_latest = the_date
+   if the_latest == None:
+      return time.time()
+   the_due = datetime.datetime.strptime(the_latest + the_start_time, "%Y%m%d%H:%M") + datetime.timedelta(days = int(the_arguments[5]))
+   return the_due.timestamp()
+
+#THIS FUNCTION PREPARES A DAEMON'S WORKER PROCESS (SEE run_daemon()): arcpy IS IMPORTED ONCE, WHEN THE WORKER PROCESS
+#   STARTS, AND STAYS IMPORTED (W/ ITS LICENSE AND CONNECTIONS TO SOURCE GEODATABASES) FOR ALL SNAPSHOTS IT TAKES.
+#   CTRL+C IS IGNORED BY THE WORKER PROCESS, SO A SNAPSHOT IT'S TAKING FINISHES WHEN THE DAEMON IS INTERRUPTED.
+def start_daemon_worker():
+   signal.signal(signal.SIGINT, signal.SIG_IGN)
+   import_arcpy()
+
+#THIS FUNCTION RETURNS A GIVEN TIME (SECONDS SINCE THE EPOCH, OR None) AS ISO TEXT (YYYY-MM-DDTHH:MM:SS), OR None
+def format_time(the_time):
+   if the_time == None:
+      return None
+   return datetime.datetime.fromtimestamp(the_time).isoformat(timespec = "seconds")
+
+#THIS FUNCTION WRITES THE DAEMON'S STATUS (SEE run_daemon()) TO ITS STATUS FILE AND KEEPS IT IN daemon_status FOR ITS
+#   HTTP ENDPOINT. A FAILURE TO WRITE THE STATUS FILE IS NOTED BUT DOESN'T STOP THE DAEMON.
+#   SET FIRST ARGUMENT TO THE STATUS FILE'S PATH. SET SECOND ARGUMENT TO THE DAEMON'S STATE (DICTIONARY).
+def write_daemon_status(the_path, the_state):
+   global daemon_status
+   the_now = time.time()
+   the_status = {"started": format_time(the_state["started"]), "updated": format_time(the_now), "pid": os.getpid(), "config": the_state["config"], "concurrency": the_state["concurrency"], "sources": [], "queued": [], "running": [], "completed": []}
+   for i in the_state["sources"]:
+      the_status["sources"].append({"source": i["nickname"], "snapshot_folder": i["arguments"][1], "priority": i["priority"], "state": i["state"], "next_due": format_time(i["next_due"])})
+   for i in sorted(the_state["queue"]):
+      the_job = i[3]
+      the_status["queued"].append({"source": the_job["source"]["nickname"], "priority": the_job["source"]["priority"], "due": format_time(the_job["due"]), "queued": format_time(the_job["queued"]), "waiting_seconds": round(the_now - the_job["queued"], 1)})
+   for i in the_state["running"].values():
+      the_status["running"].append({"source": i["source"]["nickname"], "queued": format_time(i["queued"]), "started": format_time(i["started"]), "seconds": round(the_now - i["started"], 1)})
+   for i in the_state["completed"]:
+      the_status["completed"].append({"source": i["source"]["nickname"], "status": i["status"], "queued": format_time(i["queued"]), "started": format_time(i["started"]), "finished": format_time(i["finished"]), "waiting_seconds": round(i["started"] - i["queued"], 1), "seconds": round(i["finished"] - i["started"], 1)})
+   daemon_status = json.dumps(the_status, indent = 1)
+   try:
+      write_file(the_path, daemon_status)
+   except OSError as e:
+      make_note("Couldn't write daemon status to " + the_path + ". " + str(e), True)
+
+#THIS FUNCTION ANSWERS A REQUEST TO THE DAEMON'S HTTP ENDPOINT (A WSGI APPLICATION; SEE run_daemon()) W/ ITS LATEST
+#   STATUS (JSON)
+def answer_status(the_environ, start_response):
+   the_body = daemon_status.encode("utf-8")
+   start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", str(len(the_body)))])
+   return [the_body]
+
+#THIS FUNCTION RUNS THIS SCRIPT AS A DAEMON (SEE --daemon IN HOW TO USE) THAT TAKES SNAPSHOTS OF ALL SOURCES IN A GIVEN
+#   CONFIGURATION FILE (SAME AS A BATCH'S) AS THEY COME DUE, UNTIL IT'S INTERRUPTED (CTRL+C)
+#   EACH SOURCE'S NEXT DUE TIME IS FOUND (SEE get_next_due()) WHEN IT'S CHECKED: AT START, AT ITS DUE TIME, AND EVERY
+#   check_minutes. A DUE SOURCE IS QUEUED AS A JOB IN A PRIORITY QUEUE (HIGHER priority FIRST, THEN EARLIER DUE TIME).
+#   JOBS ARE TAKEN FROM THE QUEUE INTO A POOL OF concurrency WORKER PROCESSES, WHICH KEEP arcpy IMPORTED (SEE
+#   start_daemon_worker()). A JOB ISN'T STARTED WHILE ANOTHER JOB W/ THE SAME SNAPSHOT FOLDER IS RUNNING (AND
+#   take_snapshot() ALSO LOCKS THE SNAPSHOT FOLDER AGAINST RUNS OUTSIDE THE DAEMON). EACH JOB'S REPORT IS EMAILED
+#   WHEN IT'S DONE. A SOURCE ISN'T QUEUED AGAIN UNTIL check_minutes AFTER ITS LAST JOB ENDED, SO A JOB THAT FAILS IS
+#   RETRIED AFTER check_minutes.
+def run_daemon(the_config_path):
+   global email_server, email_port, email_from, to_list, email_servers
+   the_config = read_config(the_config_path)
+   the_concurrency = int(the_config.get("concurrency", 1))
+   the_check = float(the_config.get("check_minutes", 60)) * 60
+   the_status_path = the_config.get("status_file", os.path.splitext(the_config_path)[0] + "_status.json")
+   the_port = int(the_config.get("status_port", 0))
+   #(DAEMON'S OWN LOG LINES GO TO LOG FOLDER OF TOP-LEVEL OPTIONS)
+   start_log(read_options(get_source_arguments(the_config, {})[11]))
+   start_email(read_options(get_source_arguments(the_config, {})[11]))
+   the_state = {"started": time.time(), "config": the_config_path, "concurrency": the_concurrency, "sources": [], "queue": [], "running": {}, "completed": []}
+   for i in the_config.get("sources", []):
+      the_state["sources"].append({"nickname": str(i.get("gdb_nickname", the_config.get("gdb_nickname", ""))), "arguments": get_source_arguments(the_config, i), "priority": int(i.get("priority", the_config.get("priority", 0))), "start_time": str(i.get("start_time", the_config.get("start_time", "00:00"))), "state": "waiting", "next_due": None, "next_check": 0, "not_before": 0})
+   email_servers = []
+   for i in the_state["sources"]:
+      email_servers.append((i["arguments"][7], str(i["arguments"][8])))
+   make_note("Daemon started w/ " + str(len(the_state["sources"])) + " sources from " + the_config_path + " (" + str(the_concurrency) + " at the same time). Status is written to " + the_status_path + ".", True)
+   #HTTP ENDPOINT (IF status_port IS SET), IN A BACKGROUND THREAD
+   the_server = None
+   if the_port > 0:
+      import wsgiref.simple_server
+      the_server = wsgiref.simple_server.make_server("127.0.0.1", the_port, answer_status)
+      threading.Thread(target = the_server.serve_forever, daemon = True).start()
+      make_note("Daemon status is served at http://127.0.0.1:" + str(the_port) + "/.", True)
+   flush_log()
+   the_pool = concurrent.futures.ProcessPoolExecutor(the_concurrency, initializer = start_daemon_worker)
+   the_count = 0
+   try:
+      while True:
+         the_now = time.time()
+         #CHECK SOURCES THAT AREN'T QUEUED OR RUNNING; QUEUE THOSE THAT ARE DUE
+         for i in the_state["sources"]:
+            if i["state"] != "waiting" or the_now < i["next_check"] or the_now < i["not_before"]:
+               continue
+            try:
+               i["next_due"] = get_next_due(i["arguments"], i["start_time"])
+            except Exception as e:
+               make_note("Couldn't check when a snapshot of " + i["nickname"] + " is due. " + str(e), True)
+               i["next_check"] = the_now + the_check
+               continue
+            if i["next_due"] <= time.time():
+               the_count += 1
+               heapq.heappush(the_state["queue"], (-i["priority"], i["next_due"], the_count, {"source": i, "due": i["next_due"], "queued": the_now}))
+               i["state"] = "queued"
+               make_note("Queued snapshot of " + i["nickname"] + " (due " + format_time(i["next_due"]) + ", priority " + str(i["priority"]) + ").", True)
+            else:
+               i["next_check"] = min(i["next_due"], the_now + the_check)
+         #START QUEUED JOBS, UP TO concurrency, SKIPPING JOBS WHOSE SNAPSHOT FOLDER IS BUSY
+         the_busy = set()
+         for i in the_state["running"].values():
+            the_busy.add(os.path.normcase(os.path.abspath(i["source"]["arguments"][1])))
+         the_skipped = []
+         while len(the_state["running"]) < the_concurrency and len(the_state["queue"]) > 0:
+            the_item = heapq.heappop(the_state["queue"])
+            the_job = the_item[3]
+            the_folder = os.path.normcase(os.path.abspath(the_job["source"]["arguments"][1]))
+            if the_folder in the_busy:
+               the_skipped.append(the_item)
+               continue
+            #(A SNAPSHOT MADE OUTSIDE THE DAEMON WHILE THE JOB WAS QUEUED CAN MAKE IT NO LONGER DUE)
+            the_job["source"]["next_due"] = get_next_due(the_job["source"]["arguments"], the_job["source"]["start_time"])
+            if the_job["source"]["next_due"] > time.time():
+               the_job["source"]["state"] = "waiting"
+               the_job["source"]["next_check"] = min(the_job["source"]["next_due"], time.time() + the_check)
+               make_note("Snapshot of " + the_job["source"]["nickname"] + " is no longer due (next due " + format_time(the_job["source"]["next_due"]) + "). Removed it from queue.", True)
+               continue
+            the_busy.add(the_folder)
+            the_job["started"] = time.time()
+            the_job["source"]["state"] = "running"
+            the_state["running"][the_pool.submit(run_batch_source, the_job["source"]["arguments"])] = the_job
+            make_note("Started snapshot of " + the_job["source"]["nickname"] + ".", True)
+         for i in the_skipped:
+            heapq.heappush(the_state["queue"], i)
+         write_daemon_status(the_status_path, the_state)
+         flush_log()
+         #WAIT FOR A JOB TO FINISH, OR UNTIL NEXT SOURCE IS TO BE CHECKED (AT MOST 60 SECONDS, TO KEEP STATUS CURRENT)
+         the_timeout = 60
+         for i in the_state["sources"]:
+            if i["state"] == "waiting":
+               the_timeout = min(the_timeout, max(i["next_check"], i["not_before"]) - time.time())
+         the_timeout = max(the_timeout, 1)
+         if len(the_state["running"]) == 0:
+            time.sleep(the_timeout)
+            continue
+         the_done, the_pending = concurrent.futures.wait(list(the_state["running"]), the_timeout, concurrent.futures.FIRST_COMPLETED)
+         for i in the_done:
+            the_job = the_state["running"].pop(i)
+            the_job["finished"] = time.time()
+            try:
+               the_report = i.result()
+            except Exception as e:
+               the_report = (the_job["source"]["nickname"], "ERROR CONDITION", "Snapshot of " + the_job["source"]["nickname"] + " failed in its worker process. " + str(e) + "\n")
+               #(A WORKER PROCESS THAT DIED BREAKS THE POOL; START A NEW ONE)
+               if isinstance(e, concurrent.futures.process.BrokenProcessPool):
+                  make_note("Worker process pool broke. Starting a new one.", True)
+                  the_pool.shutdown(wait = False)
+                  the_pool = concurrent.futures.ProcessPoolExecutor(the_concurrency, initializer = start_daemon_worker)
+            the_job["status"] = the_report[1]
+            the_job["source"]["state"] = "waiting"
+            the_job["source"]["next_check"] = 0
+            the_job["source"]["not_before"] = the_job["finished"] + the_check
+            the_state["completed"].insert(0, the_job)
+            del the_state["completed"][50:len(the_state["completed"])]
+            make_note("Finished snapshot of " + the_job["source"]["nickname"] + " (" + the_report[1] + ") in " + str(round(the_job["finished"] - the_job["started"], 1)) + " seconds.", True)
+            #EMAIL JOB'S REPORT (W/ ITS SOURCE'S EMAIL SETTINGS)
+            email_server = the_job["source"]["arguments"][7]
+            email_port = the_job["source"]["arguments"][8]
+            email_from = the_job["source"]["arguments"][9]
+            to_list = []
+            for j in the_job["source"]["arguments"][10].split(","):
+               to_list.append(j.strip())
+            send_email("snapshot.py - " + the_report[0] + " - " + the_report[1], the_report[2])
+   except KeyboardInterrupt:
+      make_note("Daemon interrupted. Waiting for running snapshots to finish.", True)
+   finally:
+      the_pool.shutdown(wait = True, cancel_futures = True)
+      if the_server != None:
+         the_server.shutdown()
+      make_note("Daemon stopped.\n\n", True)
+
+#SPAWNED WORKER PROCESSES IMPORT THIS SCRIPT; ONLY RUN IN THE MAIN PROCESS
+if __name__ == "__main__":
+   if get_parameter(0) == "--reconcile":
+      reconcile_catalog(get_parameter(1))
+   elif get_parameter(0) == "--batch":
+      run_batch(get_parameter(1))
+      stop_email()
+   elif get_parameter(0) == "--reconstruct":
+      reconstruct_object(get_parameter(1), get_parameter(2), read_date(get_parameter(3)), get_parameter(4), get_parameter(5))
+   elif get_parameter(0) == "--history":
+      show_history(get_parameter(1), get_parameter(2), get_parameter(3))
+   elif get_parameter(0) == "--asof":
+      show_version(get_parameter(1), get_parameter(2), get_parameter(3), get_parameter(4))
+   elif get_parameter(0) == "--extract":
+      extract_object(get_parameter(1), get_parameter(2), get_parameter(3), get_parameter(4), get_parameter(5))
+   elif get_parameter(0) == "--restore":
+      restore_snapshot(get_parameter(1), get_parameter(2), get_parameter(3))
+   elif get_parameter(0) == "--daemon":
+      run_daemon(get_parameter(1))
+      stop_email()
+   else:
+      read_arguments([get_parameter(i) for i in range(12)])
+      take_snapshot()
+      stop_email()